@@ -7,6 +7,7 @@ This module provides a client for interacting with the DataAptor AI API.
 import requests
 import os
 import json
+import time
 from pathlib import Path
 
 
@@ -26,7 +27,27 @@ class DataAptorClient:
             response = requests.post(f"{self.api_url}/api/ingestion/upload", files=files)
             response.raise_for_status()  # Raise exception for non-2xx status codes
             
-            return response.json()
+            result = response.json()
+        
+        # The ingestion service processes uploads in the background; wait for the job
+        if 'dataset_id' in result and 'status' in result:
+            result = self.wait_for_ingestion_job(result['id'])
+        
+        return result
+    
+    def wait_for_ingestion_job(self, job_id, poll_interval=1.0):
+        """Wait for an ingestion job to finish and return the created dataset"""
+        while True:
+            response = requests.get(f"{self.api_url}/api/ingestion/jobs/{job_id}")
+            response.raise_for_status()
+            job = response.json()
+            
+            if job['status'] == 'completed':
+                return self.get_dataset(job['dataset_id'])
+            if job['status'] == 'failed':
+                raise Exception(f"Ingestion failed: {job.get('error', 'Unknown error')}")
+            
+            time.sleep(poll_interval)
     
     def list_datasets(self, skip=0, limit=10):
         """List all uploaded datasets"""
@@ -1,8 +1,37 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
 
+// Display names of the file types reported by /formats; unknown types are shown in upper case
+const FORMAT_LABELS = {
+  csv: 'CSV',
+  json: 'JSON',
+  jsonl: 'JSON Lines',
+  txt: 'TXT',
+  parquet: 'Parquet',
+  feather: 'Feather',
+  arrow: 'Arrow',
+};
+
+// Formats assumed until /formats answers
+const DEFAULT_FORMATS = Object.keys(FORMAT_LABELS);
+
+// Cards of the "Supported Formats" section, each shown if any of its types is supported
+const FORMAT_CARDS = [
+  { title: 'CSV', types: ['csv'], description: 'Comma-separated values with header row' },
+  { title: 'JSON', types: ['json', 'jsonl'], description: 'Array of objects, single object, or JSON Lines (.jsonl)' },
+  { title: 'TXT', types: ['txt'], description: 'Plain text files with line breaks' },
+  { title: 'Parquet / Arrow', types: ['parquet', 'feather', 'arrow'], description: 'Parquet, Feather, and Arrow IPC files' },
+];
+
+const formatLabel = (type) => FORMAT_LABELS[type] || type.toUpperCase();
+
+// "A, B, or C"
+const listWithOr = (items) =>
+  items.length > 1 ? `${items.slice(0, -1).join(', ')}, or ${items[items.length - 1]}` : items.join('');
+
 const Upload = () => {
+  const [formats, setFormats] = useState(DEFAULT_FORMATS);
   const [file, setFile] = useState(null);
   const [fileName, setFileName] = useState('');
   const [uploading, setUploading] = useState(false);
@@ -10,6 +39,25 @@ const Upload = () => {
   const [progress, setProgress] = useState(0);
   const navigate = useNavigate();
 
+  useEffect(() => {
+    axios
+      .get('http://localhost:8000/api/ingestion/formats')
+      .then((response) => {
+        const types = Object.keys(response.data);
+        if (types.length > 0) {
+          setFormats(types);
+        }
+      })
+      .catch((err) => console.error('Error fetching supported formats:', err));
+  }, []);
+
+  const formatNames = listWithOr(formats.map(formatLabel));
+  const unknownTypes = formats.filter((type) => !FORMAT_CARDS.some((card) => card.types.includes(type)));
+  const formatCards = [
+    ...FORMAT_CARDS.filter((card) => card.types.some((type) => formats.includes(type))),
+    ...unknownTypes.map((type) => ({ title: formatLabel(type), types: [type], description: `.${type} files` })),
+  ];
+
   const handleFileChange = (e) => {
     const selectedFile = e.target.files[0];
     if (selectedFile) {
@@ -43,8 +91,8 @@ const Upload = () => {
 
     // Check file type
     const fileExt = file.name.split('.').pop().toLowerCase();
-    if (!['csv', 'json', 'txt'].includes(fileExt)) {
-      setError('Unsupported file type. Please upload CSV, JSON, or TXT files.');
+    if (!formats.includes(fileExt)) {
+      setError(`Unsupported file type. Please upload ${formatNames} files.`);
       return;
     }
 
@@ -71,12 +119,22 @@ const Upload = () => {
         },
       });
 
+      // Uploads are ingested in the background; wait for the job to create the dataset
+      let job = response.data;
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        job = (await axios.get(`http://localhost:8000/api/ingestion/jobs/${job.id}`)).data;
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Ingestion failed');
+      }
+
       // After successful upload, navigate to assessment page
-      navigate(`/assessment/${response.data.id}`);
+      navigate(`/assessment/${job.dataset_id}`);
     } catch (err) {
       console.error('Upload error:', err);
       setError(
-        err.response?.data?.detail || 'An error occurred during upload. Please try again.'
+        err.response?.data?.detail || err.message || 'An error occurred during upload. Please try again.'
       );
       setUploading(false);
     }
@@ -99,7 +157,7 @@ const Upload = () => {
               type="file"
               className="hidden"
               onChange={handleFileChange}
-              accept=".csv,.json,.txt"
+              accept={formats.map((type) => `.${type}`).join(',')}
             />
             <div className="mb-4">
               <svg
@@ -126,7 +184,7 @@ const Upload = () => {
                 </>
               )}
             </p>
-            <p className="text-xs text-gray-500">CSV, JSON, or TXT (max 100MB)</p>
+            <p className="text-xs text-gray-500">{formatNames} (max 100MB)</p>
           </div>
 
           {error && (
@@ -162,39 +220,19 @@ const Upload = () => {
       <div className="card max-w-2xl mx-auto mt-8">
         <h2 className="text-lg font-semibold mb-4">Supported Formats</h2>
         <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
-          <div className="p-4 border rounded-lg">
-            <div className="flex items-center mb-2">
-              <svg className="h-6 w-6 text-green-500 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
-                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-              </svg>
-              <h3 className="font-medium">CSV</h3>
-            </div>
-            <p className="text-sm text-gray-600">
-              Comma-separated values with header row
-            </p>
-          </div>
-          <div className="p-4 border rounded-lg">
-            <div className="flex items-center mb-2">
-              <svg className="h-6 w-6 text-green-500 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
-                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-              </svg>
-              <h3 className="font-medium">JSON</h3>
-            </div>
-            <p className="text-sm text-gray-600">
-              Array of objects or single object
-            </p>
-          </div>
-          <div className="p-4 border rounded-lg">
-            <div className="flex items-center mb-2">
-              <svg className="h-6 w-6 text-green-500 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
-                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-              </svg>
-              <h3 className="font-medium">TXT</h3>
+          {formatCards.map((card) => (
+            <div key={card.title} className="p-4 border rounded-lg">
+              <div className="flex items-center mb-2">
+                <svg className="h-6 w-6 text-green-500 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
+                  <path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
+                </svg>
+                <h3 className="font-medium">{card.title}</h3>
+              </div>
+              <p className="text-sm text-gray-600">
+                {card.description}
+              </p>
             </div>
-            <p className="text-sm text-gray-600">
-              Plain text files with line breaks
-            </p>
-          </div>
+          ))}
         </div>
       </div>
     </div>
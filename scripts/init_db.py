@@ -47,8 +47,38 @@ def create_tables():
             file_type VARCHAR(50) NOT NULL,
             file_size BIGINT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            metadata JSONB
+            metadata JSONB,
+            content_hash VARCHAR(64),
+            parquet_path VARCHAR(255)
         );
+        ALTER TABLE datasets ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+        ALTER TABLE datasets ADD COLUMN IF NOT EXISTS parquet_path VARCHAR(255);
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_datasets_content_hash ON datasets (content_hash);
+        CREATE INDEX IF NOT EXISTS ix_datasets_created_at_id ON datasets (created_at, id);
+        """)
+        
+        cursor.execute("""
+        -- Create ingestion jobs table
+        CREATE TABLE IF NOT EXISTS ingestion_jobs (
+            id VARCHAR(36) PRIMARY KEY,
+            status VARCHAR(20) NOT NULL,
+            progress DOUBLE PRECISION NOT NULL DEFAULT 0,
+            stage VARCHAR(50),
+            file_path VARCHAR(512) NOT NULL,
+            original_filename VARCHAR(255) NOT NULL,
+            file_type VARCHAR(50) NOT NULL,
+            file_size BIGINT NOT NULL,
+            content_hash VARCHAR(64),
+            dataset_id INTEGER,
+            error TEXT,
+            worker_id VARCHAR(100),
+            heartbeat_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        ALTER TABLE ingestion_jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100);
+        ALTER TABLE ingestion_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+        CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_status ON ingestion_jobs (status);
         """)
         
         cursor.execute("""
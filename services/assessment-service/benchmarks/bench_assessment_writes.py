@@ -0,0 +1,114 @@
+"""Benchmark persisting a re-assessment sweep: per-row ORM adds and commits vs AssessmentWriter
+
+Usage:
+    python benchmarks/bench_assessment_writes.py [--datasets 10000] [--url postgresql://...]
+
+Without --url the sweep is written to a scratch SQLite file. Against
+PostgreSQL, the assessments table must exist (scripts/init_db.py); the
+rows written by the benchmark are deleted afterwards.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import Session
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from database import metadata, assessments, Assessment
+from results import AssessmentWriter, assessment_rows
+
+# Dataset IDs of the synthetic sweep, far from real ones so cleanup cannot touch them
+FIRST_DATASET_ID = 1_000_000_000
+
+def create_results(datasets: int):
+    """One run_assessment result per dataset, scoring every criterion"""
+    results = []
+    for i in range(datasets):
+        results.append({
+            'dataset_id': FIRST_DATASET_ID + i,
+            'quality': {
+                'module': 'quality',
+                'criteria': {
+                    name: {'score': (i % 100) / 10, 'applicable': True, 'details': {'columns': {'value': {'present_percentage': 95.0}}}}
+                    for name in config.QUALITY_CRITERIA
+                }
+            },
+            'accessibility': {
+                'module': 'accessibility',
+                'criteria': {
+                    name: {'score': 8.0, 'applicable': True, 'details': {'file_type': 'csv'}}
+                    for name in config.ACCESSIBILITY_CRITERIA
+                }
+            }
+        })
+    return results
+
+def write_per_row(engine, results):
+    """The ORM pattern: one db.add and commit per criterion"""
+    with Session(engine) as db:
+        for result in results:
+            for row in assessment_rows(result):
+                db.add(Assessment(**row))
+                db.commit()
+
+def write_bulk(engine, results):
+    AssessmentWriter(engine).write_results(results)
+
+def timed(func, engine, results):
+    start = time.perf_counter()
+    func(engine, results)
+    return time.perf_counter() - start
+
+def clear(engine):
+    with engine.begin() as connection:
+        connection.execute(delete(assessments).where(assessments.c.dataset_id >= FIRST_DATASET_ID))
+
+def count(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(func.count()).select_from(assessments).where(assessments.c.dataset_id >= FIRST_DATASET_ID)
+        ).scalar()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--datasets', type=int, default=10_000)
+    parser.add_argument('--url', help="Database URL (defaults to a scratch SQLite file)")
+    args = parser.parse_args()
+
+    scratch = None
+    if args.url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        scratch.close()
+        args.url = f"sqlite:///{scratch.name}"
+    engine = create_engine(args.url)
+    if scratch is not None:
+        # SQLite does not enforce the datasets foreign key, so the sweep needs no dataset rows
+        metadata.create_all(engine)
+
+    results = create_results(args.datasets)
+    rows = sum(len(assessment_rows(result)) for result in results)
+    try:
+        clear(engine)
+        per_row = timed(write_per_row, engine, results)
+        assert count(engine) == rows
+        clear(engine)
+        bulk = timed(write_bulk, engine, results)
+        assert count(engine) == rows
+    finally:
+        clear(engine)
+        engine.dispose()
+        if scratch is not None:
+            os.remove(scratch.name)
+
+    print(f"{args.datasets} datasets, {rows} rows ({engine.dialect.name})")
+    print(f"per-row ORM: {per_row:.3f}s ({rows / per_row:,.0f} rows/s)")
+    print(f"bulk writer: {bulk:.3f}s ({rows / bulk:,.0f} rows/s)")
+    print(f"speedup:     {per_row / bulk:.2f}x")
+
+if __name__ == "__main__":
+    main()
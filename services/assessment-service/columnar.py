@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+import config
+from storage import StorageClient
+
+# One lock per object being downloaded, so concurrent callers in this process wait for a single download
+_downloading: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+def load_columns(parquet_path: str, columns: Optional[List[str]] = None, storage: StorageClient = None) -> pa.Table:
+    """Load some columns of a dataset from its Parquet copy
+    
+    The copy written at ingestion is downloaded to TEMP_DOWNLOAD_DIR once and
+    then read memory-mapped, so only the pages of the requested columns are
+    read from the file. Those pages are compressed (PARQUET_COMPRESSION at
+    ingestion), so they are still decompressed and decoded into new buffers;
+    the saving is in the columns skipped, not a zero-copy read. No type
+    inference is run over the original text.
+    
+    Args:
+        parquet_path: Object name of the Parquet copy (Dataset.parquet_path)
+        columns: Columns to load (defaults to all)
+        storage: Storage client (defaults to a new StorageClient)
+        
+    Returns:
+        Arrow table with the requested columns
+    """
+    return pq.read_table(local_copy(parquet_path, storage), columns=columns, memory_map=True)
+
+def local_copy(object_name: str, storage: StorageClient = None) -> Path:
+    """Download an object to TEMP_DOWNLOAD_DIR unless it is already there
+    
+    The copies are an LRU cache bounded by DOWNLOAD_CACHE_SIZE: each use
+    refreshes a copy's modification time, and the least recently used copies
+    are removed once the cache is over its size after a download. A removed
+    copy stays readable by readers that already opened or mapped it.
+    
+    Args:
+        object_name: Object to download from DATASET_BUCKET
+        storage: Storage client (defaults to a new StorageClient)
+        
+    Returns:
+        Path of the local copy
+    """
+    local_path = config.TEMP_DOWNLOAD_DIR / os.path.basename(object_name)
+    with _lock:
+        downloading = _downloading.setdefault(local_path.name, threading.Lock())
+    try:
+        with downloading:
+            if _touch(local_path):
+                return local_path
+            _download(object_name, local_path, storage or StorageClient())
+    finally:
+        with _lock:
+            _downloading.pop(local_path.name, None)
+    _evict(keep=local_path)
+    return local_path
+
+def _touch(path: Path) -> bool:
+    """Mark a cached copy as just used; False if there is none"""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def _download(object_name: str, local_path: Path, storage: StorageClient):
+    # Each download writes its own partial file, so concurrent downloads of an
+    # object (e.g. from other processes) never interleave, and is renamed once
+    # complete so readers never see a partial file
+    partial = tempfile.NamedTemporaryFile(dir=config.TEMP_DOWNLOAD_DIR, prefix=f"{local_path.name}.", suffix='.part', delete=False)
+    partial.close()
+    try:
+        if not storage.download_file(object_name, partial.name):
+            raise FileNotFoundError(f"Could not download {object_name}")
+        os.replace(partial.name, local_path)
+    finally:
+        if os.path.exists(partial.name):
+            os.remove(partial.name)
+
+def _evict(keep: Path):
+    """Remove the least recently used copies until the cache fits DOWNLOAD_CACHE_SIZE"""
+    copies = []
+    with os.scandir(config.TEMP_DOWNLOAD_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and not entry.name.endswith('.part'):
+                stat = entry.stat()
+                copies.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in copies)
+    for _, size, path in sorted(copies):
+        if total <= config.DOWNLOAD_CACHE_SIZE:
+            break
+        if path == str(keep):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -34,9 +34,25 @@ MINIO_SECURE = os.getenv("MINIO_SECURE", "False").lower() == "true"
 DATASET_BUCKET = "datasets"
 TEMP_DOWNLOAD_DIR = Path("/tmp/dataaptor/downloads")
 TEMP_DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+DOWNLOAD_CACHE_SIZE = int(os.getenv("DOWNLOAD_CACHE_SIZE", 10 * 1024 * 1024 * 1024))  # Bytes of downloaded datasets kept in TEMP_DOWNLOAD_DIR
+
+# Storage transfers
+MULTIPART_THRESHOLD = int(os.getenv("MULTIPART_THRESHOLD", 16 * 1024 * 1024))  # Files larger than this are downloaded in parts
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", 8 * 1024 * 1024))
+MULTIPART_CONCURRENCY = int(os.getenv("MULTIPART_CONCURRENCY", 8))  # Parts downloaded in parallel per file
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 32))  # HTTP connections shared by all storage calls
+
+# Sampling of large datasets through ranged reads
+SAMPLE_WINDOWS = int(os.getenv("SAMPLE_WINDOWS", 64))  # Random byte windows read per object
+SAMPLE_WINDOW_SIZE = int(os.getenv("SAMPLE_WINDOW_SIZE", 256 * 1024))  # Bytes per window; should be much larger than a line
+SAMPLE_CONFIDENCE = float(os.getenv("SAMPLE_CONFIDENCE", 0.95))  # Confidence level of reported intervals
 
 # Assessment modules
 ASSESSMENT_MODULES = ["quality", "accessibility"]
+ASSESSMENT_WORKERS = int(os.getenv("ASSESSMENT_WORKERS", os.cpu_count() or 1))  # Processes scoring criteria in parallel
+ASSESSMENT_MODULE_TIMEOUT = float(os.getenv("ASSESSMENT_MODULE_TIMEOUT", 300))  # Seconds a module's criteria may run
+# Column profiles shared with worker processes; a tmpfs keeps them in RAM
+SHARED_MEMORY_DIR = Path(os.getenv("SHARED_MEMORY_DIR", "/dev/shm/dataaptor" if os.path.isdir("/dev/shm") else "/tmp/dataaptor/shared"))
 
 # Quality assessment criteria
 QUALITY_CRITERIA = {
@@ -58,6 +74,13 @@ QUALITY_CRITERIA = {
     }
 }
 
+# Quality assessment thresholds
+QUALITY_Z_THRESHOLD = float(os.getenv("QUALITY_Z_THRESHOLD", 3.0))  # Z-score beyond which a value may be an outlier
+QUALITY_IQR_FACTOR = float(os.getenv("QUALITY_IQR_FACTOR", 1.5))  # IQR multiple of the outlier fences
+QUALITY_FORMAT_MIN_SHARE = float(os.getenv("QUALITY_FORMAT_MIN_SHARE", 0.8))  # Share of values matching a format for it to be the column's format
+QUALITY_FRESHNESS_DAYS = float(os.getenv("QUALITY_FRESHNESS_DAYS", 30))  # Age of the newest value with full timeliness
+QUALITY_MAX_AGE_DAYS = float(os.getenv("QUALITY_MAX_AGE_DAYS", 365))  # Age of the newest value with zero timeliness
+
 # Accessibility assessment criteria
 ACCESSIBILITY_CRITERIA = {
     "availability": {
@@ -70,6 +93,24 @@ ACCESSIBILITY_CRITERIA = {
     }
 }
 
+# Accessibility assessment thresholds
+VOLUME_MIN_ROWS = int(os.getenv("VOLUME_MIN_ROWS", 100))  # Row count with zero volume score
+VOLUME_TARGET_ROWS = int(os.getenv("VOLUME_TARGET_ROWS", 100000))  # Row count with full volume score
+# Availability score of each file format; datasets with a Parquet copy score as Parquet
+FORMAT_AVAILABILITY = {
+    "parquet": 10.0,
+    "feather": 10.0,
+    "arrow": 10.0,
+    "csv": 8.0,
+    "jsonl": 8.0,
+    "json": 6.0,
+    "txt": 4.0
+}
+
+# Persistence of assessment results
+ASSESSMENT_INSERT_PAGE_SIZE = int(os.getenv("ASSESSMENT_INSERT_PAGE_SIZE", 1000))  # Rows per multi-row INSERT statement
+ASSESSMENT_COPY_THRESHOLD = int(os.getenv("ASSESSMENT_COPY_THRESHOLD", 5000))  # Rows from which PostgreSQL writes use COPY
+
 # Database tables
 DATASET_TABLE = "datasets"
 ASSESSMENT_TABLE = "assessments"
@@ -18,6 +18,8 @@ datasets = Table(
     Column("file_size", BigInteger, nullable=False),
     Column("created_at", TIMESTAMP, server_default=func.now()),
     Column("metadata", JSON),
+    Column("content_hash", String(64), unique=True),
+    Column("parquet_path", String(255)),
 )
 
 # Define assessments table
@@ -46,7 +48,10 @@ class Dataset(Base):
     file_type = Column(String(50), nullable=False)
     file_size = Column(BigInteger, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now())
-    metadata = Column(JSON)
+    # "metadata" is reserved on declarative models, so the column is mapped under another attribute name
+    metadata_ = Column("metadata", JSON)
+    content_hash = Column(String(64), unique=True)
+    parquet_path = Column(String(255))
 
     def __repr__(self):
         return f"<Dataset(id={self.id}, name='{self.name}', type='{self.file_type}')>"
@@ -0,0 +1,382 @@
+import math
+import json
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Any, Callable, List, Mapping, Optional
+import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import config
+from columnar import load_columns, local_copy
+from quality import QualityAssessor, column_profile, overall_score, round_score
+from scheduler import AssessmentScheduler, Node
+from shared import SharedProfile, shared_profiles
+from storage import StorageClient
+
+# Where the answer to a criterion comes from
+METADATA = "metadata"
+SCAN = "scan"
+NOT_APPLICABLE = "not_applicable"
+
+# Criteria and weights of each module
+_CRITERIA = {
+    "quality": config.QUALITY_CRITERIA,
+    "accessibility": config.ACCESSIBILITY_CRITERIA,
+}
+
+# Column kinds each scanned quality criterion reads; columns of unknown type are always read
+_SCAN_KINDS = {
+    "accuracy": {"numeric", "text"},
+    "consistency": {"text"},
+    "timeliness": {"text", "temporal"},
+}
+
+class CriterionPlan:
+    """How one criterion of an assessment is answered"""
+
+    def __init__(self, module: str, criterion: str, source: str, reason: str, columns: Optional[List[str]] = None):
+        self.module = module
+        self.criterion = criterion
+        self.source = source
+        self.reason = reason
+        # Columns a scan reads (None for all of them)
+        self.columns = columns
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "criterion": self.criterion,
+            "source": self.source,
+            "reason": self.reason,
+            "columns": self.columns
+        }
+
+class AssessmentPlan:
+    """Per-criterion sources of the assessment of one dataset"""
+
+    def __init__(self, dataset_id: int, steps: List[CriterionPlan]):
+        self.dataset_id = dataset_id
+        self.steps = steps
+
+    def sources(self, source: str) -> List[CriterionPlan]:
+        return [step for step in self.steps if step.source == source]
+
+    @property
+    def needs_scan(self) -> bool:
+        """Whether any criterion needs the raw data"""
+        return bool(self.sources(SCAN))
+
+    @property
+    def scan_columns(self) -> Optional[List[str]]:
+        """Union of the columns read by the scanned criteria, or None for all of them"""
+        columns: List[str] = []
+        for step in self.sources(SCAN):
+            if step.columns is None:
+                return None
+            columns.extend(col for col in step.columns if col not in columns)
+        return columns
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "dataset_id": self.dataset_id,
+            "needs_scan": self.needs_scan,
+            "scan_columns": self.scan_columns if self.needs_scan else [],
+            "criteria": [step.describe() for step in self.steps]
+        }
+
+def plan_assessment(dataset: Mapping[str, Any]) -> AssessmentPlan:
+    """Decide, per criterion, whether it can be answered from the metadata stored at ingestion
+
+    Completeness comes from the exact null counts of the ingestion profile
+    (which, unlike a scan, does not count blank strings as missing),
+    volume from its row count and availability from the file type, so they
+    never touch the data. Accuracy, consistency and timeliness depend on the
+    distribution of the values and need a scan, but only of the columns whose
+    type can matter to them; a criterion without such columns is not
+    applicable and skipped. Metadata that is missing, failed or estimated
+    from a sample sends its criteria to the scan instead.
+
+    Args:
+        dataset: Row of the datasets table (id, file_path, file_type,
+            parquet_path and metadata)
+
+    Returns:
+        The plan, to pass to run_assessment
+    """
+    metadata = _metadata(dataset)
+    profiled = metadata.get("processing_status") != "failed" and "sampling" not in metadata
+    kinds = {col: _column_kind(dtype) for col, dtype in (metadata.get("data_types") or {}).items()} if profiled else {}
+
+    steps = [_plan_completeness(metadata, profiled)]
+    for criterion, wanted in _SCAN_KINDS.items():
+        if not kinds:
+            steps.append(CriterionPlan("quality", criterion, SCAN, "column types unknown"))
+            continue
+        columns = [col for col, kind in kinds.items() if kind in wanted or kind == "unknown"]
+        if columns:
+            steps.append(CriterionPlan("quality", criterion, SCAN, "needs the distribution of the values", columns))
+        else:
+            steps.append(CriterionPlan("quality", criterion, NOT_APPLICABLE, f"no {' or '.join(sorted(wanted))} columns"))
+
+    steps.append(CriterionPlan("accessibility", "availability", METADATA, "file type"))
+    if profiled and isinstance(metadata.get("row_count"), int):
+        steps.append(CriterionPlan("accessibility", "volume", METADATA, "row count"))
+    else:
+        steps.append(CriterionPlan("accessibility", "volume", SCAN, "row count unknown", []))
+    return AssessmentPlan(dataset.get("id"), steps)
+
+def _plan_completeness(metadata: Dict[str, Any], profiled: bool) -> CriterionPlan:
+    completeness = metadata.get("completeness") or {}
+    statistics = metadata.get("statistics") or {}
+    if not profiled or completeness.get("overall_missing_percentage") is None:
+        return CriterionPlan("quality", "completeness", SCAN, "null counts unknown")
+    # Parquet footers may lack the null count of some columns, which leaves them out of the total
+    if any(stats.get("null_count") is None for stats in statistics.values()):
+        return CriterionPlan("quality", "completeness", SCAN, "null counts incomplete")
+    return CriterionPlan("quality", "completeness", METADATA, "null counts")
+
+def run_assessment(dataset: Mapping[str, Any], plan: Optional[AssessmentPlan] = None, storage: StorageClient = None,
+                   assessor: Optional[QualityAssessor] = None, modules: Optional[List[str]] = None,
+                   executor: Optional[Executor] = None, timeouts: Optional[Dict[str, float]] = None,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Assess a dataset, reading the raw data only for the criteria that need it
+
+    The plan is run as a DAG by AssessmentScheduler. The scanned columns
+    are loaded once for all scanned criteria: from the Parquet copy when
+    there is one, otherwise from a download of the original file. Each entry
+    of the column profile is then computed once, and the scanned criteria
+    run concurrently in the process pool, each reading only the profile
+    entries it needs. With worker processes, the profile is handed over as a
+    SharedProfile that every worker maps, and concurrent assessments of the
+    same dataset share it. Criteria answered from metadata run inline.
+
+    Args:
+        dataset: Row of the datasets table (see plan_assessment)
+        plan: Plan of the assessment (defaults to plan_assessment(dataset))
+        storage: Storage client (defaults to a new StorageClient)
+        assessor: Quality assessor of the scanned criteria (defaults to a new QualityAssessor)
+        modules: Modules to run (defaults to all of ASSESSMENT_MODULES)
+        executor: Pool of the scanned criteria (see AssessmentScheduler)
+        timeouts: Seconds per module (see AssessmentScheduler)
+        progress: Progress callback (see AssessmentScheduler)
+
+    Returns:
+        Dict with the 'plan' and one result per module, shaped like
+        QualityAssessor.assess and with the 'source' of each criterion;
+        criteria that failed or timed out are not applicable and carry the
+        'error'
+    """
+    plan = plan or plan_assessment(dataset)
+    modules = modules or config.ASSESSMENT_MODULES
+    plan = AssessmentPlan(plan.dataset_id, [step for step in plan.steps if step.module in modules])
+    metadata = _metadata(dataset)
+    assessor = assessor or QualityAssessor()
+
+    nodes: List[Node] = []
+    scanned = [step.criterion for step in plan.sources(SCAN) if step.module == "quality"]
+    entries = sorted({entry for criterion in scanned for entry in QualityAssessor.INPUTS[criterion]})
+    if any(step.criterion == "volume" for step in plan.sources(SCAN)) and "nulls" not in entries:
+        entries.append("nulls")
+    # With worker processes, the profile goes to shared memory once instead of being pickled to each of them
+    share = plan.needs_scan and (executor is not None or config.ASSESSMENT_WORKERS > 1)
+    key = shared_profiles.key(dataset.get("id"), dataset.get("content_hash"), dataset.get("file_path"),
+                              dataset.get("parquet_path"), plan.scan_columns, entries)
+    if share:
+        load = partial(_load, dataset, plan.scan_columns, metadata, storage)
+        nodes.append(Node("profile", partial(shared_profiles.acquire, key, lambda: column_profile(load(), set(entries)))))
+    elif plan.needs_scan:
+        nodes.append(Node("frame", partial(_load, dataset, plan.scan_columns, metadata, storage)))
+        for entry in entries:
+            nodes.append(Node(entry, partial(_profile_entry, entry), inputs=["frame"]))
+
+    for step in plan.steps:
+        name = f"{step.module}.{step.criterion}"
+        if step.source == NOT_APPLICABLE:
+            nodes.append(Node(name, partial(_not_applicable, step.reason), module=step.module))
+        elif step.module == "quality" and step.source == SCAN and share:
+            nodes.append(Node(name, _score_shared, inputs=["profile"], module=step.module, parallel=True,
+                              args=(assessor, step.criterion)))
+        elif step.module == "quality" and step.source == SCAN:
+            nodes.append(Node(name, assessor.score, inputs=QualityAssessor.INPUTS[step.criterion], module=step.module,
+                              parallel=True, args=(step.criterion,)))
+        elif step.criterion == "completeness":
+            nodes.append(Node(name, partial(_completeness_from_metadata, metadata), module=step.module))
+        elif step.criterion == "availability":
+            nodes.append(Node(name, partial(_availability, dataset, metadata), module=step.module))
+        elif step.source == SCAN and share:
+            nodes.append(Node(name, partial(_volume_of_profile, metadata), inputs=["profile"], module=step.module))
+        elif step.source == SCAN:
+            nodes.append(Node(name, partial(_volume_of_nulls, metadata), inputs=["nulls"], module=step.module))
+        else:
+            nodes.append(Node(name, partial(_volume, metadata.get("row_count"), metadata), module=step.module))
+
+    values, errors = AssessmentScheduler(nodes, executor=executor, timeouts=timeouts, progress=progress).run()
+    if "profile" in values:
+        shared_profiles.release(key)
+
+    results: Dict[str, Dict[str, Any]] = {module: {} for module in modules}
+    for step in plan.steps:
+        name = f"{step.module}.{step.criterion}"
+        if name in errors:
+            result = {"score": None, "applicable": False, "details": {}, "error": errors[name]}
+        else:
+            result = values[name]
+        weight = _CRITERIA[step.module][step.criterion]["weight"]
+        results[step.module][step.criterion] = {**result, "weight": weight, "source": step.source}
+
+    return {
+        "dataset_id": plan.dataset_id,
+        "plan": plan.describe(),
+        **{
+            module: {"module": module, "overall_score": overall_score(criteria), "criteria": criteria}
+            for module, criteria in results.items()
+        }
+    }
+
+def _profile_entry(entry: str, frame: pd.DataFrame) -> Any:
+    return column_profile(frame, {entry})[entry]
+
+def _score_shared(assessor: QualityAssessor, criterion: str, profile: SharedProfile) -> Dict[str, Any]:
+    """Score a criterion in a worker process from the shared profile entries it reads"""
+    return assessor.score(criterion, **profile.entries(QualityAssessor.INPUTS[criterion]))
+
+def _not_applicable(reason: str) -> Dict[str, Any]:
+    return {"score": None, "applicable": False, "details": {"reason": reason}}
+
+def _completeness_from_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    # The mean of the per-column null percentages. Unlike a scan, it does not count
+    # blank strings as missing, as ingestion does not record them; details says so.
+    missing = metadata["completeness"]["overall_missing_percentage"]
+    columns = {
+        col: {"present_percentage": 100 - stats["null_percentage"]}
+        for col, stats in (metadata.get("statistics") or {}).items() if stats.get("null_percentage") is not None
+    }
+    applicable = bool(metadata.get("row_count")) and bool(metadata.get("column_count"))
+    return {
+        "score": round_score((100 - missing) / 10) if applicable else None,
+        "applicable": applicable,
+        "details": {
+            "columns": columns,
+            "columns_with_nulls": metadata["completeness"].get("columns_with_nulls"),
+            "blank_strings_counted": False
+        }
+    }
+
+def _availability(dataset: Mapping[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    file_type = dataset.get("file_type")
+    details = {"file_type": file_type, "parquet_copy": bool(dataset.get("parquet_path"))}
+    if metadata.get("processing_status") == "failed":
+        # A file that could not be parsed at ingestion is not usable as is
+        return {"score": 0.0, "applicable": True, "details": {**details, "error": metadata.get("error")}}
+    score = config.FORMAT_AVAILABILITY.get(file_type, 0.0)
+    if dataset.get("parquet_path"):
+        score = max(score, config.FORMAT_AVAILABILITY["parquet"])
+    return {"score": round_score(score), "applicable": True, "details": details}
+
+def _volume_of_nulls(metadata: Dict[str, Any], nulls: Dict[str, Any]) -> Dict[str, Any]:
+    return _volume(nulls["row_count"], metadata)
+
+def _volume_of_profile(metadata: Dict[str, Any], profile: SharedProfile) -> Dict[str, Any]:
+    return _volume(profile.nulls["row_count"], metadata)
+
+def _volume(row_count: Optional[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Volume on a log scale from VOLUME_MIN_ROWS (0.0) to VOLUME_TARGET_ROWS (10.0)"""
+    details = {"row_count": row_count, "column_count": metadata.get("column_count")}
+    if not row_count or row_count <= config.VOLUME_MIN_ROWS:
+        return {"score": 0.0, "applicable": True, "details": details}
+    share = math.log(row_count / config.VOLUME_MIN_ROWS) / math.log(config.VOLUME_TARGET_ROWS / config.VOLUME_MIN_ROWS)
+    return {"score": round_score(share * 10), "applicable": True, "details": details}
+
+def _load(dataset: Mapping[str, Any], columns: Optional[List[str]], metadata: Dict[str, Any],
+          storage: StorageClient = None) -> pd.DataFrame:
+    """Load the scanned columns of a dataset
+    
+    None loads every column. An empty list loads none: the frame has no
+    columns but the dataset's row count, read as cheaply as the format allows.
+    """
+    if columns is not None and not columns:
+        return pd.DataFrame(index=pd.RangeIndex(_row_count(dataset, metadata, storage)))
+    if dataset.get("parquet_path"):
+        return load_columns(dataset["parquet_path"], columns, storage=storage).to_pandas()
+
+    file_type = dataset["file_type"]
+    local_path = local_copy(dataset["file_path"], storage)
+    if file_type == "csv":
+        return _read_csv(local_path, metadata, columns)
+    if file_type == "parquet":
+        return pq.read_table(local_path, columns=columns, memory_map=True).to_pandas()
+    if file_type in ("feather", "arrow"):
+        return feather.read_table(local_path, columns=columns, memory_map=True).to_pandas()
+    df = _read_whole(local_path, file_type)
+    return df[[col for col in columns if col in df.columns]] if columns is not None else df
+
+def _row_count(dataset: Mapping[str, Any], metadata: Dict[str, Any], storage: StorageClient = None) -> int:
+    """Row count of a dataset, from the Parquet footer or by reading a single column where possible"""
+    if dataset.get("parquet_path"):
+        with pq.ParquetFile(local_copy(dataset["parquet_path"], storage)) as parquet:
+            return parquet.metadata.num_rows
+
+    file_type = dataset["file_type"]
+    local_path = local_copy(dataset["file_path"], storage)
+    if file_type == "csv":
+        return len(_read_csv(local_path, metadata, [0]))
+    if file_type == "parquet":
+        with pq.ParquetFile(local_path) as parquet:
+            return parquet.metadata.num_rows
+    if file_type in ("feather", "arrow"):
+        # An empty projection reads every column, so only the first one is read
+        return feather.read_table(local_path, columns=[0], memory_map=True).num_rows
+    return len(_read_whole(local_path, file_type))
+
+def _read_csv(local_path, metadata: Dict[str, Any], usecols: Optional[List[Any]]) -> pd.DataFrame:
+    """Read a CSV file with the dialect detected at ingestion"""
+    dialect = metadata.get("dialect") or {}
+    options = {
+        "sep": dialect.get("delimiter", ","),
+        "quotechar": dialect.get("quotechar") or '"',
+        "escapechar": dialect.get("escapechar"),
+        "encoding": dialect.get("encoding", "utf-8")
+    }
+    if not dialect.get("has_header", True):
+        options["header"] = None
+        options["names"] = metadata.get("columns")
+    return pd.read_csv(local_path, usecols=usecols, **options)
+
+def _read_whole(local_path, file_type: str) -> pd.DataFrame:
+    """Read a file that has no column projection, with the columns the ingestion profiler recorded"""
+    if file_type in ("json", "jsonl"):
+        with open(local_path, "r", encoding="utf-8") as f:
+            if file_type == "jsonl":
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                records = data if isinstance(data, list) else [data]
+        if records and not isinstance(records[0], dict):
+            # Arrays of values are profiled as a single column
+            return pd.DataFrame({"value": records})
+        # Nested objects become one dotted column per leaf path, as at ingestion
+        return pd.json_normalize(records, sep=".")
+    if file_type == "txt":
+        with open(local_path, "r", encoding="utf-8", errors="replace") as f:
+            return pd.DataFrame({"text": f.read().splitlines()})
+    raise ValueError(f"Assessment is not supported for file type: {file_type}")
+
+def _metadata(dataset: Mapping[str, Any]) -> Dict[str, Any]:
+    metadata = dataset.get("metadata") or {}
+    return json.loads(metadata) if isinstance(metadata, str) else metadata
+
+def _column_kind(dtype: str) -> str:
+    """Kind of a column from the dtype recorded at ingestion: numeric, text, temporal, boolean or unknown"""
+    try:
+        dtype = pd.api.types.pandas_dtype(dtype)
+    except (TypeError, ValueError):
+        return "unknown"
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "temporal"
+    if pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return "text"
+    return "unknown"
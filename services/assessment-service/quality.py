@@ -0,0 +1,270 @@
+import warnings
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import config
+
+# Well-known text formats checked by the consistency criterion
+KNOWN_FORMATS = {
+    "email": r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+    "iso_date": r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$",
+    "url": r"^https?://\S+$",
+    "phone": r"^\+?[\d\s().-]{7,}$",
+    "uuid": r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$",
+}
+_DATE_PREFIX = r"^\d{4}-\d{2}-\d{2}"
+# Text that reads as a number. Matched with .str methods rather than pd.to_numeric, which does
+# not coerce Arrow-backed strings, so text mapped from a SharedProfile is scored without a copy.
+_NUMBER = r"(?i)^\s*[+-]?(\d+\.?\d*|\.\d+)(e[+-]?\d+)?\s*$|^\s*[+-]?inf(inity)?\s*$"
+
+class QualityAssessor:
+    """Score a dataset against QUALITY_CRITERIA in a few vectorized passes over its columns
+
+    Every criterion is computed with whole-column NumPy and pandas operations
+    (masks, reductions and ``.str`` methods); the only Python loops are over
+    columns, never over rows.
+
+    - completeness: share of cells that are neither null nor blank text
+    - accuracy: share of numeric values that are not outliers (beyond the
+      IQR fences *and* more than QUALITY_Z_THRESHOLD standard deviations from
+      the mean, so neither skewed nor heavy-tailed columns are over-penalized),
+      and share of text values of the column's majority type (numeric or not)
+    - consistency: share of text values that match the column's dominant
+      known format (email, ISO date, ...) or, failing that, its dominant shape
+      (letters and digit runs collapsed, e.g. "AB-12" -> "a-9"), discounted
+      by values with stray leading or trailing whitespace
+    - timeliness: recency of the newest value of each temporal column, full
+      marks within QUALITY_FRESHNESS_DAYS and none after QUALITY_MAX_AGE_DAYS,
+      discounted by values in the future. Not applicable without temporal
+      columns, in which case the other weights are renormalized.
+
+    Scores are on the 0.0-10.0 scale of the assessments table (NUMERIC(3,1)).
+    """
+
+    def __init__(self, reference_time: Optional[datetime] = None, z_threshold: float = None, iqr_factor: float = None,
+                 freshness_days: float = None, max_age_days: float = None):
+        """Initialize the assessor
+
+        Args:
+            reference_time: "Now" for timeliness (defaults to the current UTC time)
+            z_threshold: Z-score beyond which a value may be an outlier (defaults to QUALITY_Z_THRESHOLD)
+            iqr_factor: IQR multiple of the outlier fences (defaults to QUALITY_IQR_FACTOR)
+            freshness_days: Age of the newest value that still scores full timeliness
+            max_age_days: Age of the newest value that scores zero timeliness
+        """
+        self.reference_time = pd.Timestamp(reference_time or datetime.utcnow())
+        self.z_threshold = z_threshold or config.QUALITY_Z_THRESHOLD
+        self.iqr_factor = iqr_factor or config.QUALITY_IQR_FACTOR
+        self.freshness_days = freshness_days or config.QUALITY_FRESHNESS_DAYS
+        self.max_age_days = max_age_days or config.QUALITY_MAX_AGE_DAYS
+
+    # Entries of the column profile each criterion reads
+    INPUTS = {
+        "completeness": ["nulls", "text_values"],
+        "accuracy": ["numeric", "text_values"],
+        "consistency": ["text_values"],
+        "timeliness": ["temporal"],
+    }
+
+    def assess(self, data: Union[pd.DataFrame, pa.Table], criteria: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Score a dataset on the quality criteria
+
+        Args:
+            data: The dataset, e.g. from columnar.load_columns
+            criteria: Criteria to score (defaults to all of QUALITY_CRITERIA)
+
+        Returns:
+            Dict with 'criteria' (score, weight, applicable and per-column
+            details of each criterion) and the weighted 'overall_score'
+        """
+        df = data.to_pandas() if isinstance(data, pa.Table) else data
+        names = criteria or list(config.QUALITY_CRITERIA)
+        profile = column_profile(df, {entry for name in names for entry in self.INPUTS[name]})
+        results = {name: self.score(name, **{entry: profile[entry] for entry in self.INPUTS[name]}) for name in names}
+        return {
+            "module": "quality",
+            "row_count": len(df),
+            "column_count": len(df.columns),
+            "overall_score": overall_score(results),
+            "criteria": results
+        }
+
+    def score(self, criterion: str, **profile) -> Dict[str, Any]:
+        """Score one criterion from the entries of the column profile it reads (see INPUTS)"""
+        scorers = {
+            "completeness": self._completeness,
+            "accuracy": self._accuracy,
+            "consistency": self._consistency,
+            "timeliness": self._timeliness,
+        }
+        fractions, details = scorers[criterion](**profile)
+        score = float(np.mean(list(fractions.values()))) * 10 if fractions else None
+        return {
+            "score": round_score(score) if score is not None else None,
+            "weight": config.QUALITY_CRITERIA[criterion]["weight"],
+            "applicable": score is not None,
+            "details": details
+        }
+
+    def _completeness(self, nulls: Dict[str, Any], text_values: Dict[str, pd.Series]):
+        if not nulls["row_count"] or not nulls["columns"]:
+            return {}, {"columns": {}}
+        missing = nulls["missing"].copy()
+        for i, col in enumerate(nulls["columns"]):
+            if col in text_values:
+                missing[i] += text_values[col].str.strip().eq("").sum()
+        present = 1 - missing / nulls["row_count"]
+        fractions = dict(zip(nulls["columns"], present.tolist()))
+        return fractions, {"columns": {col: {"present_percentage": float(value * 100)} for col, value in fractions.items()}}
+
+    def _accuracy(self, numeric: Tuple[List[str], np.ndarray], text_values: Dict[str, pd.Series]):
+        numeric, block = numeric
+        fractions, columns = {}, {}
+        if numeric and len(block):
+            with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                q1, q3 = np.nanpercentile(block, [25, 75], axis=0)
+                iqr = q3 - q1
+                outside_fences = (block < q1 - self.iqr_factor * iqr) | (block > q3 + self.iqr_factor * iqr)
+                z = np.abs(block - np.nanmean(block, axis=0)) / np.nanstd(block, axis=0)
+                outliers = outside_fences & (z > self.z_threshold)
+                counts = np.sum(~np.isnan(block), axis=0)
+                outlier_rate = np.where(counts > 0, outliers.sum(axis=0) / np.maximum(counts, 1), 0.0)
+            for i, col in enumerate(numeric):
+                if counts[i]:
+                    fractions[col] = 1 - float(outlier_rate[i])
+                    columns[col] = {"outlier_percentage": float(outlier_rate[i] * 100), "outliers": int(outliers[:, i].sum())}
+
+        for col, values in text_values.items():
+            if values.empty:
+                continue
+            numeric_share = float(values.str.match(_NUMBER).mean())
+            majority = max(numeric_share, 1 - numeric_share)
+            fractions[col] = majority
+            columns[col] = {
+                "majority_type": "numeric" if numeric_share >= 0.5 else "text",
+                "type_mismatch_percentage": float((1 - majority) * 100)
+            }
+        return fractions, {"columns": columns}
+
+    def _consistency(self, text_values: Dict[str, pd.Series]):
+        fractions, columns = {}, {}
+        for col, values in text_values.items():
+            if values.empty:
+                continue
+            stripped = values.str.strip()
+            padded = float((stripped.str.len() != values.str.len()).mean())
+
+            detail: Dict[str, Any] = {}
+            conformance = {name: float(stripped.str.match(pattern).mean()) for name, pattern in KNOWN_FORMATS.items()}
+            best = max(conformance, key=conformance.get)
+            if conformance[best] >= config.QUALITY_FORMAT_MIN_SHARE:
+                share = conformance[best]
+                detail["format"] = best
+            else:
+                shapes = stripped.str.replace(r"[^\W\d_]+", "a", regex=True).str.replace(r"\d+", "9", regex=True)
+                counts = shapes.value_counts()
+                share = float(counts.iloc[0] / len(shapes))
+                detail["dominant_shape"] = counts.index[0]
+            detail["conformance_percentage"] = float(share * 100)
+            detail["padded_percentage"] = float(padded * 100)
+            fractions[col] = share * (1 - padded)
+            columns[col] = detail
+        return fractions, {"columns": columns}
+
+    def _timeliness(self, temporal: Dict[str, pd.Series]):
+        fractions, columns = {}, {}
+        day = np.timedelta64(1, "D")
+        for col, values in temporal.items():
+            stamps = values.dropna()
+            if stamps.empty:
+                continue
+            future = float((stamps > self.reference_time).mean())
+            newest = stamps[stamps <= self.reference_time].max()
+            age_days = (self.reference_time - newest) / day if pd.notna(newest) else None
+            if age_days is None:
+                recency = 0.0
+            else:
+                recency = float(np.clip(1 - (age_days - self.freshness_days) / (self.max_age_days - self.freshness_days), 0, 1))
+            fractions[col] = recency * (1 - future)
+            columns[col] = {
+                "newest": newest.isoformat() if pd.notna(newest) else None,
+                "age_days": float(age_days) if age_days is not None else None,
+                "future_percentage": float(future * 100)
+            }
+        return fractions, {"columns": columns}
+
+    @staticmethod
+    def to_rows(dataset_id: int, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rows of the assessments table for the applicable criteria of an assessment"""
+        return [
+            {
+                "dataset_id": dataset_id,
+                "module": result["module"],
+                "criterion": name,
+                "score": Decimal(str(criterion["score"])),
+                "details": criterion["details"]
+            }
+            for name, criterion in result["criteria"].items() if criterion["applicable"]
+        ]
+
+def column_profile(df: pd.DataFrame, entries: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Inputs shared by the quality criteria, each computed once per dataset
+
+    Entries:
+        nulls: Row count, column names and null count of every column
+        numeric: Names of the numeric columns and their values as one float64 block
+        text_values: Non-null values of every text column, as strings
+        temporal: Datetime columns, and text columns of ISO 8601 dates parsed as naive UTC timestamps
+
+    Args:
+        df: The dataset
+        entries: Entries to compute (defaults to all)
+    """
+    entries = entries or {"nulls", "numeric", "text_values", "temporal"}
+    text = [col for col in df.columns if pd.api.types.is_string_dtype(df[col].dtype) or isinstance(df[col].dtype, pd.CategoricalDtype)]
+    profile: Dict[str, Any] = {}
+    if "nulls" in entries:
+        profile["nulls"] = {"row_count": len(df), "columns": list(df.columns), "missing": df.isna().sum().to_numpy(dtype=np.float64)}
+    if "numeric" in entries:
+        numeric = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)]
+        profile["numeric"] = (numeric, df[numeric].to_numpy(dtype=np.float64, na_value=np.nan))
+    if "text_values" in entries:
+        profile["text_values"] = {col: df[col].dropna().astype(str) for col in text}
+    if "temporal" in entries:
+        profile["temporal"] = temporal_columns(df, text)
+    return profile
+
+def temporal_columns(df: pd.DataFrame, text: List[str]) -> Dict[str, pd.Series]:
+    """Datetime columns, and text columns of ISO 8601 dates parsed as naive UTC timestamps"""
+    temporal = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            temporal[col] = _naive_utc(series)
+        elif col in text:
+            values = series.dropna().astype(str)
+            if not values.empty and values.str.match(_DATE_PREFIX).mean() >= config.QUALITY_FORMAT_MIN_SHARE:
+                temporal[col] = _naive_utc(pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True))
+    return temporal
+
+def overall_score(criteria: Dict[str, Dict[str, Any]]) -> Optional[float]:
+    """Weighted mean of the applicable criteria, with their weights renormalized to sum to one"""
+    applicable = [criterion for criterion in criteria.values() if criterion["applicable"]]
+    weights = sum(criterion["weight"] for criterion in applicable)
+    if not weights:
+        return None
+    return round_score(sum(criterion["score"] * criterion["weight"] for criterion in applicable) / weights)
+
+def round_score(score: float) -> float:
+    """Clamp a score to 0.0-10.0 and round it half up to one decimal, as stored in NUMERIC(3,1)"""
+    clamped = min(max(float(score), 0.0), 10.0)
+    return float(Decimal(repr(clamped)).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+
+def _naive_utc(series: pd.Series) -> pd.Series:
+    if getattr(series.dt, "tz", None) is not None:
+        return series.dt.tz_convert("UTC").dt.tz_localize(None)
+    return series
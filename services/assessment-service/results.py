@@ -0,0 +1,101 @@
+import io
+import csv
+import json
+from typing import Dict, Any, Iterable, List
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection, Engine
+import config
+from database import engine as default_engine, assessments
+from quality import QualityAssessor
+
+# Columns written for each criterion; created_at is left to the server default
+COLUMNS = ["dataset_id", "module", "criterion", "score", "details"]
+
+def assessment_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rows of the assessments table for every applicable criterion of a run_assessment result"""
+    rows = []
+    for module in config.ASSESSMENT_MODULES:
+        if module in result:
+            rows.extend(QualityAssessor.to_rows(result["dataset_id"], result[module]))
+    return rows
+
+class AssessmentWriter:
+    """Persist assessment results in bulk, one transaction per write
+
+    Rows go to the database in multi-row statements instead of one INSERT
+    and commit per criterion. Up to ASSESSMENT_COPY_THRESHOLD rows are sent
+    as batched multi-row ``INSERT ... RETURNING id`` (SQLAlchemy's
+    insertmanyvalues, in pages of ASSESSMENT_INSERT_PAGE_SIZE rows). Larger
+    writes to PostgreSQL reserve their IDs from the table's sequence in one
+    query and stream the rows with ``COPY ... FROM STDIN``, which skips
+    per-row statement processing altogether.
+    """
+
+    def __init__(self, engine: Engine = None, page_size: int = None, copy_threshold: int = None):
+        """Initialize the writer
+
+        Args:
+            engine: Database engine (defaults to the service's engine)
+            page_size: Rows per INSERT statement (defaults to ASSESSMENT_INSERT_PAGE_SIZE)
+            copy_threshold: Rows from which PostgreSQL writes use COPY (defaults to ASSESSMENT_COPY_THRESHOLD)
+        """
+        self.engine = engine or default_engine
+        self.page_size = page_size or config.ASSESSMENT_INSERT_PAGE_SIZE
+        self.copy_threshold = copy_threshold or config.ASSESSMENT_COPY_THRESHOLD
+
+    def write_results(self, results: Iterable[Dict[str, Any]]) -> Dict[int, List[int]]:
+        """Persist the criteria of many run_assessment results in one transaction
+
+        Returns:
+            IDs of the inserted rows by dataset ID
+        """
+        rows = [row for result in results for row in assessment_rows(result)]
+        ids: Dict[int, List[int]] = {}
+        for row, row_id in zip(rows, self.write(rows)):
+            ids.setdefault(row["dataset_id"], []).append(row_id)
+        return ids
+
+    def write(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert assessment rows in one transaction
+
+        Args:
+            rows: Rows with the keys of COLUMNS, e.g. from assessment_rows
+
+        Returns:
+            IDs of the inserted rows, in the order of ``rows``
+        """
+        if not rows:
+            return []
+        with self.engine.begin() as connection:
+            if connection.dialect.name == "postgresql" and len(rows) >= self.copy_threshold:
+                return self._copy(connection, rows)
+            statement = insert(assessments).returning(assessments.c.id, sort_by_parameter_order=True)
+            result = connection.execution_options(insertmanyvalues_page_size=self.page_size).execute(
+                statement, [{column: row[column] for column in COLUMNS} for row in rows]
+            )
+            return [row_id for row_id, in result]
+
+    @staticmethod
+    def _copy(connection: Connection, rows: List[Dict[str, Any]]) -> List[int]:
+        """Write rows to PostgreSQL with COPY, reserving their IDs first as COPY returns none"""
+        ids = [row_id for row_id, in connection.execute(
+            text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+            {"table": config.ASSESSMENT_TABLE, "count": len(rows)}
+        )]
+        # The DBAPI connection of the SQLAlchemy one, so COPY runs inside the same transaction
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {config.ASSESSMENT_TABLE} (id, {', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                copy_buffer(rows, ids)
+            )
+        return ids
+
+def copy_buffer(rows: List[Dict[str, Any]], ids: List[int]) -> io.StringIO:
+    """CSV of rows for COPY, with the given IDs; details are JSON and an empty field is NULL"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row_id, row in zip(ids, rows):
+        details = json.dumps(row["details"]) if row.get("details") is not None else None
+        writer.writerow([row_id, row["dataset_id"], row["module"], row["criterion"], row["score"], details])
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,277 @@
+import io
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+import numpy as np
+import config
+from storage import StorageClient
+
+class RangeSample:
+    """Line-aligned byte windows read from an object through ranged GETs
+
+    The object body (everything after the header line, if any) is split into
+    ``windows`` equal strata and one window of ``window_size`` bytes is read at
+    a random offset inside each. A window is trimmed to the complete lines it
+    contains: the partial line at its start and the one cut off at its end are
+    dropped. Lines longer than a window are never sampled, so windows should be
+    much larger than typical lines. Objects no larger than the windows combined
+    are read whole and the sample is exact.
+    """
+
+    def __init__(self, storage: StorageClient, object_name: str, windows: int = None, window_size: int = None,
+                 header: bool = False, seed: Optional[int] = None):
+        """Read the sample
+
+        Args:
+            storage: Client used for the ranged GETs
+            object_name: Object to sample in DATASET_BUCKET
+            windows: Number of windows (defaults to SAMPLE_WINDOWS)
+            window_size: Bytes per window (defaults to SAMPLE_WINDOW_SIZE)
+            header: Whether the first line is a header to keep out of the sample
+            seed: Seed of the window offsets, for reproducible samples
+        """
+        self.windows = windows or config.SAMPLE_WINDOWS
+        self.window_size = window_size or config.SAMPLE_WINDOW_SIZE
+        self.object_size = storage.get_object_size(object_name)
+        self.header = b''
+        if header and self.object_size:
+            head = storage.get_range(object_name, 0, min(self.object_size, self.window_size) - 1)
+            newline = head.find(b'\n')
+            if newline < 0 and len(head) < self.object_size:
+                raise ValueError(f"Header line of {object_name} is longer than {len(head)} bytes")
+            self.header = head[:newline + 1] if newline >= 0 else head
+        self.body_start = len(self.header)
+        self.body_size = self.object_size - self.body_start
+        self.exact = self.body_size <= self.windows * self.window_size
+
+        if self.exact:
+            ranges = [(self.body_start, self.object_size - 1)] if self.body_size else []
+        else:
+            rng = random.Random(seed)
+            stratum = self.body_size / self.windows
+            offsets = [self.body_start + int(i * stratum + rng.random() * (stratum - self.window_size)) for i in range(self.windows)]
+            # Start one byte early so a window starting exactly on a line boundary keeps that line
+            ranges = [(max(offset - 1, self.body_start), offset + self.window_size - 1) for offset in offsets]
+
+        with ThreadPoolExecutor(max_workers=min(config.MULTIPART_CONCURRENCY, max(len(ranges), 1))) as executor:
+            chunks = list(executor.map(lambda r: storage.get_range(object_name, *r), ranges))
+
+        self.chunks = [self._align(chunk, start, end) for chunk, (start, end) in zip(chunks, ranges)]
+        self.sampled_bytes = sum(len(chunk) for chunk in chunks)
+
+    def _align(self, chunk: bytes, start: int, end: int) -> bytes:
+        """Trim a window to the complete lines inside it"""
+        if start > self.body_start:
+            newline = chunk.find(b'\n')
+            chunk = chunk[newline + 1:] if newline >= 0 else b''
+        if end < self.object_size - 1:
+            # The object continues past the window, so the last line may be cut off
+            chunk = chunk[:chunk.rfind(b'\n') + 1]
+        return chunk
+
+    def line_lengths(self) -> np.ndarray:
+        """Byte length of every sampled line, including its line break"""
+        lengths = []
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            breaks = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n'))
+            ends = breaks + 1 if chunk.endswith(b'\n') else np.append(breaks + 1, len(chunk))
+            lengths.append(np.diff(ends, prepend=0))
+        return np.concatenate(lengths) if lengths else np.array([], dtype=np.int64)
+
+    def info(self, rows: int, confidence: float) -> Dict[str, Any]:
+        """Describe how the sample was taken"""
+        return {
+            'mode': 'full' if self.exact else 'ranged_sample',
+            'object_size': self.object_size,
+            'windows': len(self.chunks),
+            'window_size': self.window_size,
+            'sampled_bytes': self.sampled_bytes,
+            'sample_rows': rows,
+            'confidence': confidence
+        }
+
+def sample_object(object_name: str, file_type: str, storage: StorageClient = None, windows: int = None,
+                  window_size: int = None, confidence: float = None, seed: Optional[int] = None,
+                  dialect: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Profile a dataset in object storage from ranged reads instead of a full download
+
+    Args:
+        object_name: Object to profile in DATASET_BUCKET
+        file_type: Type of the file (csv, txt)
+        storage: Storage client (defaults to a new StorageClient)
+        windows: Number of windows read (defaults to SAMPLE_WINDOWS)
+        window_size: Bytes per window (defaults to SAMPLE_WINDOW_SIZE)
+        confidence: Confidence level of the reported intervals (defaults to SAMPLE_CONFIDENCE)
+        seed: Seed of the window offsets, for reproducible samples
+        dialect: CSV dialect detected at ingestion (metadata['dialect']); defaults
+            to comma-separated UTF-8 with a header row
+
+    Returns:
+        Dict with the ingestion metadata fields estimated from the sample, plus
+        'sampling' describing the sample and 'confidence_intervals'
+    """
+    storage = storage or StorageClient()
+    confidence = confidence or config.SAMPLE_CONFIDENCE
+    try:
+        if file_type == "csv":
+            dialect = dialect or {}
+            sample = RangeSample(storage, object_name, windows, window_size, header=dialect.get('has_header', True), seed=seed)
+            return _profile_csv_sample(sample, confidence, dialect)
+        elif file_type == "txt":
+            sample = RangeSample(storage, object_name, windows, window_size, seed=seed)
+            return _profile_txt_sample(sample, confidence)
+        else:
+            return {
+                'error': f"Sampling is not supported for file type: {file_type}",
+                'processing_status': 'failed'
+            }
+    except Exception as e:
+        return {
+            'error': str(e),
+            'format': file_type,
+            'processing_status': 'failed'
+        }
+
+def _profile_csv_sample(sample: RangeSample, confidence: float, dialect: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile the rows of a CSV sample and scale counts to the estimated row count"""
+    options = {
+        'sep': dialect.get('delimiter', ','),
+        'quotechar': dialect.get('quotechar') or '"',
+        'escapechar': dialect.get('escapechar'),
+        'encoding': dialect.get('encoding', 'utf-8')
+    }
+    if not dialect.get('has_header', True):
+        options['header'] = None
+    df = pd.read_csv(io.BytesIO(sample.header + b''.join(sample.chunks)), on_bad_lines='skip', **options)
+    lengths = sample.line_lengths()
+    row_count, row_interval = _estimate_line_count(sample, lengths, confidence)
+    scale = row_count / len(df) if len(df) else 0.0
+
+    metadata = {
+        'row_count': row_count,
+        'column_count': len(df.columns),
+        'columns': df.columns.tolist(),
+        'data_types': {col: str(df[col].dtype) for col in df.columns},
+        'sample_data': df.head(5).to_dict(orient='records'),
+        'statistics': {}
+    }
+    intervals = {'row_count': row_interval, 'statistics': {}}
+
+    nulls = df.isna()
+    null_counts = nulls.sum()
+    for col in df.select_dtypes(include=[np.number]).columns:
+        values = df[col].dropna().to_numpy(dtype=np.float64)
+        null_count = int(null_counts[col])
+        metadata['statistics'][col] = {
+            'min': float(values.min()) if len(values) else None,
+            'max': float(values.max()) if len(values) else None,
+            'mean': float(values.mean()) if len(values) else None,
+            'median': float(np.median(values)) if len(values) else None,
+            'std': float(values.std(ddof=1)) if len(values) > 1 else None,
+            'null_count': int(round(null_count * scale)),
+            'null_percentage': float(null_count / len(df) * 100) if len(df) else 0.0
+        }
+        intervals['statistics'][col] = {
+            'mean': _mean_interval(values, confidence),
+            'null_percentage': _proportion_interval(null_count, len(df), confidence)
+        }
+    for col in df.select_dtypes(include=['object', 'category']).columns:
+        value_counts = df[col].value_counts()
+        null_count = int(null_counts[col])
+        metadata['statistics'][col] = {
+            'unique_count': int(len(value_counts)),
+            'null_count': int(round(null_count * scale)),
+            'null_percentage': float(null_count / len(df) * 100) if len(df) else 0.0,
+            # Counts within the sample; keys are strings to ensure JSON serialization
+            'top_values': {str(k): int(v) for k, v in value_counts.head(10).items()}
+        }
+        intervals['statistics'][col] = {
+            'null_percentage': _proportion_interval(null_count, len(df), confidence)
+        }
+
+    rows_with_nulls = int(nulls.any(axis=1).sum())
+    metadata['completeness'] = {
+        'overall_missing_percentage': float(nulls.mean().mean() * 100) if len(df) else 0.0,
+        'columns_with_nulls': int(nulls.any(axis=0).sum()),
+        'rows_with_nulls': int(round(rows_with_nulls * scale))
+    }
+    intervals['completeness'] = {
+        'rows_with_nulls_percentage': _proportion_interval(rows_with_nulls, len(df), confidence)
+    }
+
+    metadata['sampling'] = sample.info(len(df), confidence)
+    metadata['confidence_intervals'] = intervals
+    return metadata
+
+def _profile_txt_sample(sample: RangeSample, confidence: float) -> Dict[str, Any]:
+    """Profile the lines of a text sample"""
+    lines = b''.join(sample.chunks).decode('utf-8', errors='replace').splitlines()
+    lengths = sample.line_lengths()
+    line_count, line_interval = _estimate_line_count(sample, lengths, confidence)
+    characters = np.array([len(line) for line in lines], dtype=np.int64)
+    stripped = sum(len(line.strip()) for line in lines)
+    # Stripped characters per line, plus the space joining consecutive lines
+    characters_per_line = (stripped + max(len(lines) - 1, 0)) / len(lines) if lines else 0.0
+    estimated_characters = int(characters_per_line * line_count)
+
+    return {
+        'format': 'txt',
+        'row_count': line_count,
+        'column_count': 1,
+        'columns': ['text'],
+        'data_types': {'text': 'string'},
+        'sample_data': [{'text': line.strip()} for line in lines[:5]],
+        'line_length_stats': {
+            'min': int(characters.min()) if len(characters) else 0,
+            'max': int(characters.max()) if len(characters) else 0,
+            'mean': float(characters.mean()) if len(characters) else 0,
+            'median': int(np.sort(characters)[len(characters) // 2]) if len(characters) else 0,
+            'std': float(characters.std()) if len(characters) else 0
+        },
+        'estimated_tokens': {
+            'estimated_total': estimated_characters // 4,
+            'estimation_method': 'character_based',
+            'characters': estimated_characters
+        },
+        'sampling': sample.info(len(lines), confidence),
+        'confidence_intervals': {
+            'row_count': line_interval,
+            'line_length_stats': {'mean': _mean_interval(characters, confidence)}
+        }
+    }
+
+def _estimate_line_count(sample: RangeSample, lengths: np.ndarray, confidence: float) -> Tuple[int, List[float]]:
+    """Estimate the number of lines in the object body from the sampled line lengths
+
+    The count is the body size over the mean line length; its interval comes
+    from the interval of the mean line length.
+    """
+    if sample.exact or not len(lengths):
+        return len(lengths), [float(len(lengths)), float(len(lengths))]
+    low, high = _mean_interval(lengths, confidence)
+    estimate = int(round(sample.body_size / lengths.mean()))
+    return estimate, [sample.body_size / high, sample.body_size / low if low > 0 else math.inf]
+
+def _mean_interval(values: np.ndarray, confidence: float) -> Optional[List[float]]:
+    """Normal-approximation confidence interval of a mean"""
+    if len(values) < 2:
+        return None
+    mean = float(np.mean(values))
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * float(np.std(values, ddof=1)) / math.sqrt(len(values))
+    return [mean - margin, mean + margin]
+
+def _proportion_interval(count: int, total: int, confidence: float) -> Optional[List[float]]:
+    """Wilson score interval of a proportion, as percentages"""
+    if total == 0:
+        return None
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = count / total
+    denominator = 1 + z ** 2 / total
+    center = (p + z ** 2 / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / denominator
+    return [max(center - margin, 0.0) * 100, min(center + margin, 1.0) * 100]
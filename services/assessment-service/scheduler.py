@@ -0,0 +1,180 @@
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+import config
+
+class Node:
+    """One step of an assessment DAG: an input shared by criteria, or a criterion of a module
+
+    The node's function is called with the values of its inputs as keyword
+    arguments named after them, after any positional ``args``.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], inputs: Sequence[str] = (), module: Optional[str] = None,
+                 parallel: bool = False, args: Tuple = ()):
+        """Initialize the node
+
+        Args:
+            name: Unique name, e.g. "frame" or "quality.accuracy"
+            func: Function computing the node's value
+            inputs: Names of the nodes whose values it needs
+            module: Assessment module of a criterion (None for shared inputs)
+            parallel: Run it in the process pool rather than inline; its
+                function, arguments and inputs must then be picklable
+            args: Positional arguments of the function
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.module = module
+        self.parallel = parallel
+        self.args = args
+
+class AssessmentScheduler:
+    """Run an assessment DAG, sending independent criteria to a process pool
+
+    Each node runs once, as soon as all of its inputs are available, so
+    inputs shared by several criteria (the loaded frame, the column profile)
+    are computed once and criteria that do not depend on each other run
+    concurrently. Inline nodes run in the calling thread between waits.
+
+    Each module has a timeout (ASSESSMENT_MODULE_TIMEOUT by default),
+    counted from the submission of its first criterion. Criteria still
+    running when it expires are recorded as failed; a process pool cannot
+    interrupt them, so they finish in the background and their results are
+    discarded. A node whose input failed fails too, without running.
+    """
+
+    def __init__(self, nodes: List[Node], executor: Optional[Executor] = None, workers: int = None,
+                 timeouts: Optional[Dict[str, float]] = None, progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Initialize the scheduler
+
+        Args:
+            nodes: Nodes of the DAG
+            executor: Pool of the parallel nodes (defaults to a ProcessPoolExecutor
+                of ``workers`` processes, created when first needed and shut down
+                after the run)
+            workers: Processes of the default pool (defaults to ASSESSMENT_WORKERS);
+                with one or fewer, parallel nodes run inline
+            timeouts: Seconds per module, overriding ASSESSMENT_MODULE_TIMEOUT
+            progress: Called with the progress of the assessment, as
+                {'percentage', 'current_module', 'completed_criteria', 'total_criteria'},
+                whenever a criterion completes
+        """
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Node names must be unique")
+        self._check(nodes)
+        self.executor = executor
+        self.workers = workers or config.ASSESSMENT_WORKERS
+        self.timeouts = timeouts or {}
+        self.progress = progress
+        self.values: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+
+    def _check(self, nodes: List[Node]):
+        """Reject unknown inputs and cycles"""
+        for node in nodes:
+            for name in node.inputs:
+                if name not in self.nodes:
+                    raise ValueError(f"Node {node.name} has unknown input {name}")
+        visited: Dict[str, bool] = {}
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if visited.get(name):
+                return
+            if name in path:
+                raise ValueError(f"Cycle in assessment DAG: {' -> '.join(path + (name,))}")
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + (name,))
+            visited[name] = True
+
+        for node in nodes:
+            visit(node.name, ())
+
+    def timeout(self, module: str) -> float:
+        return self.timeouts.get(module, config.ASSESSMENT_MODULE_TIMEOUT)
+
+    def run(self) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Run every node
+
+        Returns:
+            Tuple of the values of the nodes that succeeded and the errors of
+            those that failed, by node name
+        """
+        pending = dict(self.nodes)
+        running: Dict[Future, Node] = {}
+        deadlines: Dict[str, float] = {}
+        own_executor = None
+        executor = self.executor
+        if executor is None and self.workers > 1 and any(node.parallel for node in pending.values()):
+            executor = own_executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        try:
+            while pending or running:
+                ready = True
+                while ready:
+                    ready = False
+                    for name, node in list(pending.items()):
+                        failed = [dependency for dependency in node.inputs if dependency in self.errors]
+                        if failed:
+                            del pending[name]
+                            self._fail(node, f"Input {failed[0]} failed")
+                            ready = True
+                        elif all(dependency in self.values for dependency in node.inputs):
+                            del pending[name]
+                            kwargs = {dependency: self.values[dependency] for dependency in node.inputs}
+                            if node.parallel and executor is not None:
+                                if node.module is not None and node.module not in deadlines:
+                                    deadlines[node.module] = time.monotonic() + self.timeout(node.module)
+                                running[executor.submit(node.func, *node.args, **kwargs)] = node
+                            else:
+                                try:
+                                    self._succeed(node, node.func(*node.args, **kwargs))
+                                except Exception as e:
+                                    self._fail(node, str(e))
+                                ready = True
+
+                if not running:
+                    continue
+                modules = {node.module for node in running.values() if node.module in deadlines}
+                timeout = min((deadlines[module] - time.monotonic() for module in modules), default=None)
+                done, _ = wait(running, timeout=max(timeout, 0) if timeout is not None else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        self._succeed(node, future.result())
+                    except Exception as e:
+                        self._fail(node, str(e))
+
+                now = time.monotonic()
+                for future, node in list(running.items()):
+                    if node.module in deadlines and now >= deadlines[node.module]:
+                        future.cancel()
+                        del running[future]
+                        self._fail(node, f"Module {node.module} timed out after {self.timeout(node.module):g} seconds")
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown(wait=False, cancel_futures=True)
+        return self.values, self.errors
+
+    def _succeed(self, node: Node, value: Any):
+        self.values[node.name] = value
+        self._report(node)
+
+    def _fail(self, node: Node, error: str):
+        self.errors[node.name] = error
+        self._report(node)
+
+    def _report(self, node: Node):
+        if self.progress is None or node.module is None:
+            return
+        criteria = [other for other in self.nodes.values() if other.module is not None]
+        completed = [other for other in criteria if other.name in self.values or other.name in self.errors]
+        remaining = [other.module for other in criteria if other not in completed]
+        self.progress({
+            "percentage": len(completed) / len(criteria) * 100,
+            "current_module": remaining[0] if remaining else None,
+            "completed_criteria": len(completed),
+            "total_criteria": len(criteria)
+        })
@@ -0,0 +1,163 @@
+import os
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import config
+
+class SharedProfile:
+    """Column profile of a dataset held in memory-mapped Arrow files that worker processes share
+
+    The profile (see quality.column_profile) is written once, uncompressed,
+    to SHARED_MEMORY_DIR: a tmpfs such as /dev/shm, so the files live in
+    RAM. Workers receive only this handle, which pickles to a directory and
+    a list of column names, and map the files rather than unpickling a copy
+    of the data; the buffers of the columns they read are then views of the
+    same physical pages in every process. Numeric columns are stored as
+    float64 without a validity bitmap (nulls as NaN), so they map to NumPy
+    without any conversion, and text columns map to Arrow-backed pandas
+    Series (``pd.ArrowDtype``) whose string methods run on the mapped
+    buffers, so no worker holds Python strings of the dataset. Results
+    derived from them (stripped values, shapes) are still per worker.
+    """
+
+    def __init__(self, directory: Path, nulls: Optional[Dict[str, Any]], numeric: Optional[List[str]],
+                 text: Optional[List[str]], temporal: Optional[List[str]]):
+        self.directory = Path(directory)
+        self.nulls = nulls
+        self.numeric = numeric
+        self.text = text
+        self.temporal = temporal
+
+    @classmethod
+    def create(cls, profile: Dict[str, Any], name: str) -> 'SharedProfile':
+        """Write the entries of a column profile to SHARED_MEMORY_DIR
+
+        Falls back to TEMP_DOWNLOAD_DIR, where mapped pages are shared
+        through the page cache instead, when the tmpfs is missing or full.
+        """
+        try:
+            return cls._write(profile, config.SHARED_MEMORY_DIR / name)
+        except OSError:
+            return cls._write(profile, config.TEMP_DOWNLOAD_DIR / "shared" / name)
+
+    @classmethod
+    def _write(cls, profile: Dict[str, Any], directory: Path) -> 'SharedProfile':
+        partial = directory.with_name(directory.name + ".part")
+        shutil.rmtree(partial, ignore_errors=True)
+        partial.mkdir(parents=True)
+        try:
+            numeric = text = temporal = None
+            if "numeric" in profile:
+                numeric, block = profile["numeric"]
+                # The block column by column in one array without a validity bitmap, so it maps back to a 2-D view
+                _write_table(partial / "numeric.arrow", pa.table({"values": pa.array(block.ravel(order="F"))}))
+            if "text_values" in profile:
+                text = list(profile["text_values"])
+                for i, values in enumerate(profile["text_values"].values()):
+                    _write_table(partial / f"text-{i}.arrow", pa.table({"values": pa.array(values.to_numpy(), type=pa.string())}))
+            if "temporal" in profile:
+                temporal = list(profile["temporal"])
+                for i, values in enumerate(profile["temporal"].values()):
+                    _write_table(partial / f"temporal-{i}.arrow", pa.table({"values": pa.array(values, from_pandas=True)}))
+            shutil.rmtree(directory, ignore_errors=True)
+            # Rename once complete so workers never map a partial profile
+            os.replace(partial, directory)
+        except BaseException:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        return cls(directory, profile.get("nulls"), numeric, text, temporal)
+
+    def entries(self, names: List[str]) -> Dict[str, Any]:
+        """Profile entries, as quality.column_profile returns them, mapped from the shared files"""
+        entries: Dict[str, Any] = {}
+        if "nulls" in names:
+            entries["nulls"] = self.nulls
+        if "numeric" in names:
+            values = _map_table(self.directory / "numeric.arrow").column("values")
+            flat = values.chunk(0).to_numpy(zero_copy_only=True) if values.num_chunks else np.empty(0)
+            rows = len(flat) // len(self.numeric) if self.numeric else 0
+            entries["numeric"] = (self.numeric, flat.reshape(len(self.numeric), rows).T)
+        if "text_values" in names:
+            entries["text_values"] = {
+                col: _map_table(self.directory / f"text-{i}.arrow").column("values").to_pandas(types_mapper=pd.ArrowDtype)
+                for i, col in enumerate(self.text)
+            }
+        if "temporal" in names:
+            entries["temporal"] = {
+                col: _map_table(self.directory / f"temporal-{i}.arrow").column("values").to_pandas()
+                for i, col in enumerate(self.temporal)
+            }
+        return entries
+
+    def unlink(self):
+        """Remove the shared files; processes that mapped them keep their pages until they unmap"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def _write_table(path: Path, table: pa.Table):
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+def _map_table(path: Path) -> pa.Table:
+    # Uncompressed IPC files read from a memory map reference the mapped pages instead of copying them
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+class SharedProfileCache:
+    """Thread-safe, reference-counted shared profiles, so concurrent assessments of a dataset share one"""
+
+    def __init__(self):
+        self.entries: Dict[str, SharedProfile] = {}
+        self.references: Dict[str, int] = {}
+        # One lock per profile being built, so only callers for the same key wait on a build
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+    def acquire(self, key: str, build: Callable[[], Dict[str, Any]]) -> SharedProfile:
+        """Shared profile under a key, built and written on first use
+
+        Concurrent callers for a key wait for a single build instead of each
+        loading the dataset; builds of different keys run concurrently.
+
+        Args:
+            key: Identifies the dataset and the profiled columns (see key)
+            build: Computes the column profile when it is not shared yet
+        """
+        with self._lock:
+            if key in self.entries:
+                self.references[key] += 1
+                return self.entries[key]
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._lock:
+                if key in self.entries:
+                    self.references[key] += 1
+                    return self.entries[key]
+            try:
+                profile = SharedProfile.create(build(), key)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            with self._lock:
+                self.entries[key] = profile
+                self.references[key] = 1
+            return profile
+
+    def release(self, key: str):
+        """Drop a reference, removing the shared files with the last one"""
+        with self._lock:
+            self.references[key] -= 1
+            if self.references[key] <= 0:
+                del self.references[key]
+                self.entries.pop(key).unlink()
+
+# Profiles shared by this process
+shared_profiles = SharedProfileCache()
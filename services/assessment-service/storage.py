@@ -0,0 +1,84 @@
+import threading
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import config
+
+# Shared by every StorageClient in the process; boto3 clients are thread-safe
+_client = None
+_lock = threading.Lock()
+
+def get_client():
+    """Get the process-wide S3 client, whose connection pool is shared by all storage calls"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = boto3.client(
+                's3',
+                endpoint_url=config.MINIO_URL,
+                aws_access_key_id=config.MINIO_ROOT_USER,
+                aws_secret_access_key=config.MINIO_ROOT_PASSWORD,
+                region_name='us-east-1',  # Placeholder region, not used with MinIO
+                use_ssl=config.MINIO_SECURE,
+                config=Config(max_pool_connections=config.S3_MAX_POOL_CONNECTIONS),
+            )
+        return _client
+
+class StorageClient:
+    """Read-only client for datasets in S3-compatible storage (MinIO)
+    
+    Large objects are either downloaded in parallel parts or, when only a
+    sample is needed, read through ranged GETs without fetching the rest.
+    """
+    
+    def __init__(self):
+        self.client = get_client()
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config.MULTIPART_THRESHOLD,
+            multipart_chunksize=config.MULTIPART_PART_SIZE,
+            max_concurrency=config.MULTIPART_CONCURRENCY,
+            use_threads=True,
+        )
+    
+    def download_file(self, object_name, file_path):
+        """Download a file from S3-compatible storage
+        
+        Args:
+            object_name (str): S3 object name
+            file_path (str): Local path to download the file to
+            
+        Returns:
+            bool: True if download was successful, False otherwise
+        """
+        try:
+            self.client.download_file(config.DATASET_BUCKET, object_name, file_path, Config=self.transfer_config)
+            return True
+        except ClientError as e:
+            print(f"Error downloading file: {e}")
+            return False
+    
+    def get_range(self, object_name, start, end):
+        """Read a byte range of an object without downloading the rest
+        
+        Args:
+            object_name (str): S3 object name
+            start (int): Offset of the first byte
+            end (int): Offset of the last byte, inclusive
+            
+        Returns:
+            bytes: The bytes in the range, fewer if the object ends first
+        """
+        response = self.client.get_object(Bucket=config.DATASET_BUCKET, Key=object_name, Range=f"bytes={start}-{end}")
+        return response['Body'].read()
+    
+    def get_object_size(self, object_name):
+        """Get the size of an object in bytes
+        
+        Args:
+            object_name (str): S3 object name
+            
+        Returns:
+            int: Size of the object
+        """
+        return self.client.head_object(Bucket=config.DATASET_BUCKET, Key=object_name)['ContentLength']
@@ -0,0 +1,20 @@
+import os
+import shutil
+import pytest
+
+class LocalStorage:
+    """Serves downloads from a local directory"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.downloads = []
+    
+    def download_file(self, object_name, file_path):
+        self.downloads.append(object_name)
+        shutil.copy(os.path.join(self.directory, object_name), file_path)
+        return True
+
+@pytest.fixture
+def storage(tmp_path):
+    """Storage client serving the test's tmp_path"""
+    return LocalStorage(tmp_path)
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+import columnar
+from columnar import load_columns, local_copy
+
+def test_load_columns(tmp_path, storage):
+    """Test that Parquet copies are downloaded once and read column by column"""
+    pq.write_table(pa.table({'id': [1, 2, 3], 'name': ['a', 'b', 'c'], 'score': [0.5, 1.5, 2.5]}), tmp_path / 'dataset-1.parquet')
+    try:
+        table = load_columns('dataset-1.parquet', ['id', 'score'], storage=storage)
+        assert table.column_names == ['id', 'score']
+        assert table.column('score').to_pylist() == [0.5, 1.5, 2.5]
+        
+        assert load_columns('dataset-1.parquet', ['name'], storage=storage).column('name').to_pylist() == ['a', 'b', 'c']
+        assert storage.downloads == ['dataset-1.parquet']
+    finally:
+        os.remove(config.TEMP_DOWNLOAD_DIR / 'dataset-1.parquet')
+
+class SlowStorage:
+    """Writes downloads in two halves, pausing in between"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.paths = []
+    
+    def download_file(self, object_name, file_path):
+        self.paths.append(file_path)
+        with open(file_path, 'wb') as f:
+            f.write(self.data[:len(self.data) // 2])
+            f.flush()
+            time.sleep(0.05)
+            f.write(self.data[len(self.data) // 2:])
+        return True
+
+def test_concurrent_downloads(tmp_path):
+    """Test that concurrent copies of an object never share a partial file"""
+    data = os.urandom(64 * 1024)
+    storages = [SlowStorage(data) for _ in range(4)]
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            paths = list(pool.map(lambda storage: local_copy('concurrent.bin', storage), storages))
+        # Callers in one process wait for a single download
+        assert sum(len(storage.paths) for storage in storages) == 1
+        
+        # Downloads that do run concurrently, e.g. from other processes, each use their own partial file
+        os.remove(paths[0])
+        with ThreadPoolExecutor(2) as pool:
+            list(pool.map(lambda storage: columnar._download('concurrent.bin', paths[0], storage), storages[:2]))
+        assert storages[0].paths[-1] != storages[1].paths[-1]
+        assert paths[0].read_bytes() == data
+        assert not list(config.TEMP_DOWNLOAD_DIR.glob('concurrent.bin.*.part'))
+    finally:
+        if os.path.exists(config.TEMP_DOWNLOAD_DIR / 'concurrent.bin'):
+            os.remove(config.TEMP_DOWNLOAD_DIR / 'concurrent.bin')
+
+def test_cache_evicts_least_recently_used(tmp_path, storage, monkeypatch):
+    """Test that copies beyond DOWNLOAD_CACHE_SIZE are removed least recently used first"""
+    download_dir = tmp_path / 'downloads'
+    download_dir.mkdir()
+    monkeypatch.setattr(config, 'TEMP_DOWNLOAD_DIR', download_dir)
+    monkeypatch.setattr(config, 'DOWNLOAD_CACHE_SIZE', 2500)
+    for name in ['a.bin', 'b.bin', 'c.bin']:
+        (tmp_path / name).write_bytes(b'x' * 1000)
+    
+    local_copy('a.bin', storage)
+    time.sleep(0.01)
+    local_copy('b.bin', storage)
+    time.sleep(0.01)
+    local_copy('a.bin', storage)
+    time.sleep(0.01)
+    local_copy('c.bin', storage)
+    
+    assert sorted(path.name for path in download_dir.iterdir()) == ['a.bin', 'c.bin']
+    assert storage.downloads == ['a.bin', 'b.bin', 'c.bin']
@@ -0,0 +1,178 @@
+import os
+import sys
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from planner import plan_assessment, run_assessment, _load, METADATA, SCAN, NOT_APPLICABLE
+from quality import QualityAssessor
+
+def create_dataset(rows: int = 1000, **metadata):
+    """A datasets row of a CSV file, with metadata shaped like the ingestion profile"""
+    return {
+        'id': 1,
+        'file_path': 'planner-test.csv',
+        'file_type': 'csv',
+        'parquet_path': None,
+        'metadata': {
+            'row_count': rows,
+            'column_count': 3,
+            'columns': ['id', 'value', 'category'],
+            'data_types': {'id': 'int64', 'value': 'float64', 'category': 'object'},
+            'statistics': {
+                'id': {'null_count': 0, 'null_percentage': 0.0},
+                'value': {'null_count': rows // 10, 'null_percentage': 10.0},
+                'category': {'null_count': 0, 'null_percentage': 0.0}
+            },
+            'completeness': {'overall_missing_percentage': 10.0 / 3, 'columns_with_nulls': 1, 'rows_with_nulls': rows // 10},
+            **metadata
+        }
+    }
+
+def sources(plan):
+    return {step.criterion: step.source for step in plan.steps}
+
+class TestPlanAssessment:
+    """Tests for plan_assessment"""
+
+    def test_metadata_criteria(self):
+        """Test that completeness, availability and volume are planned from metadata"""
+        plan = plan_assessment(create_dataset())
+
+        assert sources(plan) == {
+            'completeness': METADATA, 'accuracy': SCAN, 'consistency': SCAN, 'timeliness': SCAN,
+            'availability': METADATA, 'volume': METADATA
+        }
+        steps = {step.criterion: step for step in plan.steps}
+        assert steps['consistency'].columns == ['category']
+        assert steps['timeliness'].columns == ['category']
+        assert plan.scan_columns == ['id', 'value', 'category']
+
+    def test_not_applicable_without_text_columns(self):
+        """Test that a numeric dataset only needs a scan for accuracy"""
+        dataset = create_dataset(data_types={'id': 'int64', 'value': 'float64', 'flag': 'bool'})
+        plan = plan_assessment(dataset)
+
+        assert sources(plan)['consistency'] == NOT_APPLICABLE
+        assert sources(plan)['timeliness'] == NOT_APPLICABLE
+        assert plan.scan_columns == ['id', 'value']
+
+    def test_missing_or_estimated_metadata_is_scanned(self):
+        """Test that failed, sampled or incomplete profiles send criteria to the scan"""
+        failed = plan_assessment({'id': 2, 'file_type': 'csv', 'metadata': {'processing_status': 'failed', 'error': 'bad'}})
+        assert sources(failed) == {
+            'completeness': SCAN, 'accuracy': SCAN, 'consistency': SCAN, 'timeliness': SCAN,
+            'availability': METADATA, 'volume': SCAN
+        }
+        assert failed.scan_columns is None
+
+        assert sources(plan_assessment(create_dataset(sampling={'mode': 'ranged_sample'})))['completeness'] == SCAN
+
+        footer = create_dataset()
+        footer['metadata']['statistics']['value']['null_count'] = None
+        assert sources(plan_assessment(footer))['completeness'] == SCAN
+
+    def test_unparseable_dtypes_are_scanned(self):
+        """Test that dtypes pandas cannot parse make a column of unknown kind instead of failing"""
+        dataset = create_dataset(data_types={'id': 'int64', 'price': 'decimal128(10, 2)', 'tags': 'list'})
+        steps = {step.criterion: step for step in plan_assessment(dataset).steps}
+
+        assert steps['consistency'].columns == ['price', 'tags']
+        assert steps['accuracy'].columns == ['id', 'price', 'tags']
+
+class TestRunAssessment:
+    """Tests for run_assessment"""
+
+    def test_metadata_only_assessment_reads_nothing(self, storage):
+        """Test that criteria answered from metadata never download the dataset"""
+        dataset = create_dataset(100000, data_types={'id': 'int64', 'flag': 'bool'})
+        dataset['metadata']['statistics'] = {'id': {'null_count': 0, 'null_percentage': 0.0}}
+        dataset['metadata']['completeness']['overall_missing_percentage'] = 4.0
+        plan = plan_assessment(dataset)
+        plan.steps = [step for step in plan.steps if step.source != SCAN]
+
+        result = run_assessment(dataset, plan, storage=storage)
+
+        assert storage.downloads == []
+        assert result['quality']['criteria']['completeness']['score'] == 9.6
+        assert result['quality']['criteria']['completeness']['source'] == METADATA
+        # Ingestion does not record blank strings, which a scan would count as missing
+        assert result['quality']['criteria']['completeness']['details']['blank_strings_counted'] is False
+        assert result['accessibility']['criteria']['availability']['score'] == config.FORMAT_AVAILABILITY['csv']
+        assert result['accessibility']['criteria']['volume']['score'] == 10.0
+
+    def test_scan_matches_full_assessment(self, tmp_path, storage):
+        """Test that the planned assessment scores like a full scan, reading only the planned columns"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'id': np.arange(1000),
+            'value': rng.normal(50, 5, 1000),
+            'category': rng.choice(['a', 'b', 'c'], 1000)
+        })
+        df.loc[df.index % 10 == 0, 'value'] = np.nan
+        df.to_csv(tmp_path / 'planner-test.csv', index=False)
+        dataset = create_dataset()
+
+        try:
+            # Scanned criteria run in worker processes, so their inputs must pickle
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                result = run_assessment(dataset, storage=storage, executor=executor)
+        finally:
+            os.remove(config.TEMP_DOWNLOAD_DIR / 'planner-test.csv')
+        full = QualityAssessor().assess(df)
+
+        assert storage.downloads == ['planner-test.csv']
+        for name, criterion in full['criteria'].items():
+            assert result['quality']['criteria'][name]['score'] == criterion['score']
+            assert result['quality']['criteria'][name]['applicable'] == criterion['applicable']
+        assert result['quality']['overall_score'] == full['overall_score']
+        assert result['plan']['needs_scan']
+
+    def test_selected_modules_and_progress(self, storage):
+        """Test that only the requested modules run, reporting progress per criterion"""
+        progress = []
+        result = run_assessment(create_dataset(), storage=storage, modules=['accessibility'], progress=progress.append)
+
+        assert storage.downloads == []
+        assert 'quality' not in result
+        assert set(result['accessibility']['criteria']) == {'availability', 'volume'}
+        assert [report['percentage'] for report in progress] == [50.0, 100.0]
+        assert progress[0]['current_module'] == 'accessibility'
+
+class TestLoad:
+    """Tests for loading the scanned columns of a dataset"""
+
+    def test_empty_projection(self, tmp_path, storage):
+        """Test that no columns loads a frame with only the row count"""
+        pd.DataFrame({'id': range(250), 'value': range(250)}).to_csv(tmp_path / 'load-test.csv', index=False)
+        pq.write_table(pa.table({'id': range(250), 'value': range(250)}), tmp_path / 'load-test.parquet')
+        try:
+            df = _load({'file_path': 'load-test.csv', 'file_type': 'csv'}, [], {}, storage)
+            assert df.shape == (250, 0)
+            df = _load({'file_path': 'load-test.csv', 'file_type': 'csv', 'parquet_path': 'load-test.parquet'}, [], {}, storage)
+            assert df.shape == (250, 0)
+            assert _load({'file_path': 'load-test.csv', 'file_type': 'csv'}, None, {}, storage).shape == (250, 2)
+        finally:
+            for name in ['load-test.csv', 'load-test.parquet']:
+                if os.path.exists(config.TEMP_DOWNLOAD_DIR / name):
+                    os.remove(config.TEMP_DOWNLOAD_DIR / name)
+
+    def test_json_is_flattened_then_projected(self, tmp_path, storage):
+        """Test that nested JSON records get the dotted column names of the ingestion profile"""
+        records = [{'id': i, 'user': {'name': f"u{i}", 'address': {'city': 'x'}}, 'tags': ['a']} for i in range(5)]
+        (tmp_path / 'load-test.jsonl').write_text(''.join(json.dumps(record) + '\n' for record in records))
+        try:
+            df = _load({'file_path': 'load-test.jsonl', 'file_type': 'jsonl'}, ['user.name', 'user.address.city'], {}, storage)
+            assert df.columns.tolist() == ['user.name', 'user.address.city']
+            assert df['user.name'].tolist() == [f"u{i}" for i in range(5)]
+            assert _load({'file_path': 'load-test.jsonl', 'file_type': 'jsonl'}, [], {}, storage).shape == (5, 0)
+        finally:
+            os.remove(config.TEMP_DOWNLOAD_DIR / 'load-test.jsonl')
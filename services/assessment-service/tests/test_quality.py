@@ -0,0 +1,87 @@
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from datetime import datetime
+from decimal import Decimal
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from quality import QualityAssessor, round_score
+
+def create_frame(rows: int = 1000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'value': rng.normal(50, 5, rows),
+        'email': [f'user{i}@example.com' for i in range(rows)],
+        'updated': pd.date_range('2024-01-01', periods=rows, freq='h').astype(str),
+        'category': rng.choice(['a', 'b', 'c'], rows)
+    })
+    return df
+
+class TestQualityAssessor:
+    """Tests for the QualityAssessor class"""
+
+    def test_clean_dataset(self):
+        """Test that a clean, recent dataset scores full marks on every criterion"""
+        result = QualityAssessor(reference_time=datetime(2024, 2, 15)).assess(create_frame())
+
+        assert {name: criterion['score'] for name, criterion in result['criteria'].items()} == {
+            'completeness': 10.0, 'accuracy': 10.0, 'consistency': 10.0, 'timeliness': 10.0
+        }
+        assert result['overall_score'] == 10.0
+        assert result['criteria']['consistency']['details']['columns']['email']['format'] == 'email'
+        assert result['criteria']['timeliness']['details']['columns']['updated']['age_days'] == pytest.approx(3.375)
+
+    def test_defects_lower_scores(self):
+        """Test that nulls, outliers, mixed types, stray formats and stale dates are detected"""
+        df = create_frame()
+        df.loc[:99, 'category'] = None
+        df.loc[:9, 'value'] = 1000.0
+        df.loc[:199, 'email'] = 'not an email'
+        df['mixed'] = ['1', '2', 'x', '4'] * 250
+        df['updated'] = '2023-01-01'
+
+        result = QualityAssessor(reference_time=datetime(2024, 2, 15)).assess(df)
+        details = {name: criterion['details']['columns'] for name, criterion in result['criteria'].items()}
+
+        assert details['completeness']['category']['present_percentage'] == 90.0
+        assert details['accuracy']['value']['outliers'] == 10
+        assert details['accuracy']['mixed']['type_mismatch_percentage'] == 25.0
+        assert details['consistency']['email']['conformance_percentage'] == 80.0
+        assert details['timeliness']['updated']['age_days'] > 365
+        assert result['criteria']['timeliness']['score'] == 0.0
+        assert result['overall_score'] < 8.5
+
+    def test_skewed_column_is_not_penalized(self):
+        """Test that values beyond the IQR fences of a skewed column are not all outliers"""
+        values = np.random.default_rng(0).exponential(1.0, 10000)
+        result = QualityAssessor().assess(pd.DataFrame({'latency': values}))
+
+        assert result['criteria']['accuracy']['details']['columns']['latency']['outlier_percentage'] < 2
+
+    def test_timeliness_not_applicable(self):
+        """Test that datasets without temporal columns are scored on the other criteria"""
+        table = pa.table({'id': [1, 2, 3, 4], 'name': ['a', 'b', None, 'd']})
+        result = QualityAssessor().assess(table)
+
+        assert not result['criteria']['timeliness']['applicable']
+        assert result['criteria']['timeliness']['score'] is None
+        assert result['overall_score'] == pytest.approx(
+            (8.8 * 0.3 + 10.0 * 0.3 + 10.0 * 0.2) / 0.8, abs=0.05
+        )
+
+        rows = QualityAssessor.to_rows(7, result)
+        assert [row['criterion'] for row in rows] == ['completeness', 'accuracy', 'consistency']
+        assert rows[0]['score'] == Decimal('8.8')
+        assert rows[0]['dataset_id'] == 7
+
+    def test_round_score(self):
+        """Test that scores fit NUMERIC(3,1)"""
+        assert round_score(9.25) == 9.3
+        assert round_score(10.04) == 10.0
+        assert round_score(11) == 10.0
+        assert round_score(-1) == 0.0
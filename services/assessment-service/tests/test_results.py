@@ -0,0 +1,76 @@
+import os
+import sys
+import csv
+import json
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine, select
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import metadata, assessments
+from results import AssessmentWriter, assessment_rows, copy_buffer
+
+def create_result(dataset_id: int):
+    """A run_assessment result with one not applicable criterion"""
+    return {
+        'dataset_id': dataset_id,
+        'quality': {
+            'module': 'quality',
+            'criteria': {
+                'completeness': {'score': 9.5, 'applicable': True, 'details': {'columns': {}}},
+                'timeliness': {'score': None, 'applicable': False, 'details': {'reason': 'no text or temporal columns'}}
+            }
+        },
+        'accessibility': {
+            'module': 'accessibility',
+            'criteria': {'volume': {'score': 3.3, 'applicable': True, 'details': {'row_count': 1000}}}
+        }
+    }
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'assessments.db'}")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+class TestAssessmentWriter:
+    """Tests for the AssessmentWriter class"""
+
+    def test_write_results(self, engine):
+        """Test that the criteria of many results are written at once, returning their IDs by dataset"""
+        ids = AssessmentWriter(engine, page_size=3).write_results(create_result(i) for i in range(1, 6))
+
+        assert sorted(ids) == [1, 2, 3, 4, 5]
+        assert all(len(row_ids) == 2 for row_ids in ids.values())
+        with engine.connect() as connection:
+            rows = {row.id: row for row in connection.execute(select(assessments))}
+        assert len(rows) == 10
+        for dataset_id, (completeness, volume) in ids.items():
+            assert (rows[completeness].dataset_id, rows[completeness].criterion) == (dataset_id, 'completeness')
+            assert rows[completeness].score == Decimal('9.5')
+            assert (rows[volume].module, rows[volume].details) == ('accessibility', {'row_count': 1000})
+
+    def test_write_is_one_transaction(self, engine):
+        """Test that a failing row leaves none of the other rows behind"""
+        rows = assessment_rows(create_result(1))
+        rows[-1]['score'] = None
+
+        with pytest.raises(Exception):
+            AssessmentWriter(engine).write(rows)
+        with engine.connect() as connection:
+            assert connection.execute(select(assessments)).fetchall() == []
+
+def test_copy_buffer():
+    """Test the CSV sent to COPY: IDs first, JSON details and NULL for missing details"""
+    rows = assessment_rows(create_result(7))
+    rows[0]['details'] = {'note': 'a "quoted", value'}
+    rows[1]['details'] = None
+
+    records = list(csv.reader(copy_buffer(rows, [100, 101])))
+
+    assert records[0][:5] == ['100', '7', 'quality', 'completeness', '9.5']
+    assert json.loads(records[0][5]) == {'note': 'a "quoted", value'}
+    assert records[1] == ['101', '7', 'accessibility', 'volume', '3.3', '']
@@ -0,0 +1,115 @@
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sampling import RangeSample, sample_object
+
+class InMemoryStorage:
+    """Serves ranged reads from bytes held in memory"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.requests = []
+    
+    def get_object_size(self, object_name):
+        return len(self.data)
+    
+    def get_range(self, object_name, start, end):
+        self.requests.append((start, end))
+        return self.data[start:end + 1]
+
+def create_csv(rows: int) -> bytes:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'value': rng.normal(50, 10, rows),
+        'category': rng.choice(['a', 'b', 'c'], rows)
+    })
+    df.loc[df.index % 10 == 0, 'value'] = np.nan
+    return df.to_csv(index=False).encode()
+
+class TestRangeSample:
+    """Tests for the RangeSample class"""
+    
+    def test_windows_are_line_aligned(self):
+        """Test that every sampled window holds only complete lines"""
+        lines = [f"line {i:05d}\n".encode() for i in range(2000)]
+        storage = InMemoryStorage(b''.join(lines))
+        sample = RangeSample(storage, 'data.txt', windows=8, window_size=100, seed=1)
+        
+        assert not sample.exact
+        assert len(storage.requests) == 8
+        for chunk in sample.chunks:
+            assert chunk
+            for line in chunk.splitlines(keepends=True):
+                assert line in lines
+        assert (sample.line_lengths() == 11).all()
+    
+    def test_small_object_is_read_whole(self):
+        """Test that objects smaller than the sample are profiled exactly"""
+        data = create_csv(100)
+        storage = InMemoryStorage(data)
+        sample = RangeSample(storage, 'data.csv', windows=4, window_size=len(data), header=True)
+        
+        assert sample.exact
+        assert sample.header == data[:data.index(b'\n') + 1]
+        assert b''.join(sample.chunks) == data[len(sample.header):]
+        assert len(sample.line_lengths()) == 100
+
+    def test_header_read_uses_window_size(self):
+        """Test that the header is read with the caller's window size"""
+        data = create_csv(2000)
+        storage = InMemoryStorage(data)
+        RangeSample(storage, 'data.csv', windows=4, window_size=100, header=True, seed=1)
+
+        assert storage.requests[0] == (0, 99)
+
+class TestSampleObject:
+    """Tests for sample_object"""
+    
+    def test_csv_sample(self):
+        """Test that a CSV sample estimates the row count and null rate with intervals"""
+        data = create_csv(50000)
+        storage = InMemoryStorage(data)
+        metadata = sample_object('data.csv', 'csv', storage=storage, windows=32, window_size=4096, seed=0)
+        
+        assert metadata['sampling']['mode'] == 'ranged_sample'
+        assert metadata['sampling']['sampled_bytes'] < len(data) / 5
+        assert metadata['columns'] == ['id', 'value', 'category']
+        
+        low, high = metadata['confidence_intervals']['row_count']
+        assert low <= 50000 <= high
+        assert metadata['row_count'] == pytest.approx(50000, rel=0.05)
+        
+        low, high = metadata['confidence_intervals']['statistics']['value']['null_percentage']
+        assert low <= 10 <= high
+        low, high = metadata['confidence_intervals']['statistics']['value']['mean']
+        assert low <= 50 <= high
+    
+    def test_csv_sample_dialect(self):
+        """Test that the dialect detected at ingestion is used to parse the sample"""
+        data = create_csv(5000).replace(b',', b';')
+        dialect = {'delimiter': ';', 'quotechar': '"', 'escapechar': None, 'has_header': True, 'encoding': 'utf-8'}
+        metadata = sample_object('data.csv', 'csv', storage=InMemoryStorage(data), windows=8, window_size=2048, seed=0, dialect=dialect)
+        
+        assert metadata['columns'] == ['id', 'value', 'category']
+    
+    def test_txt_sample(self):
+        """Test that a text sample reports line statistics"""
+        storage = InMemoryStorage(b''.join(f"{'x' * (i % 20)}\n".encode() for i in range(20000)))
+        metadata = sample_object('data.txt', 'txt', storage=storage, windows=16, window_size=2048, seed=0)
+        
+        assert metadata['format'] == 'txt'
+        low, high = metadata['confidence_intervals']['row_count']
+        assert low <= 20000 <= high
+        assert metadata['line_length_stats']['max'] == 19
+    
+    def test_unsupported_type(self):
+        """Test that unsupported types report an error"""
+        metadata = sample_object('data.json', 'json', storage=InMemoryStorage(b'{}'))
+        assert metadata['processing_status'] == 'failed'
@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler import AssessmentScheduler, Node
+
+def add(a, b):
+    return a + b
+
+def offset(amount, profile):
+    return profile + amount
+
+class TestAssessmentScheduler:
+    """Tests for the AssessmentScheduler class"""
+
+    def test_shared_inputs_run_once(self):
+        """Test that an input shared by several criteria is computed once and feeds all of them"""
+        calls = []
+        nodes = [
+            Node("frame", lambda: calls.append("frame") or 2),
+            Node("profile", lambda frame: calls.append("profile") or frame * 10, inputs=["frame"]),
+            Node("quality.a", offset, inputs=["profile"], module="quality", parallel=True, args=(1,)),
+            Node("quality.b", offset, inputs=["profile"], module="quality", parallel=True, args=(2,)),
+            Node("accessibility.c", lambda frame: frame, inputs=["frame"], module="accessibility"),
+        ]
+        progress = []
+        values, errors = AssessmentScheduler(nodes, workers=2, progress=progress.append).run()
+
+        assert errors == {}
+        assert calls == ["frame", "profile"]
+        assert values["quality.a"] == 21
+        assert values["quality.b"] == 22
+        assert values["accessibility.c"] == 2
+        assert progress[-1] == {'percentage': 100.0, 'current_module': None, 'completed_criteria': 3, 'total_criteria': 3}
+
+    def test_independent_criteria_run_concurrently(self):
+        """Test that criteria without dependencies between them overlap"""
+        barrier = threading.Barrier(3, timeout=5)
+        nodes = [Node(f"quality.{i}", barrier.wait, module="quality", parallel=True) for i in range(3)]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            values, errors = AssessmentScheduler(nodes, executor=executor).run()
+
+        assert errors == {}
+        assert len(values) == 3
+
+    def test_module_timeout(self):
+        """Test that criteria of a module past its timeout fail while other modules complete"""
+        nodes = [
+            Node("slow.a", time.sleep, module="slow", parallel=True, args=(1,)),
+            Node("fast.b", add, module="fast", parallel=True, args=(1, 2)),
+        ]
+        progress = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            start = time.monotonic()
+            values, errors = AssessmentScheduler(nodes, executor=executor, timeouts={"slow": 0.1}, progress=progress.append).run()
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.9
+        assert values == {"fast.b": 3}
+        assert errors["slow.a"] == "Module slow timed out after 0.1 seconds"
+        assert progress[-1]['percentage'] == 100.0
+
+    def test_failed_input_fails_dependents(self):
+        """Test that criteria depending on a failed input fail without running"""
+        def load():
+            raise FileNotFoundError("Could not download data.csv")
+
+        nodes = [
+            Node("frame", load),
+            Node("quality.a", lambda frame: frame, inputs=["frame"], module="quality"),
+            Node("accessibility.b", lambda: 1, module="accessibility"),
+        ]
+        values, errors = AssessmentScheduler(nodes).run()
+
+        assert errors == {"frame": "Could not download data.csv", "quality.a": "Input frame failed"}
+        assert values == {"accessibility.b": 1}
+
+    def test_invalid_dags_are_rejected(self):
+        """Test that cycles and unknown inputs are rejected before anything runs"""
+        with pytest.raises(ValueError, match="Cycle"):
+            AssessmentScheduler([Node("a", add, inputs=["b"]), Node("b", add, inputs=["a"])])
+        with pytest.raises(ValueError, match="unknown input"):
+            AssessmentScheduler([Node("a", add, inputs=["missing"])])
@@ -0,0 +1,154 @@
+import os
+import sys
+import pytest
+import threading
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from quality import column_profile
+from shared import SharedProfile, SharedProfileCache
+
+def create_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'value': [0.5, np.nan, 2.5, 3.5],
+        'name': ['a', None, 'c', 'd'],
+        'updated': ['2024-01-01', '2024-01-02', None, 'soon']
+    })
+
+class TestSharedProfile:
+    """Tests for the SharedProfile class"""
+
+    def test_entries_round_trip(self, tmp_path, monkeypatch):
+        """Test that mapped entries match the profile they were written from"""
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', tmp_path)
+        profile = column_profile(create_frame())
+        shared = SharedProfile.create(profile, 'round-trip')
+        entries = shared.entries(['nulls', 'numeric', 'text_values', 'temporal'])
+
+        assert entries['nulls']['columns'] == profile['nulls']['columns']
+        assert entries['numeric'][0] == ['id', 'value']
+        np.testing.assert_array_equal(entries['numeric'][1], profile['numeric'][1])
+        # The block is a view of the mapped file, not a copy
+        assert not entries['numeric'][1].flags.writeable
+        for col, values in profile['text_values'].items():
+            # Text maps to Arrow-backed strings instead of Python objects
+            assert isinstance(entries['text_values'][col].dtype, pd.ArrowDtype)
+            assert entries['text_values'][col].tolist() == values.tolist()
+        for col, values in profile['temporal'].items():
+            pd.testing.assert_series_equal(entries['temporal'][col], values.reset_index(drop=True), check_names=False)
+
+        shared.unlink()
+        assert not (tmp_path / 'round-trip').exists()
+
+    def test_falls_back_without_shared_memory(self, tmp_path, monkeypatch):
+        """Test that profiles go to TEMP_DOWNLOAD_DIR when the shared memory directory is unusable"""
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', blocker / 'shm')
+        shared = SharedProfile.create(column_profile(create_frame(), {'numeric'}), 'fallback')
+        try:
+            assert shared.directory == config.TEMP_DOWNLOAD_DIR / 'shared' / 'fallback'
+            assert shared.entries(['numeric'])['numeric'][1].shape == (4, 2)
+        finally:
+            shared.unlink()
+
+class TestSharedProfileCache:
+    """Tests for the SharedProfileCache class"""
+
+    def test_profiles_are_shared_and_released(self, tmp_path, monkeypatch):
+        """Test that concurrent users of a profile share one copy, removed with the last reference"""
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', tmp_path)
+        cache = SharedProfileCache()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return column_profile(create_frame())
+
+        key = cache.key(1, 'hash', ['id', 'value'])
+        first = cache.acquire(key, build)
+        second = cache.acquire(key, build)
+        assert first is second
+        assert len(builds) == 1
+
+        cache.release(key)
+        assert first.directory.exists()
+        cache.release(key)
+        assert not first.directory.exists()
+
+    def test_same_key_builds_once(self, tmp_path, monkeypatch):
+        """Test that concurrent acquires of one key wait for a single build"""
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', tmp_path)
+        cache = SharedProfileCache()
+        started = threading.Event()
+        proceed = threading.Event()
+        builds = []
+
+        def build():
+            builds.append(1)
+            started.set()
+            proceed.wait(5)
+            return column_profile(create_frame())
+
+        key = cache.key(1, 'hash', ['id'])
+        profiles = []
+        threads = [threading.Thread(target=lambda: profiles.append(cache.acquire(key, build))) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        proceed.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(builds) == 1
+        assert len(profiles) == 3 and all(profile is profiles[0] for profile in profiles)
+        for _ in profiles:
+            cache.release(key)
+        assert not profiles[0].directory.exists()
+
+    def test_different_keys_build_concurrently(self, tmp_path, monkeypatch):
+        """Test that a build does not block acquires of other keys"""
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', tmp_path)
+        cache = SharedProfileCache()
+        # Each build waits for the other, so the barrier breaks if builds are serialized
+        barrier = threading.Barrier(2, timeout=5)
+
+        def build():
+            barrier.wait()
+            return column_profile(create_frame())
+
+        keys = [cache.key(dataset_id, 'hash', ['id']) for dataset_id in (1, 2)]
+        threads = [threading.Thread(target=cache.acquire, args=(key, build)) for key in keys]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert not barrier.broken
+        assert set(cache.entries) == set(keys)
+        for key in keys:
+            cache.release(key)
+
+    def test_failed_build_is_retried(self, tmp_path, monkeypatch):
+        """Test that a failing build leaves nothing behind for the next caller"""
+        monkeypatch.setattr(config, 'SHARED_MEMORY_DIR', tmp_path)
+        cache = SharedProfileCache()
+        key = cache.key(1, 'hash', ['id'])
+
+        def fail():
+            raise IOError("download failed")
+
+        with pytest.raises(IOError):
+            cache.acquire(key, fail)
+        assert key not in cache.entries and not cache._building
+
+        shared = cache.acquire(key, lambda: column_profile(create_frame()))
+        assert cache.references[key] == 1
+        cache.release(key)
+        assert not shared.directory.exists()
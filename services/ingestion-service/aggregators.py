@@ -0,0 +1,234 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional
+import config
+from sketches import KLLSketch, HyperLogLog, MisraGries
+
+class NumericAggregator:
+    """Running min/max/mean/std aggregates for the non-null values of a numeric column
+
+    Mean and variance are combined across chunks with the parallel form of
+    Welford's algorithm, so the result does not depend on how the column was chunked.
+    The median comes from a KLL sketch.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quantiles = KLLSketch()
+
+    def update(self, values: np.ndarray):
+        """Add a batch of non-null values"""
+        if len(values) == 0:
+            return
+        values = values.astype(np.float64, copy=False)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._combine(len(values), float(values.min()), float(values.max()), batch_mean, batch_m2)
+        self.quantiles.update(values)
+
+    def merge(self, other: 'NumericAggregator'):
+        """Merge the aggregates of another chunk or worker into this one"""
+        if other.count == 0:
+            return
+        self._combine(other.count, other.min, other.max, other.mean, other.m2)
+        self.quantiles.merge(other.quantiles)
+
+    def _combine(self, count: int, minimum: float, maximum: float, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def result(self) -> Dict[str, Any]:
+        """Statistics in the shape used by DataProcessor._extract_dataframe_metadata"""
+        return {
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean if self.count > 0 else None,
+            'median': self.quantiles.quantile(0.5),
+            'std': float((self.m2 / (self.count - 1)) ** 0.5) if self.count > 1 else None
+        }
+
+    def approximate(self) -> List[str]:
+        """Names of the statistics in ``result`` that are estimates"""
+        return [] if self.quantiles.is_exact else ['median']
+
+class CategoricalAggregator:
+    """Running distinct and top-value estimates for the non-null values of a categorical column
+
+    Distinct values are counted with HyperLogLog and frequent values with a
+    Misra-Gries summary, so memory is bounded by SKETCH_ERROR_BOUND rather
+    than by the column's cardinality.
+    """
+
+    def __init__(self):
+        self.distinct = HyperLogLog()
+        self.frequent = MisraGries()
+
+    def update(self, values: pd.Series):
+        """Add a batch of non-null values"""
+        if len(values) == 0:
+            return
+        self.distinct.update(values)
+        self.frequent.update(values)
+
+    def merge(self, other: 'CategoricalAggregator'):
+        """Merge the sketches of another chunk or worker into this one"""
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+
+    def result(self) -> Dict[str, Any]:
+        """Statistics in the shape used by DataProcessor._extract_dataframe_metadata"""
+        return {
+            'unique_count': self.distinct.estimate(),
+            'top_values': self.frequent.top(10)
+        }
+
+    def approximate(self) -> List[str]:
+        """Names of the statistics in ``result`` that are estimates"""
+        return ['unique_count'] + ([] if self.frequent.is_exact else ['top_values'])
+
+class ColumnProfile:
+    """Per-column state tracked by the StreamingProfiler"""
+
+    def __init__(self):
+        self.dtypes: List[Any] = []
+        self.null_count = 0
+        self.numeric: Optional[NumericAggregator] = None
+        self.categorical: Optional[CategoricalAggregator] = None
+
+    def update(self, series: pd.Series):
+        """Add a chunk of the column"""
+        nulls = series.isna()
+        self.null_count += int(nulls.sum())
+        if nulls.all() and pd.api.types.is_object_dtype(series.dtype):
+            # A chunk of nulls only (a JSON path null throughout a batch) has no
+            # type of its own, so it must not turn a numeric column into text
+            return
+        if series.dtype not in self.dtypes:
+            self.dtypes.append(series.dtype)
+        values = series[~nulls]
+
+        if _is_numeric(series.dtype) and self.categorical is None:
+            if self.numeric is None:
+                self.numeric = NumericAggregator()
+            self.numeric.update(values.to_numpy())
+        elif _is_categorical(series.dtype) or self.categorical is not None:
+            # Once a column has been seen as text, later numeric chunks are
+            # counted as text too, matching how read_csv types mixed columns
+            if self.categorical is None:
+                self.categorical = CategoricalAggregator()
+            self.categorical.update(values if _is_categorical(series.dtype) else values.astype(str))
+
+    def dtype(self) -> str:
+        """Resolve the dtype the column would have had in a single read"""
+        if not self.dtypes:
+            return 'object'
+        if len(self.dtypes) == 1:
+            return str(self.dtypes[0])
+        if all(_is_numeric(dtype) for dtype in self.dtypes):
+            return str(np.result_type(*self.dtypes))
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in self.dtypes):
+            return 'category'
+        return 'object'
+
+class StreamingProfiler:
+    """Profile a dataset chunk by chunk with memory bounded by the chunk size
+
+    Feed DataFrame chunks to ``update`` and call ``result`` to get metadata in
+    the same shape as ``DataProcessor._extract_dataframe_metadata``. Medians,
+    distinct counts and top values come from mergeable sketches; the columns
+    whose statistics are estimates are listed under ``approximate_statistics``.
+    """
+
+    def __init__(self, sample_rows: int = 5):
+        self.sample_rows = sample_rows
+        self.row_count = 0
+        self.rows_with_nulls = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.sample_data: List[Dict[str, Any]] = []
+
+    def update(self, df: pd.DataFrame):
+        """Add a chunk of rows"""
+        if len(self.sample_data) < self.sample_rows:
+            self.sample_data.extend(df.head(self.sample_rows - len(self.sample_data)).to_dict(orient='records'))
+
+        # Chunks of JSON records need not share columns: a column missing
+        # from a chunk, or from every row before it appeared, is null there
+        new_columns = [col for col in df.columns if col not in self.columns]
+        if new_columns and self.row_count:
+            self.rows_with_nulls = self.row_count
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            self.rows_with_nulls += len(df)
+        else:
+            self.rows_with_nulls += int(df.isna().any(axis=1).sum())
+        for col in missing:
+            self.columns[col].null_count += len(df)
+
+        for col in df.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile()
+                self.columns[col].null_count = self.row_count
+            self.columns[col].update(df[col])
+        self.row_count += len(df)
+
+    def result(self) -> Dict[str, Any]:
+        """Build the metadata dict from the aggregates collected so far"""
+        metadata = {
+            'row_count': self.row_count,
+            'column_count': len(self.columns),
+            'columns': list(self.columns.keys()),
+            'data_types': {col: profile.dtype() for col, profile in self.columns.items()},
+            'sample_data': self.sample_data,
+            'statistics': {},
+            'approximate_statistics': {},
+            'sketch_error_bound': config.SKETCH_ERROR_BOUND
+        }
+
+        for col, profile in self.columns.items():
+            null_stats = {
+                'null_count': profile.null_count,
+                'null_percentage': float(profile.null_count / self.row_count * 100) if self.row_count else 0.0
+            }
+            aggregator = profile.categorical or profile.numeric
+            if aggregator is not None and aggregator.approximate():
+                metadata['approximate_statistics'][col] = aggregator.approximate()
+
+            if not profile.dtypes:
+                # Null throughout, profiled like the empty object column of a single read
+                metadata['statistics'][col] = {'unique_count': 0, **null_stats, 'top_values': {}}
+            elif profile.categorical is not None:
+                statistics = profile.categorical.result()
+                metadata['statistics'][col] = {
+                    'unique_count': statistics['unique_count'],
+                    **null_stats,
+                    'top_values': statistics['top_values']
+                }
+            elif profile.numeric is not None:
+                metadata['statistics'][col] = {**profile.numeric.result(), **null_stats}
+
+        total_cells = self.row_count * len(self.columns)
+        total_nulls = sum(profile.null_count for profile in self.columns.values())
+        metadata['completeness'] = {
+            'overall_missing_percentage': float(total_nulls / total_cells * 100) if total_cells else 0.0,
+            'columns_with_nulls': sum(1 for profile in self.columns.values() if profile.null_count > 0),
+            'rows_with_nulls': self.rows_with_nulls
+        }
+
+        return metadata
+
+def _is_numeric(dtype) -> bool:
+    """Match the columns selected by ``select_dtypes(include=[np.number])``"""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def _is_categorical(dtype) -> bool:
+    """Match the columns selected by ``select_dtypes(include=['object', 'category', 'bool', 'boolean'])``"""
+    return pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype)
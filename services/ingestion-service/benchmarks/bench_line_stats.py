@@ -0,0 +1,91 @@
+"""Benchmark text line statistics: the original list-based implementation vs the NumPy path
+
+Both implementations are timed on the same lines, read into memory before
+any timer starts, at several sizes. The original recomputes the mean for
+every element of the std sum, so its time grows quadratically: each doubling
+of the line count roughly quadruples it, which the growth column shows.
+The whole-file path (mmap scan, statistics, percentiles and histogram) is
+timed separately on the full file.
+
+Usage:
+    python benchmarks/bench_line_stats.py [--lines 1000000] [--sizes 5000 10000 20000 40000]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import DataProcessor
+from text_profiler import profile_text_file
+
+def original_line_stats(lines):
+    """The original implementation of DataProcessor._calculate_line_stats"""
+    line_lengths = [len(line) for line in lines]
+    return {
+        'min': min(line_lengths),
+        'max': max(line_lengths),
+        'mean': sum(line_lengths) / len(line_lengths),
+        'median': sorted(line_lengths)[len(line_lengths) // 2],
+        'std': (sum((x - (sum(line_lengths) / len(line_lengths))) ** 2 for x in line_lengths) / len(line_lengths)) ** 0.5
+    }
+
+def vectorized_line_stats(lines):
+    """The current statistics computed from the same list of lines"""
+    return DataProcessor._calculate_line_stats(np.fromiter((len(line) for line in lines), dtype=np.int64, count=len(lines)))
+
+def whole_file_stats(file_path):
+    profile = profile_text_file(file_path)
+    stats = DataProcessor._calculate_line_stats(profile['line_lengths'])
+    stats['histogram'] = DataProcessor._length_histogram(profile['line_lengths'])
+    return stats
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 10_000, 20_000, 40_000],
+                        help="Line counts at which both implementations are timed")
+    parser.add_argument('--mean-length', type=int, default=80)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lengths = np.clip(rng.normal(args.mean_length, args.mean_length / 3, args.lines), 0, None).astype(np.int32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'lines.txt')
+        with open(file_path, 'w') as f:
+            for start in range(0, args.lines, 100_000):
+                f.write(''.join('x' * n + '\n' for n in lengths[start:start + 100_000]))
+        with open(file_path, 'r') as f:
+            lines = f.readlines()
+
+        print(f"{args.lines} lines, mean length {args.mean_length}")
+        print(f"{'lines':>10} {'original':>11} {'growth':>7} {'vectorized':>11} {'speedup':>9}")
+        previous = None
+        for size in sorted(args.sizes):
+            sample = lines[:size]
+            original, expected = timed(original_line_stats, sample)
+            vectorized, result = timed(vectorized_line_stats, sample)
+            for name, value in expected.items():
+                assert np.isclose(value, result[name]), name
+            growth = f"{original / previous:.1f}x" if previous else ""
+            print(f"{size:>10} {original:>10.3f}s {growth:>7} {vectorized:>10.4f}s {original / vectorized:>8.0f}x")
+            previous = original
+        del lines
+
+        elapsed, result = timed(whole_file_stats, file_path)
+
+    print(f"whole file: {elapsed:.3f}s on {args.lines} lines (mmap scan, stats, percentiles and histogram)")
+    print(f"percentiles: {result['percentiles']}")
+
+if __name__ == "__main__":
+    main()
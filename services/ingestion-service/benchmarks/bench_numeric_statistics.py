@@ -0,0 +1,68 @@
+"""Benchmark numeric column statistics: per-column pandas calls vs the 2-D block path
+
+Usage:
+    python benchmarks/bench_numeric_statistics.py [--rows 1000000] [--columns 100]
+"""
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+import numpy as np
+
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from column_profiler import profile_numeric_block
+
+def per_column_statistics(df: pd.DataFrame):
+    """The original per-column implementation from _extract_dataframe_metadata"""
+    statistics = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        statistics[col] = {
+            'min': float(df[col].min()) if not pd.isna(df[col].min()) else None,
+            'max': float(df[col].max()) if not pd.isna(df[col].max()) else None,
+            'mean': float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
+            'median': float(df[col].median()) if not pd.isna(df[col].median()) else None,
+            'std': float(df[col].std()) if not pd.isna(df[col].std()) else None,
+            'null_count': int(df[col].isna().sum()),
+            'null_percentage': float(df[col].isna().mean() * 100)
+        }
+    return statistics
+
+def best_of(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--columns', type=int, default=100)
+    parser.add_argument('--null-fraction', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(args.rows, args.columns))
+    data[rng.random(data.shape) < args.null_fraction] = np.nan
+    df = pd.DataFrame(data, columns=[f'col_{i}' for i in range(args.columns)])
+    del data
+
+    baseline, expected = best_of(per_column_statistics, df, args.repeat)
+    block, result = best_of(profile_numeric_block, df, args.repeat)
+
+    for col, stats in expected.items():
+        for name, value in stats.items():
+            assert value is None and result[col][name] is None or np.isclose(value, result[col][name]), (col, name)
+
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"per-column: {baseline:.3f}s")
+    print(f"2-D block:  {block:.3f}s")
+    print(f"speedup:    {baseline / block:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import warnings
+import pandas as pd
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+import config
+
+# Pools are created on first use and reused across profiling calls
+_executors: Dict[str, Executor] = {}
+
+def profile_numeric_block(frame: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Compute the statistics blocks of many numeric columns at once
+
+    Columns are processed NUMERIC_BLOCK_COLUMNS at a time as a column-major
+    2-D float64 array, so every statistic is a single NaN-aware reduction over
+    the whole block rather than a separate pandas call per column.
+
+    Args:
+        frame: DataFrame containing only numeric columns
+
+    Returns:
+        Dict mapping column name to its min, max, mean, median, std,
+        null_count and null_percentage
+    """
+    statistics = {}
+    columns = frame.columns.tolist()
+    for start in range(0, len(columns), config.NUMERIC_BLOCK_COLUMNS):
+        names = columns[start:start + config.NUMERIC_BLOCK_COLUMNS]
+        block = np.asfortranarray(frame[names].to_numpy(dtype=np.float64, na_value=np.nan))
+        row_count = block.shape[0]
+
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            nulls = np.isnan(block)
+            null_count = nulls.sum(axis=0)
+            count = row_count - null_count
+            minimum = np.fmin.reduce(block, axis=0)
+            maximum = np.fmax.reduce(block, axis=0)
+            mean = np.where(nulls, 0.0, block).sum(axis=0) / count
+            m2 = (np.where(nulls, 0.0, block - mean) ** 2).sum(axis=0)
+            std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+            median = np.nanmedian(block, axis=0) if row_count else np.full(len(names), np.nan)
+
+        for i, col in enumerate(names):
+            statistics[col] = {
+                'min': _optional_float(minimum[i]),
+                'max': _optional_float(maximum[i]),
+                'mean': _optional_float(mean[i]),
+                'median': _optional_float(median[i]),
+                'std': _optional_float(std[i]),
+                'null_count': int(null_count[i]),
+                'null_percentage': float(null_count[i] / row_count * 100) if row_count else 0.0
+            }
+    return statistics
+
+def profile_categorical_column(series: pd.Series) -> Dict[str, Any]:
+    """Compute the statistics block of a categorical column from a single value_counts pass
+
+    Args:
+        series: Object or category column
+
+    Returns:
+        Dict with unique_count, null_count, null_percentage and top_values
+    """
+    value_counts = series.value_counts(dropna=False)
+    value_counts = value_counts[value_counts > 0]
+    null_mask = value_counts.index.isna()
+    null_count = int(value_counts[null_mask].sum())
+    value_counts = value_counts[~null_mask]
+
+    return {
+        'unique_count': int(len(value_counts)),
+        'null_count': null_count,
+        'null_percentage': float(null_count / len(series) * 100) if len(series) else 0.0,
+        # Convert keys to strings to ensure JSON serialization
+        'top_values': {str(k): int(v) for k, v in value_counts.head(10).items()}
+    }
+
+def profile_columns(df: pd.DataFrame, numeric_columns: List[str], categorical_columns: List[str],
+                    parallel: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+    """Profile the given columns of a DataFrame, optionally sharding them across a worker pool
+
+    Args:
+        df: Pandas DataFrame
+        numeric_columns: Columns to profile with profile_numeric_block
+        categorical_columns: Columns to profile with profile_categorical_column
+        parallel: Shard columns across PROFILE_EXECUTOR workers. Defaults to
+            parallel profiling for frames with at least PARALLEL_PROFILE_MIN_COLUMNS
+            columns when more than one worker is configured.
+
+    Returns:
+        Dict mapping column name to its statistics, numeric columns first
+    """
+    columns = numeric_columns + categorical_columns
+    if parallel is None:
+        parallel = config.PROFILE_WORKERS > 1 and len(columns) >= config.PARALLEL_PROFILE_MIN_COLUMNS
+
+    if not parallel:
+        return _profile_shard(df[numeric_columns], df[categorical_columns])
+
+    executor = _get_executor(config.PROFILE_EXECUTOR)
+    shard_count = min(config.PROFILE_WORKERS, len(columns))
+    futures = [
+        executor.submit(_profile_shard, df[numeric_columns[i::shard_count]], df[categorical_columns[i::shard_count]])
+        for i in range(shard_count)
+    ]
+    results = {}
+    for future in futures:
+        results.update(future.result())
+    return {col: results[col] for col in columns}
+
+def _profile_shard(numeric: pd.DataFrame, categorical: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Profile one shard of columns; runs in a worker thread or process"""
+    statistics = profile_numeric_block(numeric)
+    statistics.update({col: profile_categorical_column(categorical[col]) for col in categorical.columns})
+    return statistics
+
+def _optional_float(value: float) -> Optional[float]:
+    """Convert a NumPy scalar to float, mapping NaN to None"""
+    return None if np.isnan(value) else float(value)
+
+def _get_executor(kind: str) -> Executor:
+    """Get the shared profiling pool of the given kind ("thread" or "process")"""
+    if kind not in _executors:
+        if kind == "process":
+            _executors[kind] = ProcessPoolExecutor(max_workers=config.PROFILE_WORKERS)
+        elif kind == "thread":
+            _executors[kind] = ThreadPoolExecutor(max_workers=config.PROFILE_WORKERS, thread_name_prefix="profiler")
+        else:
+            raise ValueError(f"Unknown profiling executor: {kind}")
+    return _executors[kind]
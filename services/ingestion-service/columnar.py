@@ -0,0 +1,195 @@
+import os
+import json
+import itertools
+from pathlib import Path
+from typing import Union, IO
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import config
+from json_stream import JsonTextBuffer, iter_json_array, iter_json_lines, open_text, batches, require_objects
+from json_schema import JsonSchema
+from csv_dialect import detect_dialect
+
+# File types with a Parquet copy (Parquet files are their own copy)
+TABULAR_TYPES = ("csv", "json", "jsonl", "feather", "arrow")
+
+def write_parquet(source: Union[str, Path, IO[bytes]], file_type: str, out_path: Union[str, Path]) -> bool:
+    """Write a typed, compressed Parquet copy of a tabular file
+
+    CSV is converted block by block with Arrow's streaming CSV reader. JSON
+    objects are flattened to the same leaf columns the profiler reports
+    (see JsonSchema) and written batch by batch (see ParquetSink).
+
+    Args:
+        source: Path to the file, or a binary stream of it
+        file_type: Type of the file
+        out_path: Path of the Parquet file to write
+
+    Returns:
+        True if the copy was written, False if the file is not tabular
+    """
+    if file_type == "csv":
+        _csv_to_parquet(source, out_path)
+        return True
+    if file_type in ("json", "jsonl"):
+        return _records_to_parquet(source, file_type, out_path)
+    if file_type in ("feather", "arrow"):
+        pq.write_table(read_ipc(source), out_path, compression=config.PARQUET_COMPRESSION)
+        return True
+    return False
+
+def read_ipc(file_path: Union[str, Path]) -> pa.Table:
+    """Read a Feather or Arrow IPC file, memory-mapped so uncompressed buffers are not copied
+
+    Accepts Feather V1, the Arrow IPC file format (Feather V2) and the
+    Arrow IPC stream format.
+    """
+    try:
+        return feather.read_table(file_path, memory_map=True)
+    except pa.ArrowInvalid:
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_stream(source).read_all()
+
+def _csv_to_parquet(source, out_path):
+    dialect, source = detect_dialect(source)
+    read_options = pa_csv.ReadOptions(block_size=config.PARQUET_BLOCK_SIZE, encoding=dialect.encoding,
+                                      column_names=dialect.names if not dialect.has_header else None)
+    parse_options = pa_csv.ParseOptions(delimiter=dialect.delimiter, quote_char=dialect.quotechar or False,
+                                        double_quote=dialect.doublequote, escape_char=dialect.escapechar or False)
+    try:
+        reader = pa_csv.open_csv(source, read_options=read_options, parse_options=parse_options)
+        with pq.ParquetWriter(out_path, reader.schema, compression=config.PARQUET_COMPRESSION) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+    except pa.ArrowInvalid:
+        if not isinstance(source, (str, Path)):
+            raise
+        # Column types inferred from the first block did not hold for the rest
+        # of the file; let pandas infer them over the whole file instead
+        pq.write_table(to_arrow(pd.read_csv(source, **dialect.read_options())), out_path, compression=config.PARQUET_COMPRESSION)
+
+def _records_to_parquet(source, file_type, out_path) -> bool:
+    with open_text(source) as f:
+        if file_type == "jsonl":
+            values = iter_json_lines(f)
+        else:
+            buffer = JsonTextBuffer(f)
+            values = iter_json_array(buffer) if buffer.peek() == '[' else iter([json.loads(buffer.rest())])
+
+        chunks = batches(values)
+        first = next(chunks, None)
+        if first is not None and not isinstance(first[0], dict):
+            # Arrays of values and scalar documents are not tables
+            return False
+        with ParquetSink(out_path) as sink:
+            if first is not None:
+                schema = JsonSchema.for_records(first)
+                for batch in itertools.chain([first], chunks):
+                    sink.write(to_arrow(schema.flatten(list(require_objects(batch)))))
+    return True
+
+class ParquetSink:
+    """Parquet file written batch by batch, so records are never held in memory all at once
+
+    The file is opened on the schema of the first batch. Later batches are
+    cast to it: missing columns are written as nulls, and integers go to a
+    float column or any value to a string column as is. A batch that does
+    not fit (a new column, or a type the file's column cannot take) widens
+    the schema instead: new columns are appended, integer columns become
+    float64, and columns with conflicting types become strings, as in
+    to_arrow. The rows written so far are then rewritten to the widened
+    schema row group by row group. Each column widens at most twice, so
+    files whose records agree on their types are written in one pass.
+    """
+
+    def __init__(self, out_path: Union[str, Path]):
+        self.out_path = Path(out_path)
+        self.schema: pa.Schema = None
+        self.writer: pq.ParquetWriter = None
+
+    def __enter__(self) -> 'ParquetSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self.writer is not None:
+            self.writer.close()
+
+    def write(self, table: pa.Table):
+        """Append a batch, widening the file's schema first if the batch does not fit"""
+        table = table.replace_schema_metadata(None)
+        if self.writer is None:
+            self._open(table.schema)
+        else:
+            schema = _widen(self.schema, table.schema)
+            if not schema.equals(self.schema):
+                self._rewrite(schema)
+        self.writer.write_table(_conform(table, self.schema))
+
+    def close(self):
+        """Finish the file; with no batch written, an empty table is written"""
+        if self.writer is None:
+            self._open(pa.schema([]))
+        self.writer.close()
+
+    def _open(self, schema: pa.Schema):
+        self.schema = schema
+        self.writer = pq.ParquetWriter(self.out_path, schema, compression=config.PARQUET_COMPRESSION)
+
+    def _rewrite(self, schema: pa.Schema):
+        """Copy the rows written so far to a file with the widened schema"""
+        self.writer.close()
+        written = self.out_path.with_name(self.out_path.name + ".widen")
+        os.replace(self.out_path, written)
+        try:
+            self._open(schema)
+            with pq.ParquetFile(written) as parquet_file:
+                for i in range(parquet_file.num_row_groups):
+                    self.writer.write_table(_conform(parquet_file.read_row_group(i), schema))
+        finally:
+            os.remove(written)
+
+def _widen(schema: pa.Schema, batch: pa.Schema) -> pa.Schema:
+    """Schema that holds the rows of both schemas, keeping the column order of the first"""
+    fields = [pa.field(field.name, _common_type(field.type, batch.field(field.name).type))
+              if field.name in batch.names else field for field in schema]
+    fields.extend(field for field in batch if field.name not in schema.names)
+    return pa.schema(fields)
+
+def _common_type(column: pa.DataType, batch: pa.DataType) -> pa.DataType:
+    """Type of a file column that holds its values and those of a batch column"""
+    if column == batch or pa.types.is_null(batch):
+        return column
+    if pa.types.is_null(column):
+        return batch
+    if pa.types.is_integer(column) and pa.types.is_integer(batch):
+        return pa.int64()
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(check(column) for check in numeric) and any(check(batch) for check in numeric):
+        return pa.float64()
+    return pa.string()
+
+def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Table with exactly the columns of a schema, casting columns and filling missing ones with nulls"""
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            column = table.column(field.name)
+            columns.append(column if column.type == field.type else column.cast(field.type))
+        else:
+            columns.append(pa.nulls(table.num_rows, field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Convert a DataFrame to an Arrow table, storing columns of mixed types as strings"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.select_dtypes(include=['object']).columns:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
@@ -22,6 +22,17 @@ POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# Ingestion job queue (defaults to the main database; a local SQLite URL also works)
+JOB_DATABASE_URL = os.getenv("JOB_DATABASE_URL", DATABASE_URL)
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", 10))  # Seconds between heartbeats of a running job
+JOB_HEARTBEAT_TIMEOUT = float(os.getenv("JOB_HEARTBEAT_TIMEOUT", 60))  # Seconds without a heartbeat after which a running job is taken over
+
+# Execution pools for blocking work in request handlers
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", 16))  # Threads for database, storage and file I/O
+IO_QUEUE_SIZE = int(os.getenv("IO_QUEUE_SIZE", 64))  # Calls allowed to wait for an I/O thread
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", os.cpu_count() or 1))  # Processes for profiling and ingestion jobs
+CPU_QUEUE_SIZE = int(os.getenv("CPU_QUEUE_SIZE", 16))  # Calls allowed to wait for a profiling process
+
 # MinIO Configuration
 MINIO_ROOT_USER = os.getenv("MINIO_ROOT_USER", "minioadmin")
 MINIO_ROOT_PASSWORD = os.getenv("MINIO_ROOT_PASSWORD", "minioadmin")
@@ -35,15 +46,54 @@ DATASET_BUCKET = "datasets"
 TEMP_UPLOAD_DIR = Path("/tmp/dataaptor/uploads")
 TEMP_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Storage transfers
+MULTIPART_THRESHOLD = int(os.getenv("MULTIPART_THRESHOLD", 16 * 1024 * 1024))  # Files larger than this are transferred in parts
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", 8 * 1024 * 1024))  # S3 requires at least 5 MB per part
+MULTIPART_CONCURRENCY = int(os.getenv("MULTIPART_CONCURRENCY", 8))  # Parts transferred in parallel per file
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 32))  # HTTP connections shared by all storage calls
+
+# Columnar copies of tabular datasets
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+PARQUET_BLOCK_SIZE = int(os.getenv("PARQUET_BLOCK_SIZE", 8 * 1024 * 1024))  # CSV bytes converted per record batch
+
+# Streaming uploads
+STREAMING_UPLOAD_TYPES = ["csv", "json", "jsonl"]  # Types profiled while the upload streams to storage, without a temp file (if their handler supports streaming)
+STREAM_PROFILER_BUFFER = int(os.getenv("STREAM_PROFILER_BUFFER", 8))  # Upload chunks buffered ahead of the profiler
+
 # File size limits
 MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100 MB
 
+# Profiling
+STREAMING_PROFILE_THRESHOLD = int(os.getenv("STREAMING_PROFILE_THRESHOLD", 50 * 1024 * 1024))  # Files larger than this are profiled in chunks
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", 100000))  # Rows per chunk
+JSON_CHUNK_SIZE = int(os.getenv("JSON_CHUNK_SIZE", 10000))  # JSON records per chunk
+JSON_READ_SIZE = int(os.getenv("JSON_READ_SIZE", 1024 * 1024))  # Characters read per refill of the JSON parser
+SCHEMA_CACHE_SIZE = int(os.getenv("SCHEMA_CACHE_SIZE", 128))  # Inferred JSON schemas kept per process
+SCHEMA_FINGERPRINT_RECORDS = int(os.getenv("SCHEMA_FINGERPRINT_RECORDS", 100))  # Leading records whose shapes key the schema cache
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", os.cpu_count() or 1))
+PROFILE_EXECUTOR = os.getenv("PROFILE_EXECUTOR", "thread")  # "thread" or "process"
+PARALLEL_PROFILE_MIN_COLUMNS = int(os.getenv("PARALLEL_PROFILE_MIN_COLUMNS", 32))  # Narrower frames are profiled serially
+NUMERIC_BLOCK_COLUMNS = int(os.getenv("NUMERIC_BLOCK_COLUMNS", 64))  # Numeric columns aggregated per 2-D block
+SKETCH_ERROR_BOUND = float(os.getenv("SKETCH_ERROR_BOUND", 0.01))  # Target relative error of approximate statistics
+TEXT_PROFILE_WINDOW = int(os.getenv("TEXT_PROFILE_WINDOW", 16 * 1024 * 1024))  # Bytes of a text file scanned per pass
+LINE_HISTOGRAM_BINS = int(os.getenv("LINE_HISTOGRAM_BINS", 20))  # Bins of the line length histogram
+CSV_INFERENCE_ROWS = int(os.getenv("CSV_INFERENCE_ROWS", 10000))  # Rows read by the CSV dtype inference pre-pass
+CSV_CATEGORY_MAX_RATIO = float(os.getenv("CSV_CATEGORY_MAX_RATIO", 0.5))  # Max distinct/total values of a text column stored as a category
+CSV_ENGINE = os.getenv("CSV_ENGINE", "c")  # pd.read_csv engine for whole-file reads ("c" or "pyarrow")
+CSV_SNIFF_BYTES = int(os.getenv("CSV_SNIFF_BYTES", 16 * 1024))  # Leading bytes of a CSV file used to detect its dialect
+DIALECT_CACHE_SIZE = int(os.getenv("DIALECT_CACHE_SIZE", 256))  # Detected CSV dialects kept by hash of the sniffed bytes
+
 # Supported file types
 SUPPORTED_FILE_TYPES = {
     "csv": ["text/csv", "application/csv", "application/vnd.ms-excel"],
     "json": ["application/json"],
+    "jsonl": ["application/x-ndjson", "application/jsonl", "application/x-jsonlines"],
     "txt": ["text/plain"],
+    "parquet": ["application/vnd.apache.parquet", "application/x-parquet"],
+    "feather": ["application/x-feather"],
+    "arrow": ["application/vnd.apache.arrow.file", "application/vnd.apache.arrow.stream"],
 }
 
 # Database models
 DATASET_TABLE = "datasets"
+INGESTION_JOB_TABLE = "ingestion_jobs"
@@ -0,0 +1,260 @@
+import io
+import re
+import csv
+import codecs
+import itertools
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, IO, List, Optional, Tuple, Union
+import config
+
+# Delimiters the sniffer chooses between
+DELIMITERS = ",;\t|"
+# Rows of the head parsed per candidate delimiter
+SNIFF_ROWS = 50
+
+# Byte order marks, longest first so UTF-32 is not taken for UTF-16
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+class CsvDialect:
+    """How a CSV file is written: what the sniffer found in its first bytes"""
+
+    def __init__(self, delimiter: str = ",", quotechar: Optional[str] = '"', doublequote: bool = True,
+                 escapechar: Optional[str] = None, has_header: bool = True, encoding: str = "utf-8",
+                 line_terminator: str = "\n", names: Optional[List[str]] = None):
+        self.delimiter = delimiter
+        self.quotechar = quotechar
+        self.doublequote = doublequote
+        self.escapechar = escapechar
+        self.has_header = has_header
+        self.encoding = encoding
+        self.line_terminator = line_terminator
+        # Generated column names, for files without a header row
+        self.names = names
+
+    def read_options(self) -> Dict[str, Any]:
+        """Keyword arguments for pd.read_csv"""
+        options = {
+            "sep": self.delimiter,
+            "quotechar": self.quotechar or '"',
+            "doublequote": self.doublequote,
+            "escapechar": self.escapechar,
+            "encoding": self.encoding,
+        }
+        if not self.has_header:
+            options["header"] = None
+            options["names"] = self.names
+        return options
+
+    def describe(self) -> Dict[str, Any]:
+        """The dialect as a JSON-serializable dict for the dataset metadata"""
+        return {
+            "delimiter": self.delimiter,
+            "quotechar": self.quotechar,
+            "doublequote": self.doublequote,
+            "escapechar": self.escapechar,
+            "has_header": self.has_header,
+            "encoding": self.encoding,
+            "line_terminator": self.line_terminator
+        }
+
+def sniff_dialect(head: bytes) -> CsvDialect:
+    """Detect the dialect of a CSV file from its first bytes
+
+    Args:
+        head: The first bytes of the file (see CSV_SNIFF_BYTES)
+
+    Returns:
+        The detected dialect; anything that cannot be detected keeps the
+        default of a comma-separated UTF-8 file with a header row
+    """
+    encoding, text = _decode(head)
+    # Only complete lines are sniffed, as the last one was likely cut off
+    if len(head) >= config.CSV_SNIFF_BYTES and "\n" in text:
+        text = text[:text.rindex("\n") + 1]
+
+    if "\r\n" in text:
+        line_terminator = "\r\n"
+    elif "\r" in text and "\n" not in text:
+        line_terminator = "\r"
+    else:
+        line_terminator = "\n"
+
+    dialect = CsvDialect(encoding=encoding, line_terminator=line_terminator)
+    if not text.strip():
+        return dialect
+
+    if '"' not in text and re.search(r"(^|[" + DELIMITERS + r"])'", text, re.MULTILINE):
+        dialect.quotechar = "'"
+    if "\\" + dialect.quotechar in text and dialect.quotechar * 2 not in text:
+        dialect.escapechar = "\\"
+        dialect.doublequote = False
+
+    # csv.Sniffer's regexes give up on quoted delimiters next to CRLF line ends, so
+    # each candidate is tried with a real parser instead and the one that
+    # splits the lines most consistently into more than one field wins
+    best_score = (0.0, 0)
+    for delimiter in DELIMITERS:
+        rows = _parse(text, dialect, delimiter)
+        counts = Counter(len(row) for row in rows)
+        if not counts:
+            continue
+        fields, lines = counts.most_common(1)[0]
+        score = (lines / len(rows), fields)
+        if fields > 1 and score > best_score:
+            dialect.delimiter, best_score = delimiter, score
+
+    rows = _parse(text, dialect, dialect.delimiter)
+    dialect.has_header = _has_header(rows)
+    if not dialect.has_header:
+        dialect.names = [f"column_{i + 1}" for i in range(len(rows[0]))]
+    return dialect
+
+def _parse(text: str, dialect: CsvDialect, delimiter: str) -> List[List[str]]:
+    """Parse the first SNIFF_ROWS non-empty rows of the head with the given delimiter"""
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=dialect.quotechar,
+                        doublequote=dialect.doublequote, escapechar=dialect.escapechar)
+    try:
+        return [row for row in itertools.islice(reader, SNIFF_ROWS) if row]
+    except csv.Error:
+        return []
+
+def _has_header(rows: List[List[str]]) -> bool:
+    """Whether the first row names the columns rather than holding values
+
+    A text value above a numeric column is its name. Otherwise each column
+    compares its first value with the rest, as csv.Sniffer does: a text
+    name that does not recur as a value, or a numeric name (a year, a code)
+    whose width differs from values that share one, counts for a header;
+    a number as wide as the values below counts against. A row of numbers
+    only is always data.
+    """
+    if len(rows) < 2:
+        return True
+    first, rest = rows[0], rows[1:]
+    columns = [[row[index] for row in rest if index < len(row) and row[index]] for index in range(len(first))]
+    numeric = [bool(column) and all(_is_number(value) for value in column) for column in columns]
+    if any(is_numeric and not _is_number(name) for name, is_numeric in zip(first, numeric)):
+        return True
+    if all(_is_number(name) for name in first):
+        return False
+    # Names are distinct and do not recur as values
+    if len(set(first)) < len(first):
+        return False
+    votes = 0
+    for name, column, is_numeric in zip(first, columns, numeric):
+        if not column:
+            continue
+        if is_numeric:
+            widths = {len(value) for value in column}
+            votes += 1 if len(widths) == 1 and len(name) not in widths else -1
+        elif name in column:
+            return False
+        else:
+            votes += 1
+    return votes > 0
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+def _decode(head: bytes) -> Tuple[str, str]:
+    """Detect the encoding of a file from its first bytes and decode them"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, head.decode(encoding, errors="ignore")
+    try:
+        # A multi-byte character may be cut off at the end of the head
+        return "utf-8", codecs.getincrementaldecoder("utf-8")().decode(head)
+    except UnicodeDecodeError:
+        # Any byte sequence decodes as Latin-1
+        return "latin-1", head.decode("latin-1")
+
+class DialectCache:
+    """Thread-safe LRU cache of detected dialects by hash of the bytes they were sniffed from"""
+
+    def __init__(self, size: int = None):
+        self.size = size or config.DIALECT_CACHE_SIZE
+        self.entries: 'OrderedDict[str, CsvDialect]' = OrderedDict()
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CsvDialect]:
+        with self._lock:
+            dialect = self.entries.get(key)
+            if dialect is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return dialect
+
+    def put(self, key: str, dialect: CsvDialect):
+        with self._lock:
+            self.entries[key] = dialect
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+
+# Dialects seen by this process
+dialect_cache = DialectCache()
+
+def detect_dialect(source: Union[str, IO[bytes]]) -> Tuple[CsvDialect, Union[str, IO[bytes]]]:
+    """Detect the dialect of a CSV file or stream from its first CSV_SNIFF_BYTES bytes
+
+    Only the head is read. A stream is returned wrapped so that it replays
+    the head before the rest, so the caller still reads the file in one
+    pass; a path is returned as is.
+
+    Args:
+        source: Path to the CSV file, or a binary stream of it
+
+    Returns:
+        Tuple of the dialect and the source to read the file from
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as f:
+            head = f.read(config.CSV_SNIFF_BYTES)
+    else:
+        head = source.read(config.CSV_SNIFF_BYTES)
+        source = io.BufferedReader(_ReplayStream(head, source))
+
+    key = hashlib.sha256(head).hexdigest()
+    dialect = dialect_cache.get(key)
+    if dialect is None:
+        dialect = sniff_dialect(head)
+        dialect_cache.put(key, dialect)
+    return dialect, source
+
+class _ReplayStream(io.RawIOBase):
+    """Raw stream of bytes already read from a stream, followed by the rest of it"""
+
+    def __init__(self, head: bytes, stream: IO[bytes]):
+        self.head = memoryview(head)
+        self.stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.head:
+            size = min(len(buffer), len(self.head))
+            buffer[:size] = self.head[:size]
+            self.head = self.head[size:]
+            return size
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
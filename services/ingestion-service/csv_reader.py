@@ -0,0 +1,125 @@
+import os
+import warnings
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+import config
+
+# Integer dtypes by increasing width: NumPy ones for columns without nulls, pandas nullable ones for columns with nulls
+_INT_DTYPES = [np.int8, np.int16, np.int32]
+_NULLABLE_INT_DTYPES = ["Int8", "Int16", "Int32"]
+
+def infer_csv_dtypes(file_path: str, sample_rows: int = None, **options) -> Tuple[Dict[str, Any], List[str]]:
+    """Infer compact dtypes for the text columns of a CSV file from its first rows
+
+    Columns that parse as ISO 8601 dates become datetimes, columns of
+    true/false values with nulls become nullable booleans, and text columns
+    whose distinct values are at most CSV_CATEGORY_MAX_RATIO of the sampled
+    values become categories. Numeric columns are left to the full read and
+    narrowed afterwards by downcast_numeric, which checks every value, so a
+    value outside the sample's range can never be wrapped or rounded.
+
+    Args:
+        file_path: Path to the CSV file
+        sample_rows: Rows read for the pre-pass (defaults to CSV_INFERENCE_ROWS)
+        **options: Further pd.read_csv arguments, e.g. from CsvDialect.read_options
+
+    Returns:
+        Tuple of the dtype map and the columns to parse as dates, as accepted
+        by pd.read_csv's ``dtype`` and ``parse_dates``
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows or config.CSV_INFERENCE_ROWS, **options)
+    dtypes: Dict[str, Any] = {}
+    dates: List[str] = []
+    for col in sample.columns:
+        values = sample[col].dropna()
+        if sample[col].dtype != object or values.empty:
+            continue
+        if values.isin([True, False]).all():
+            dtypes[col] = "boolean"
+        elif _is_iso_datetime(values):
+            dates.append(col)
+        elif values.nunique() <= len(values) * config.CSV_CATEGORY_MAX_RATIO:
+            dtypes[col] = "category"
+    return dtypes, dates
+
+def read_csv(file_path: str, engine: str = None, **options) -> pd.DataFrame:
+    """Read a whole CSV file with the dtypes from infer_csv_dtypes, then narrow its numeric columns
+
+    If the rest of the file does not fit the inferred dtypes (e.g. a column
+    of true/false values has another value further down), the file is read
+    again with pandas' default inference.
+
+    Args:
+        file_path: Path to the CSV file
+        engine: pd.read_csv parser engine (defaults to CSV_ENGINE)
+        **options: Further pd.read_csv arguments, e.g. from CsvDialect.read_options
+    """
+    engine = engine or config.CSV_ENGINE
+    dtypes, dates = infer_csv_dtypes(file_path, **options)
+    try:
+        df = pd.read_csv(file_path, dtype=dtypes, parse_dates=dates, engine=engine, **options)
+    except (ValueError, TypeError):
+        df = pd.read_csv(file_path, engine=engine, **options)
+    return downcast_numeric(df)
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow numeric columns to the smallest dtype that holds every value exactly
+
+    Integers become int8/16/32 (or their nullable counterparts for float
+    columns that only hold whole numbers and nulls) and floats become float32
+    when no value changes in the conversion.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            df[col] = _narrow_integers(series, _INT_DTYPES)
+        elif pd.api.types.is_float_dtype(series.dtype):
+            values = series.to_numpy()
+            present = values[~np.isnan(values)]
+            if len(present) and np.array_equal(present, np.round(present)) and series.isna().any():
+                df[col] = _narrow_integers(series, _NULLABLE_INT_DTYPES, nullable=True)
+            elif series.dtype != np.float32:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+                    df[col] = narrowed
+    return df
+
+def _narrow_integers(series: pd.Series, dtypes: List[Any], nullable: bool = False) -> pd.Series:
+    present = series.dropna()
+    if present.empty:
+        return series
+    low, high = present.min(), present.max()
+    for dtype in dtypes:
+        info = np.iinfo(np.dtype(dtype.lower()) if nullable else dtype)
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+def _is_iso_datetime(values: pd.Series) -> bool:
+    # Only strings that look like dates are tried, so free text is rejected cheaply
+    if not values.astype(str).str.match(r"^\d{4}-\d{2}-\d{2}").all():
+        return False
+    try:
+        pd.to_datetime(values, format="ISO8601")
+    except (ValueError, TypeError):
+        return False
+    return True
+
+def memory_usage(df: pd.DataFrame, file_path: Optional[str] = None) -> Dict[str, Any]:
+    """Memory held by a DataFrame, in total and per column, relative to the file it was read from"""
+    columns = df.memory_usage(deep=True, index=False)
+    total = int(columns.sum())
+    result = {
+        "total_bytes": total,
+        "columns": {col: int(size) for col, size in columns.items()}
+    }
+    if file_path is not None:
+        file_size = os.path.getsize(file_path)
+        result["file_bytes"] = file_size
+        result["ratio_to_file"] = float(total / file_size) if file_size else None
+    return result
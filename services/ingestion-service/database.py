@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, TIMESTAMP, BigInteger, JSON, MetaData, Table
+from sqlalchemy import create_engine, Column, Integer, String, Text, Float, TIMESTAMP, BigInteger, JSON, MetaData, Table, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import config
@@ -18,6 +18,10 @@ datasets = Table(
     Column("file_size", BigInteger, nullable=False),
     Column("created_at", TIMESTAMP, server_default=func.now()),
     Column("metadata", JSON),
+    Column("content_hash", String(64), unique=True, index=True),
+    Column("parquet_path", String(255)),
+    # Keyset pagination of listings, newest first (scanned backwards)
+    Index("ix_datasets_created_at_id", "created_at", "id"),
 )
 
 # Create declarative base
@@ -33,11 +37,39 @@ class Dataset(Base):
     file_type = Column(String(50), nullable=False)
     file_size = Column(BigInteger, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now())
-    metadata = Column(JSON)
+    # "metadata" is reserved on declarative models, so the column is mapped under another attribute name
+    metadata_ = Column("metadata", JSON)
+    content_hash = Column(String(64), unique=True, index=True)  # SHA-256 of the file content
+    parquet_path = Column(String(255))  # Object name of the Parquet copy of tabular datasets
+
+    __table_args__ = (Index("ix_datasets_created_at_id", "created_at", "id"),)
 
     def __repr__(self):
         return f"<Dataset(id={self.id}, name='{self.name}', type='{self.file_type}')>"
 
+# Define IngestionJob ORM model
+class IngestionJob(Base):
+    __tablename__ = config.INGESTION_JOB_TABLE
+
+    id = Column(String(36), primary_key=True)
+    status = Column(String(20), nullable=False, index=True)  # queued, running, completed, failed
+    progress = Column(Float, nullable=False, default=0.0)  # Percentage from 0 to 100
+    stage = Column(String(50))
+    file_path = Column(String(512), nullable=False)  # Temporary upload path read by the worker, or the stored object of a streamed upload
+    original_filename = Column(String(255), nullable=False)
+    file_type = Column(String(50), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64))
+    dataset_id = Column(Integer)
+    error = Column(Text)
+    worker_id = Column(String(100))  # Process running the job
+    heartbeat_at = Column(TIMESTAMP)  # Last heartbeat of that process (UTC)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<IngestionJob(id='{self.id}', status='{self.status}', progress={self.progress})>"
+
 
 # Create tables if they don't exist
 def init_db():
@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+import config
+
+class BoundedPool:
+    """Executor wrapper that bounds outstanding work and tracks queue depth
+
+    At most ``workers + max_queue`` calls are submitted to the underlying
+    executor at once; further callers wait for a slot, which applies
+    backpressure to request handlers instead of growing an unbounded queue.
+    """
+
+    def __init__(self, name: str, executor: Executor, workers: int, max_queue: int):
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the pool and await its result"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+        finally:
+            self._slots.release()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit ``fn(*args, **kwargs)`` without waiting for a slot"""
+        if kwargs:
+            fn = functools.partial(fn, *args, **kwargs)
+            args = ()
+        with self._lock:
+            self.in_flight += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.in_flight - self.workers)
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current pool size, activity and queue depth"""
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'active': min(self.in_flight, self.workers),
+            'queue_depth': max(0, self.in_flight - self.workers),
+            'peak_queue_depth': self.peak_queue_depth,
+            'waiting': self.waiting,
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+class ExecutionLayer:
+    """Routes blocking work off the event loop
+
+    Blocking I/O (SQLAlchemy sessions, boto3 calls, file writes and the
+    profiling of streamed uploads) runs in a bounded thread pool, and
+    CPU-heavy work (profiling and the ingestion jobs) in a bounded process
+    pool. Jobs submitted without waiting for a slot show in its queue depth.
+    """
+
+    def __init__(self, io_workers: int = None, cpu_workers: int = None, io_queue: int = None, cpu_queue: int = None):
+        self.io_workers = io_workers or config.IO_POOL_SIZE
+        self.cpu_workers = cpu_workers or config.CPU_POOL_SIZE
+        self.io_queue = io_queue if io_queue is not None else config.IO_QUEUE_SIZE
+        self.cpu_queue = cpu_queue if cpu_queue is not None else config.CPU_QUEUE_SIZE
+        self.pools: Dict[str, BoundedPool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def io(self) -> BoundedPool:
+        """Thread pool for blocking I/O; created on first use"""
+        return self._pool('io', lambda: BoundedPool(
+            'io', ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='io'), self.io_workers, self.io_queue
+        ))
+
+    @property
+    def cpu(self) -> BoundedPool:
+        """Process pool for CPU-heavy work; created on first use"""
+        return self._pool('cpu', lambda: BoundedPool(
+            'cpu', ProcessPoolExecutor(max_workers=self.cpu_workers), self.cpu_workers, self.cpu_queue
+        ))
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking I/O call in the thread pool"""
+        return await self.io.run(fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a CPU-heavy call in the process pool; ``fn`` and its arguments must be picklable"""
+        return await self.cpu.run(fn, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every pool created so far, keyed by pool name"""
+        return {name: pool.metrics() for name, pool in self.pools.items()}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pools, self.pools = list(self.pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    def _pool(self, name: str, factory: Callable[[], BoundedPool]) -> BoundedPool:
+        with self._lock:
+            if name not in self.pools:
+                self.pools[name] = factory()
+            return self.pools[name]
+
+# Shared execution layer of this process
+_execution_layer: Optional[ExecutionLayer] = None
+
+def get_execution_layer() -> ExecutionLayer:
+    """Get the process-wide execution layer"""
+    global _execution_layer
+    if _execution_layer is None:
+        _execution_layer = ExecutionLayer()
+    return _execution_layer
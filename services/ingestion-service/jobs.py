@@ -0,0 +1,347 @@
+import os
+import uuid
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import create_engine, select, update, and_, or_
+from sqlalchemy.orm import Session, sessionmaker
+
+import config
+from database import IngestionJob
+from executors import BoundedPool, ExecutionLayer, get_execution_layer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Per-process state of ingestion workers, set up by _init_worker
+_worker_queue = None
+_worker_service = None
+_worker_session = None
+
+class JobQueue:
+    """Persistent queue of ingestion jobs processed by the execution layer's CPU pool
+
+    Jobs are rows in the ingestion_jobs table, so queued work survives a restart
+    and any API process can report on a job's status and progress. A running
+    job records the process running it and that process's heartbeats; only
+    jobs whose heartbeat has expired are taken over by another process, so
+    several API processes can share the table.
+    """
+
+    def __init__(self, database_url: str = None, execution: Optional[ExecutionLayer] = None):
+        """Initialize the job queue
+
+        Args:
+            database_url: SQLAlchemy URL of the job database (defaults to JOB_DATABASE_URL)
+            execution: Layer whose CPU pool runs the jobs (defaults to the shared execution layer)
+        """
+        self.database_url = database_url or config.JOB_DATABASE_URL
+        self.execution = execution or get_execution_layer()
+        self.engine = create_engine(self.database_url)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.pool: Optional[BoundedPool] = None
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopped = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        IngestionJob.__table__.create(self.engine, checkfirst=True)
+
+    def start(self):
+        """Start submitting jobs to the CPU pool, take over abandoned jobs and resubmit queued ones
+
+        Jobs are durable in the database, so they are submitted without waiting
+        for a pool slot; the pool's queue depth shows the jobs waiting for a
+        process. A watcher thread keeps taking over jobs abandoned by other
+        processes while this one runs.
+        """
+        self.pool = self.execution.cpu
+        self.recover()
+        with self.Session() as db:
+            pending = db.execute(select(IngestionJob.id).where(IngestionJob.status == QUEUED).order_by(IngestionJob.created_at)).scalars().all()
+        for job_id in pending:
+            self._submit(job_id)
+        if pending:
+            logger.info(f"Resubmitted {len(pending)} unfinished ingestion jobs")
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=self._watch, name="ingestion-job-watcher", daemon=True)
+        self._watcher.start()
+
+    def recover(self) -> List[str]:
+        """Take over running jobs whose process stopped sending heartbeats
+
+        Abandoned streamed uploads (no file_path) cannot be replayed, so they are
+        marked failed. Abandoned jobs whose file is on this host are queued
+        again; those whose file is on another host are left to that host.
+
+        Returns:
+            IDs of the jobs queued again
+        """
+        with self.Session() as db:
+            abandoned = db.execute(select(IngestionJob.id, IngestionJob.file_path).where(self._abandoned())).all()
+            lost = [job_id for job_id, file_path in abandoned if not file_path]
+            requeued = [job_id for job_id, file_path in abandoned if file_path and os.path.exists(file_path)]
+            if lost:
+                db.execute(update(IngestionJob).where(IngestionJob.id.in_(lost), self._abandoned())
+                           .values(status=FAILED, error="Interrupted by a restart; upload the file again"))
+            if requeued:
+                # The expiry is checked again, so a job whose heartbeat resumed meanwhile is left alone
+                requeued = db.execute(update(IngestionJob).where(IngestionJob.id.in_(requeued), self._abandoned())
+                                      .values(status=QUEUED, progress=0.0, stage=None, worker_id=None)
+                                      .returning(IngestionJob.id)).scalars().all()
+            db.commit()
+        if lost or requeued:
+            logger.info(f"Took over abandoned ingestion jobs: {len(requeued)} queued again, {len(lost)} failed")
+        return requeued
+
+    @contextmanager
+    def heartbeat(self, job_id: str):
+        """Record heartbeats of a job owned by this process while the block runs"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(config.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    self._update(job_id, owned=True, heartbeat_at=datetime.utcnow())
+                except Exception as e:
+                    logger.warning(f"Could not record heartbeat of job {job_id}: {str(e)}")
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def shutdown(self):
+        """Stop submitting jobs; the pool itself is shut down with the execution layer"""
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self.pool = None
+
+    def enqueue(self, file_path: str, original_filename: str, file_size: int, file_type: str, content_hash: Optional[str] = None) -> IngestionJob:
+        """Record a new ingestion job and hand it to the CPU pool
+
+        Args:
+            file_path: Path to the uploaded file; the worker removes it when done
+            original_filename: Original name of the uploaded file
+            file_size: Size of the file in bytes
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
+            content_hash: SHA-256 hex digest computed while the file was received
+
+        Returns:
+            The queued job
+        """
+        job = IngestionJob(
+            id=str(uuid.uuid4()),
+            status=QUEUED,
+            progress=0.0,
+            file_path=file_path,
+            original_filename=original_filename,
+            file_size=file_size,
+            file_type=file_type,
+            content_hash=content_hash
+        )
+        with self.Session(expire_on_commit=False) as db:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        self._submit(job.id)
+        return job
+
+    def record_completed(self, storage_filename: str, original_filename: str, file_size: int, file_type: str, dataset_id: int) -> IngestionJob:
+        """Record a job for an upload that was ingested inline or matched an existing dataset
+
+        Args:
+            storage_filename: Object name of the stored file
+            original_filename: Original name of the uploaded file
+            file_size: Size of the file in bytes
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
+            dataset_id: ID of the created dataset
+
+        Returns:
+            The completed job
+        """
+        job = IngestionJob(
+            id=str(uuid.uuid4()),
+            status=COMPLETED,
+            progress=100.0,
+            file_path=storage_filename,
+            original_filename=original_filename,
+            file_size=file_size,
+            file_type=file_type,
+            dataset_id=dataset_id
+        )
+        with self.Session(expire_on_commit=False) as db:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        return job
+
+    def record_running(self, original_filename: str, file_size: int, file_type: str) -> IngestionJob:
+        """Record a job for an upload ingested by the API process itself rather than the workers
+
+        The job is owned by this process. The caller keeps it alive with heartbeat
+        and reports its progress and outcome with report and finish.
+
+        Args:
+            original_filename: Original name of the uploaded file
+            file_size: Size of the file in bytes, or 0 if not yet known
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
+
+        Returns:
+            The running job
+        """
+        job = IngestionJob(
+            id=str(uuid.uuid4()),
+            status=RUNNING,
+            progress=0.0,
+            file_path="",  # Set to the stored object once the upload is ingested
+            original_filename=original_filename,
+            file_size=file_size,
+            file_type=file_type,
+            worker_id=self.worker_id,
+            heartbeat_at=datetime.utcnow()
+        )
+        with self.Session(expire_on_commit=False) as db:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        return job
+
+    def report(self, job_id: str, percentage: float, stage: str):
+        """Record the progress of a running job"""
+        self._update(job_id, progress=percentage, stage=stage)
+
+    def finish(self, job_id: str, storage_filename: Optional[str] = None, dataset_id: Optional[int] = None, error: Optional[str] = None,
+               file_size: Optional[int] = None):
+        """Mark a job recorded with record_running as completed, or as failed when an error is given
+
+        A file_size, when given, replaces the size recorded before the upload was received.
+        """
+        if error is not None:
+            self._update(job_id, owned=True, status=FAILED, error=error)
+            return
+        values = dict(status=COMPLETED, progress=100.0, stage=None, file_path=storage_filename, dataset_id=dataset_id)
+        if file_size is not None:
+            values["file_size"] = file_size
+        self._update(job_id, owned=True, **values)
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Get a job by ID
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            IngestionJob object if found, None otherwise
+        """
+        with self.Session(expire_on_commit=False) as db:
+            return db.execute(select(IngestionJob).where(IngestionJob.id == job_id)).scalar_one_or_none()
+
+    def process(self, job_id: str, service, db: Session) -> bool:
+        """Run a queued job to completion; called inside a worker process
+
+        Args:
+            job_id: ID of the job
+            service: IngestionService used to run the pipeline
+            db: Session on the dataset database
+
+        Returns:
+            True if the job completed, False if it failed or was already claimed
+        """
+        if not self._claim(job_id):
+            return False
+
+        job = self.get(job_id)
+        try:
+            with self.heartbeat(job_id):
+                dataset_id, _ = service.ingest(
+                    file_path=job.file_path,
+                    original_filename=job.original_filename,
+                    file_size=job.file_size,
+                    file_type=job.file_type,
+                    db=db,
+                    content_hash=job.content_hash,
+                    progress=lambda percentage, stage: self.report(job_id, percentage, stage)
+                )
+            self._update(job_id, owned=True, status=COMPLETED, progress=100.0, stage=None, dataset_id=dataset_id)
+            return True
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {str(e)}")
+            self._update(job_id, owned=True, status=FAILED, error=str(e))
+            return False
+        finally:
+            if os.path.exists(job.file_path):
+                os.remove(job.file_path)
+
+    def _submit(self, job_id: str):
+        if self.pool is not None:
+            self.pool.submit(_run_job, job_id, self.database_url)
+
+    def _watch(self):
+        """Take over jobs abandoned by other processes until shutdown"""
+        while not self._stopped.wait(config.JOB_HEARTBEAT_TIMEOUT):
+            try:
+                for job_id in self.recover():
+                    self._submit(job_id)
+            except Exception as e:
+                logger.warning(f"Could not check for abandoned ingestion jobs: {str(e)}")
+
+    def _claim(self, job_id: str) -> bool:
+        """Atomically take a queued or abandoned job for this process"""
+        with self.Session() as db:
+            result = db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == job_id, or_(IngestionJob.status == QUEUED, self._abandoned()))
+                .values(status=RUNNING, progress=0.0, stage=None, worker_id=self.worker_id, heartbeat_at=datetime.utcnow())
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    @staticmethod
+    def _abandoned():
+        """Condition matching running jobs whose heartbeat has expired"""
+        expired = datetime.utcnow() - timedelta(seconds=config.JOB_HEARTBEAT_TIMEOUT)
+        return and_(IngestionJob.status == RUNNING, or_(IngestionJob.heartbeat_at.is_(None), IngestionJob.heartbeat_at < expired))
+
+    def _update(self, job_id: str, owned: bool = False, **values):
+        """Update a job; with owned, only while this process still owns it"""
+        query = update(IngestionJob).where(IngestionJob.id == job_id)
+        if owned:
+            query = query.where(IngestionJob.worker_id == self.worker_id)
+        with self.Session() as db:
+            db.execute(query.values(**values))
+            db.commit()
+
+def _init_worker(database_url: str):
+    """Set up the queue, service and database sessions of a worker process"""
+    global _worker_queue, _worker_service, _worker_session
+    from database import engine
+    from service import IngestionService
+    from storage import reset_process_state
+
+    # Connections, and the storage client and thread pools, inherited from the parent process must not be reused
+    engine.dispose(close=False)
+    reset_process_state()
+    _worker_queue = JobQueue(database_url=database_url)
+    _worker_service = IngestionService()
+    _worker_session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _run_job(job_id: str, database_url: str):
+    """Entry point of a job in a CPU pool process, which is set up for jobs on first use"""
+    if _worker_queue is None:
+        _init_worker(database_url)
+    with _worker_session() as db:
+        _worker_queue.process(job_id, _worker_service, db)
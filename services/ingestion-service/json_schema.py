@@ -0,0 +1,259 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import config
+from aggregators import NumericAggregator
+
+# JSON type names by Python type of the decoded value
+_TYPE_NAMES = {
+    type(None): 'null',
+    bool: 'boolean',
+    int: 'integer',
+    float: 'number',
+    str: 'string',
+    dict: 'object',
+    list: 'array',
+}
+_SCALAR_TYPES = {'boolean', 'integer', 'number', 'string'}
+_MISSING = object()
+
+def json_type(value: Any) -> str:
+    """JSON type name of a decoded value"""
+    return _TYPE_NAMES.get(type(value), 'string')
+
+class SchemaNode:
+    """Merged schema of one path: how often it occurs, with which types, and what it contains"""
+
+    def __init__(self):
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.children: Dict[str, 'SchemaNode'] = {}
+        self.items: Optional['SchemaNode'] = None
+        self.array_lengths = NumericAggregator()
+        self.pending_lengths: List[int] = []
+
+    def is_leaf(self) -> bool:
+        """Whether the path holds scalar values, and so is profiled as a flattened column"""
+        return bool(_SCALAR_TYPES.intersection(self.types)) or set(self.types) == {'null'}
+
+    def walk(self, value: Any, column: Optional[str], row: Optional[Dict[str, Any]]):
+        """Merge one value into the schema, recording scalar leaves in ``row``"""
+        self.count += 1
+        value_type = json_type(value)
+        self.types[value_type] = self.types.get(value_type, 0) + 1
+        if value_type == 'object':
+            for key, child_value in value.items():
+                child = self.children.get(key)
+                if child is None:
+                    child = self.children[key] = SchemaNode()
+                child.walk(child_value, f"{column}.{key}" if column else key, row)
+        elif value_type == 'array':
+            self.pending_lengths.append(len(value))
+            if self.items is None:
+                self.items = SchemaNode()
+            for element in value:
+                # Array elements are described in the schema but not flattened
+                self.items.walk(element, None, None)
+        elif row is not None:
+            row[column] = value
+
+    def flush(self):
+        """Fold the array lengths collected since the last flush into the running statistics"""
+        if self.pending_lengths:
+            self.array_lengths.update(np.array(self.pending_lengths, dtype=np.int64))
+            self.pending_lengths = []
+        for child in self.children.values():
+            child.flush()
+        if self.items is not None:
+            self.items.flush()
+
+    def template(self) -> 'SchemaNode':
+        """Copy of the structure and known types with all counts reset"""
+        node = SchemaNode()
+        node.types = dict.fromkeys(self.types, 0)
+        node.children = {key: child.template() for key, child in self.children.items()}
+        node.items = self.items.template() if self.items is not None else None
+        return node
+
+    def describe(self, parent_count: Optional[int] = None) -> Dict[str, Any]:
+        """The node's statistics as a JSON-serializable dict"""
+        null_count = self.types.get('null', 0)
+        result = {
+            'count': self.count,
+            'types': {name: count for name, count in self.types.items() if count},
+            'null_percentage': float(null_count / self.count * 100) if self.count else 0.0
+        }
+        if parent_count:
+            result['presence_percentage'] = float(self.count / parent_count * 100)
+        if self.array_lengths.count:
+            result['array_length'] = self.array_lengths.result()
+        objects = self.types.get('object', 0)
+        if self.children:
+            result['fields'] = {key: child.describe(objects) for key, child in self.children.items()}
+        if self.items is not None and self.items.count:
+            result['items'] = self.items.describe()
+        return result
+
+class JsonSchema:
+    """Schema inferred from an iterator of JSON objects, used to flatten them into DataFrames
+
+    Objects are flattened to one column per scalar leaf path, named with dots
+    ("user.address.city"); arrays are summarized in the schema (length
+    statistics and a merged element schema) but not flattened.
+
+    The first batch is inferred by walking every value. Once the tree is
+    known, later batches are flattened column by column along its paths,
+    which only checks that each object's keys and each value's type were
+    seen before; a batch with a new key or type falls back to the walk and
+    extends the tree. Trees are cached per fingerprint of their records'
+    shape (see SchemaCache), so ingesting another file of the same shape
+    skips inference altogether.
+    """
+
+    def __init__(self, root: Optional[SchemaNode] = None, fingerprint: Optional[str] = None, cache_hit: bool = False):
+        self.root = root or SchemaNode()
+        self.fingerprint = fingerprint
+        self.cache_hit = cache_hit
+        self.inferred_batches = 0
+        self._plan: Optional[List[Tuple[Tuple[str, ...], SchemaNode]]] = None
+
+    @classmethod
+    def for_records(cls, records: List[Dict[str, Any]]) -> 'JsonSchema':
+        """Start a schema for records shaped like ``records``, reusing a cached tree when one matches"""
+        fingerprint = schema_fingerprint(records[:config.SCHEMA_FINGERPRINT_RECORDS])
+        template = schema_cache.get(fingerprint)
+        if template is not None:
+            return cls(template.template(), fingerprint, cache_hit=True)
+        return cls(fingerprint=fingerprint)
+
+    def flatten(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Merge a batch of records into the schema and return them as flat rows
+
+        Leaf paths that are null throughout the batch are kept as columns of
+        nulls, so all-null fields are reported; the StreamingProfiler counts
+        such chunks as nulls only, without changing the column's dtype.
+        """
+        columns = self._flatten_along_plan(records) if self.root.count or self.root.children else None
+        if columns is None:
+            rows = []
+            for record in records:
+                row: Dict[str, Any] = {}
+                self.root.walk(record, None, row)
+                rows.append(row)
+            self._plan = None
+            self.inferred_batches += 1
+            df = pd.DataFrame(rows)
+        else:
+            df = pd.DataFrame(columns, index=range(len(records)))
+        self.root.flush()
+        return df
+
+    def finish(self):
+        """Store the schema's structure in the cache for later files of the same shape"""
+        if self.fingerprint is not None and self.root.count:
+            schema_cache.put(self.fingerprint, self.root.template())
+
+    def describe(self) -> Dict[str, Any]:
+        """The merged schema tree for the dataset metadata"""
+        return {
+            'fingerprint': self.fingerprint,
+            'cache_hit': self.cache_hit,
+            'inferred_batches': self.inferred_batches,
+            'record_count': self.root.count,
+            'fields': self.root.describe()['fields'] if self.root.children else {}
+        }
+
+    def _flatten_along_plan(self, records: List[Dict[str, Any]]) -> Optional[Dict[str, List[Any]]]:
+        """Flatten records column by column along the known paths; None if a record does not fit"""
+        if self._plan is None:
+            self._plan = []
+            pending = [((), self.root)]
+            # Breadth first, so a parent's values are extracted before its children's
+            while pending:
+                path, node = pending.pop(0)
+                self._plan.append((path, node))
+                pending.extend((path + (key,), child) for key, child in node.children.items())
+
+        values: Dict[Tuple[str, ...], List[Any]] = {(): records}
+        updates = []
+        for path, node in self._plan:
+            if path:
+                parent = values[path[:-1]]
+                key = path[-1]
+                values[path] = [value.get(key, _MISSING) if type(value) is dict else _MISSING for value in parent]
+            present = [value for value in values[path] if value is not _MISSING]
+            types = Counter(map(type, present))
+            names = Counter()
+            for value_type, count in types.items():
+                name = _TYPE_NAMES.get(value_type, 'string')
+                if name not in node.types:
+                    return None
+                names[name] += count
+            if dict in types:
+                known = node.children.keys()
+                if any(not known >= value.keys() for value in present if type(value) is dict):
+                    return None
+            updates.append((node, len(present), names, present if list in types else None))
+
+        # Every record fits the schema, so the counts can be committed
+        for node, count, names, present in updates:
+            node.count += count
+            for name, type_count in names.items():
+                node.types[name] += type_count
+            if present is not None:
+                for value in present:
+                    if type(value) is list:
+                        node.pending_lengths.append(len(value))
+                        for element in value:
+                            node.items.walk(element, None, None)
+
+        columns = {}
+        for path, node in self._plan:
+            if path and node.is_leaf():
+                columns['.'.join(path)] = [None if value is _MISSING or type(value) in (dict, list) else value for value in values[path]]
+        return columns
+
+class SchemaCache:
+    """Thread-safe LRU cache of schema trees by fingerprint"""
+
+    def __init__(self, size: int = None):
+        self.size = size or config.SCHEMA_CACHE_SIZE
+        self.entries: 'OrderedDict[str, SchemaNode]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[SchemaNode]:
+        with self._lock:
+            node = self.entries.get(fingerprint)
+            if node is not None:
+                self.entries.move_to_end(fingerprint)
+            return node
+
+    def put(self, fingerprint: str, node: SchemaNode):
+        with self._lock:
+            self.entries[fingerprint] = node
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+# Schemas seen by this process
+schema_cache = SchemaCache()
+
+def schema_fingerprint(records: List[Any]) -> str:
+    """Hash of the distinct shapes (keys and value types, recursively) of the given records"""
+    shapes = sorted({_shape(record) for record in records})
+    return hashlib.sha1('\n'.join(shapes).encode('utf-8')).hexdigest()
+
+def _shape(value: Any) -> str:
+    value_type = json_type(value)
+    if value_type == 'object':
+        return '{' + ','.join(f"{key}:{_shape(value[key])}" for key in sorted(value)) + '}'
+    if value_type == 'array':
+        return '[' + '|'.join(sorted({_shape(element) for element in value})) + ']'
+    return value_type
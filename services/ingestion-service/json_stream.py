@@ -0,0 +1,121 @@
+import io
+import re
+import json
+from typing import Any, Dict, Iterator, IO, List, Union
+import config
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+class JsonTextBuffer:
+    """Buffered reader that decodes JSON values from a text stream one at a time
+
+    Values are decoded with ``JSONDecoder.raw_decode`` from a sliding buffer,
+    which is refilled from the stream whenever a value runs past its end. At
+    most one value plus one read is held in memory.
+    """
+
+    def __init__(self, stream: IO[str], read_size: int = None):
+        self.stream = stream
+        self.read_size = read_size or config.JSON_READ_SIZE
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the stream"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._fill(self.read_size):
+                return ''
+
+    def expect(self, character: str):
+        """Consume the next non-whitespace character, which must be ``character``"""
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected {character!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number at the end of the buffer may continue in the next read
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads with the buffered value so long values are not re-parsed too often
+            self._fill(max(self.read_size, len(self.text) - self.pos))
+
+    def rest(self) -> str:
+        """Read everything left in the stream"""
+        remaining = self.text[self.pos:] + self.stream.read()
+        self.text, self.pos, self.eof = '', 0, True
+        return remaining
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+def iter_json_array(buffer: JsonTextBuffer) -> Iterator[Any]:
+    """Yield the elements of the JSON array starting at the buffer's position"""
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        buffer.pos += 1
+        return
+    while True:
+        yield buffer.decode()
+        if buffer.peek() == ']':
+            buffer.pos += 1
+            break
+        buffer.expect(',')
+    if buffer.peek():
+        raise ValueError("Extra data after the top-level array")
+
+def iter_json_lines(stream: IO[str]) -> Iterator[Any]:
+    """Yield the values of a JSON Lines (NDJSON) stream, skipping blank lines"""
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+
+def open_text(file_path: Union[str, IO[bytes]]) -> IO[str]:
+    """Open a path, or wrap a binary stream, as UTF-8 text"""
+    if isinstance(file_path, (str, bytes)) or hasattr(file_path, '__fspath__'):
+        return open(file_path, 'r', encoding='utf-8')
+    return io.TextIOWrapper(file_path, encoding='utf-8')
+
+def batches(values: Iterator[Any], size: int = None) -> Iterator[List[Any]]:
+    """Group values into lists of at most ``size`` (defaults to JSON_CHUNK_SIZE)"""
+    size = size or config.JSON_CHUNK_SIZE
+    batch: List[Any] = []
+    for value in values:
+        batch.append(value)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def require_objects(values: Iterator[Any]) -> Iterator[Dict[str, Any]]:
+    """Pass through JSON objects, raising on the first element that is not one"""
+    for index, value in enumerate(values):
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected an object at element {index}, found {type(value).__name__}")
+        yield value
@@ -1,9 +1,12 @@
 import os
+import re
 import json
 import uuid
+import asyncio
+import hashlib
 import time
 import logging
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Depends, BackgroundTasks
+from fastapi import FastAPI, Request, HTTPException, Query, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, select
@@ -15,9 +18,12 @@ from datetime import datetime
 import config
 from database import Dataset, init_db, engine
 from storage import StorageClient
-from processor import DataProcessor
 from service import IngestionService
-from schemas import DatasetResponse, DatasetList, HealthCheckResponse, ErrorResponse
+from jobs import JobQueue
+from executors import get_execution_layer
+from registry import get_handler, registered_types, supports
+from uploads import FormUpload
+from schemas import DatasetResponse, DatasetList, DatasetPreview, HealthCheckResponse, ErrorResponse, JobResponse, JobProgress
 
 # Configure logging
 logging.basicConfig(
@@ -41,8 +47,15 @@ init_db()
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Initialize service
-ingestion_service = IngestionService()
+# Initialize execution pools and service
+execution = get_execution_layer()
+ingestion_service = IngestionService(execution)
+
+# Initialize ingestion job queue; jobs run in the execution layer's CPU pool once the app starts
+job_queue = JobQueue(execution=execution)
+
+# Streamed ingestions still profiling after their upload's response was sent
+_streaming_tasks = set()
 
 # Record start time for uptime calculation
 start_time = time.time()
@@ -56,6 +69,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def start_job_workers():
+    job_queue.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    job_queue.shutdown()
+    execution.shutdown()
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -80,7 +102,7 @@ async def health_check(db: Session = Depends(get_db)):
     db_connection = True
     try:
         # Execute a simple query to check database connection
-        db.execute(select(1)).scalar_one()
+        await execution.run_io(lambda: db.execute(select(1)).scalar_one())
     except Exception as e:
         logger.error(f"Database connection error: {str(e)}")
         db_connection = False
@@ -89,7 +111,7 @@ async def health_check(db: Session = Depends(get_db)):
     storage_connection = True
     try:
         # Try to list buckets to check storage connection
-        ingestion_service.storage_client._ensure_bucket_exists()
+        await execution.run_io(ingestion_service.storage_client._ensure_bucket_exists)
     except Exception as e:
         logger.error(f"Storage connection error: {str(e)}")
         storage_connection = False
@@ -102,97 +124,246 @@ async def health_check(db: Session = Depends(get_db)):
         "storage_connection": storage_connection,
     }
 
-@app.post("/upload", response_model=DatasetResponse, responses={413: {"model": ErrorResponse}, 415: {"model": ErrorResponse}})
+# The body is parsed by FormUpload rather than declared as a form parameter, so its schema is given here
+UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+                "required": ["file"]
+            }
+        }
+    }
+}
+
+@app.post("/upload", response_model=JobResponse, status_code=202, openapi_extra={"requestBody": UPLOAD_REQUEST_BODY},
+          responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 415: {"model": ErrorResponse}, 422: {"model": ErrorResponse}})
 async def upload_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
+    request: Request,
+    content_sha256: Optional[str] = Header(None, alias="X-Content-SHA256", description="SHA-256 hex digest of the file, to skip ingesting known content"),
     db: Session = Depends(get_db)
 ):
     """Upload a dataset file for AI readiness assessment
     
     This endpoint accepts file uploads for assessment. It validates the file type and size,
-    extracts metadata, and stores the file in object storage.
+    extracts metadata, and stores the file in object storage. Files whose content matches an
+    existing dataset return a completed job for that dataset; with an X-Content-SHA256 header
+    the match is found before the file is read, and the file must match the header.
+    
+    The multipart body is read as it arrives rather than spooled to disk first. Types in
+    STREAMING_UPLOAD_TYPES are sent to storage and the profiler (with sketch-based statistics,
+    whatever their size) chunk by chunk without a temp file; the response is a running job,
+    returned once the body is received, while profiling finishes. Other types need random
+    access, so they are saved to a temp file and queued for the ingestion workers. Poll
+    /jobs/{job_id} for the resulting dataset ID.
     """
-    # Validate file size
-    file_size = 0
-    temp_file_path = config.TEMP_UPLOAD_DIR / f"{uuid.uuid4()}_{file.filename}"
+    upload = FormUpload(request)
+    await upload.open()
+    filename = upload.filename
+    
+    # Validate file type
+    file_ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    content_type = upload.content_type
+    
+    # The extension takes precedence, so e.g. .jsonl sent as application/json stays jsonl
+    valid_type = file_ext in config.SUPPORTED_FILE_TYPES
+    if not valid_type:
+        for supported_ext, mime_types in config.SUPPORTED_FILE_TYPES.items():
+            if content_type in mime_types:
+                valid_type = True
+                file_ext = supported_ext  # Normalize extension
+                break
+    
+    if not valid_type:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported file type. Supported types: {', '.join(config.SUPPORTED_FILE_TYPES.keys())}"
+        )
+    
+    if content_sha256 is not None:
+        content_sha256 = content_sha256.strip().lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", content_sha256):
+            raise HTTPException(status_code=400, detail="X-Content-SHA256 must be a hex-encoded SHA-256 digest")
+    
+    if content_sha256 is not None:
+        # Known content is not saved, profiled or uploaded again
+        existing = await execution.run_io(ingestion_service.find_by_hash, content_sha256, db)
+        if existing is not None:
+            job = await execution.run_io(
+                job_queue.record_completed,
+                storage_filename=existing.file_path,
+                original_filename=filename,
+                file_size=existing.file_size,
+                file_type=file_ext,
+                dataset_id=existing.id
+            )
+            return _job_response(job)
+    
+    if file_ext in config.STREAMING_UPLOAD_TYPES and supports(file_ext, "streaming"):
+        return await _stream_upload(upload, file_ext, content_sha256)
+    
+    temp_file_path = config.TEMP_UPLOAD_DIR / f"{uuid.uuid4()}_{filename}"
     
     # Ensure temp directory exists
     os.makedirs(config.TEMP_UPLOAD_DIR, exist_ok=True)
     
-    # Save uploaded file temporarily
+    # Save uploaded file temporarily, hashing it on the way
+    hasher = hashlib.sha256()
     try:
         with open(temp_file_path, "wb") as buffer:
             # Read and write the file in chunks to avoid memory issues
-            while chunk := await file.read(1024 * 1024):  # 1MB chunks
-                file_size += len(chunk)
-                if file_size > config.MAX_UPLOAD_SIZE:
-                    # Clean up the temp file
-                    if os.path.exists(temp_file_path):
-                        os.remove(temp_file_path)
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"File too large. Maximum size is {config.MAX_UPLOAD_SIZE/(1024*1024)}MB"
-                    )
-                buffer.write(chunk)
+            async for chunk in upload.chunks():
+                await asyncio.gather(
+                    execution.run_io(buffer.write, chunk),
+                    execution.run_io(hasher.update, chunk)
+                )
     except Exception as e:
-        logger.error(f"Error saving uploaded file: {str(e)}")
         if os.path.exists(temp_file_path):
             os.remove(temp_file_path)
+        if isinstance(e, HTTPException):
+            raise
+        logger.error(f"Error saving uploaded file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error saving uploaded file: {str(e)}")
     
-    # Validate file type
-    file_ext = os.path.splitext(file.filename)[1].lower().lstrip(".")
-    content_type = file.content_type
-    
-    valid_type = False
-    for supported_ext, mime_types in config.SUPPORTED_FILE_TYPES.items():
-        if file_ext == supported_ext or content_type in mime_types:
-            valid_type = True
-            file_ext = supported_ext  # Normalize extension
-            break
-    
-    if not valid_type:
-        # Clean up the temp file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        raise HTTPException(
-            status_code=415,
-            detail=f"Unsupported file type. Supported types: {', '.join(config.SUPPORTED_FILE_TYPES.keys())}"
-        )
+    content_hash = hasher.hexdigest()
+    if content_sha256 is not None and content_hash != content_sha256:
+        os.remove(temp_file_path)
+        raise HTTPException(status_code=400, detail=f"Content of {filename} does not match its declared SHA-256")
     
     try:
-        # Process the file using the service
-        dataset_id, metadata = await ingestion_service.process_file(
+        # Identical content reuses the existing dataset without profiling or uploading
+        existing = await execution.run_io(ingestion_service.find_by_hash, content_hash, db)
+        if existing is not None:
+            os.remove(temp_file_path)
+            job = await execution.run_io(
+                job_queue.record_completed,
+                storage_filename=existing.file_path,
+                original_filename=filename,
+                file_size=upload.size,
+                file_type=file_ext,
+                dataset_id=existing.id
+            )
+            return _job_response(job)
+        
+        # Queue the file for metadata extraction and storage by the job workers
+        job = await execution.run_io(
+            job_queue.enqueue,
             file_path=str(temp_file_path),
-            original_filename=file.filename,
-            file_size=file_size,
+            original_filename=filename,
+            file_size=upload.size,
             file_type=file_ext,
-            db=db
+            content_hash=content_hash
         )
-        
-        # Add task to remove temporary file
-        background_tasks.add_task(os.remove, temp_file_path)
-        
-        # Get the dataset from the database
-        dataset = ingestion_service.get_dataset(dataset_id, db)
-        
-        # Return the response
-        return {
-            "id": dataset.id,
-            "name": dataset.name,
-            "file_type": dataset.file_type,
-            "file_size": dataset.file_size,
-            "file_path": dataset.file_path,
-            "created_at": dataset.created_at,
-            "metadata": dataset.metadata
-        }
+        return _job_response(job)
     except Exception as e:
-        logger.error(f"Error processing file: {str(e)}")
+        logger.error(f"Error queueing file: {str(e)}")
         # Clean up the temp file
         if os.path.exists(temp_file_path):
             os.remove(temp_file_path)
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error queueing file: {str(e)}")
+
+async def _stream_upload(upload: FormUpload, file_type: str, content_hash: Optional[str]):
+    """Ingest an upload chunk by chunk as its body arrives, returning its running job
+    
+    The body can only be read before the response is sent, so the request lasts
+    until the file has been received; profiling, the Parquet copy and saving the
+    dataset continue after the response. Errors reading the body (a file too
+    large or a malformed body) fail the request as well as the job.
+    """
+    job = await execution.run_io(job_queue.record_running, original_filename=upload.filename, file_size=0, file_type=file_type)
+    received = asyncio.Event()
+    
+    async def chunks():
+        async for chunk in upload.chunks():
+            yield chunk
+        received.set()
+    
+    task = asyncio.create_task(_ingest_streamed(job.id, chunks(), upload.filename, file_type, content_hash))
+    _streaming_tasks.add(task)
+    task.add_done_callback(_streaming_tasks.discard)
+    waiter = asyncio.create_task(received.wait())
+    await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    waiter.cancel()
+    if task.done() and task.exception() is not None:
+        raise task.exception()
+    return _job_response(await execution.run_io(job_queue.get, job.id))
+
+async def _ingest_streamed(job_id: str, chunks, original_filename: str, file_type: str, content_hash: Optional[str]):
+    """Run a streamed ingestion as the given running job, with a session of its own
+    
+    Failures are recorded on the job; HTTP errors from reading the body are also re-raised.
+    """
+    db = SessionLocal()
+    try:
+        with job_queue.heartbeat(job_id):
+            dataset_id, _ = await ingestion_service.ingest_stream(
+                chunks, original_filename, file_type, db, content_hash=content_hash,
+                progress=lambda percentage, stage: job_queue.report(job_id, percentage, stage)
+            )
+        dataset = await execution.run_io(ingestion_service.get_dataset, dataset_id, db)
+        await execution.run_io(job_queue.finish, job_id, storage_filename=dataset.file_path, dataset_id=dataset_id, file_size=dataset.file_size)
+    except Exception as e:
+        error = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Error processing file: {error}")
+        await execution.run_io(job_queue.finish, job_id, error=error)
+        if isinstance(e, HTTPException):
+            raise
+    finally:
+        await execution.run_io(db.close)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse, responses={404: {"model": ErrorResponse}})
+async def get_job(job_id: str):
+    """Get ingestion job status by ID
+    
+    This endpoint reports the status of an upload's ingestion job, including the
+    dataset ID once the job has completed or the error if it failed.
+    """
+    job = await execution.run_io(job_queue.get, job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job with ID {job_id} not found"
+        )
+    
+    return _job_response(job)
+
+@app.get("/jobs/{job_id}/progress", response_model=JobProgress, responses={404: {"model": ErrorResponse}})
+async def get_job_progress(job_id: str):
+    """Get ingestion job progress by ID
+    
+    This endpoint returns only the status, percentage and pipeline stage of a job.
+    """
+    job = await execution.run_io(job_queue.get, job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job with ID {job_id} not found"
+        )
+    
+    return _job_response(job)["progress"]
+
+def _job_response(job):
+    """Build the response body for an ingestion job"""
+    return {
+        "id": job.id,
+        "status": job.status,
+        "progress": {
+            "status": job.status,
+            "percentage": job.progress,
+            "stage": job.stage
+        },
+        "name": job.original_filename,
+        "file_type": job.file_type,
+        "file_size": job.file_size,
+        "dataset_id": job.dataset_id,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
 
 @app.get("/datasets/{dataset_id}", response_model=DatasetResponse, responses={404: {"model": ErrorResponse}})
 async def get_dataset(dataset_id: int, db: Session = Depends(get_db)):
@@ -200,7 +371,7 @@ async def get_dataset(dataset_id: int, db: Session = Depends(get_db)):
     
     This endpoint retrieves the details of a specific dataset by its ID.
     """
-    dataset = ingestion_service.get_dataset(dataset_id, db)
+    dataset = await execution.run_io(ingestion_service.get_dataset, dataset_id, db)
     
     if not dataset:
         raise HTTPException(
@@ -215,20 +386,61 @@ async def get_dataset(dataset_id: int, db: Session = Depends(get_db)):
         "file_size": dataset.file_size,
         "file_path": dataset.file_path,
         "created_at": dataset.created_at,
-        "metadata": dataset.metadata
+        "metadata": dataset.metadata_,
+        "parquet_path": dataset.parquet_path
     }
 
+@app.get("/datasets/{dataset_id}/preview", response_model=DatasetPreview, responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}})
+async def preview_dataset(
+    dataset_id: int,
+    columns: Optional[str] = Query(None, description="Comma-separated columns to include (defaults to all)"),
+    limit: int = Query(20, ge=1, le=1000, description="Maximum number of rows to return"),
+    db: Session = Depends(get_db)
+):
+    """Preview the first rows of a dataset
+    
+    This endpoint reads only the requested columns from the dataset's Parquet copy,
+    which tabular datasets (csv, json, jsonl) get at ingestion.
+    """
+    dataset = await execution.run_io(ingestion_service.get_dataset, dataset_id, db)
+    
+    if not dataset:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset with ID {dataset_id} not found"
+        )
+    if not dataset.parquet_path:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset with ID {dataset_id} has no columnar copy to preview"
+        )
+    
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
+    try:
+        return await execution.run_io(ingestion_service.preview_dataset, dataset, selected, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+
 @app.get("/datasets", response_model=DatasetList)
 async def list_datasets(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (prefer cursor for deep pages)"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_metadata: bool = Query(False, description="Include each dataset's metadata"),
+    count: str = Query("exact", regex="^(exact|estimated|none)$", description="How to compute total: exact, estimated or none"),
     db: Session = Depends(get_db)
 ):
     """List all datasets with pagination
     
-    This endpoint retrieves a paginated list of all datasets.
+    This endpoint retrieves a page of datasets, newest first. Follow next_cursor
+    to get the next page; metadata is only included when requested.
     """
-    datasets, total = ingestion_service.list_datasets(skip, limit, db)
+    try:
+        datasets, total, next_cursor = await execution.run_io(
+            ingestion_service.list_datasets, skip, limit, db, cursor, include_metadata, count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "datasets": [
@@ -239,13 +451,40 @@ async def list_datasets(
                 "file_size": dataset.file_size,
                 "file_path": dataset.file_path,
                 "created_at": dataset.created_at,
-                "metadata": dataset.metadata
+                "metadata": dataset.metadata_ if include_metadata else None,
+                "parquet_path": dataset.parquet_path
             }
             for dataset in datasets
         ],
         "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit
+        "total_estimated": count == "estimated",
+        "page": skip // limit + 1 if cursor is None else None,
+        "page_size": limit,
+        "next_cursor": next_cursor
+    }
+
+@app.get("/metrics/executors", response_model=dict)
+async def executor_metrics():
+    """Execution pool metrics
+    
+    This endpoint reports the size, activity and queue depth of each worker pool.
+    """
+    return execution.metrics()
+
+@app.get("/formats", response_model=dict)
+async def list_formats():
+    """Supported file formats
+    
+    This endpoint reports the MIME types and capabilities of each registered format,
+    and whether its processor has been loaded yet.
+    """
+    return {
+        file_type: {
+            "mime_types": config.SUPPORTED_FILE_TYPES.get(file_type, []),
+            "capabilities": get_handler(file_type).capabilities(),
+            "loaded": get_handler(file_type).loaded
+        }
+        for file_type in registered_types()
     }
 
 @app.delete("/datasets/{dataset_id}", response_model=dict, responses={404: {"model": ErrorResponse}})
@@ -255,7 +494,7 @@ async def delete_dataset(dataset_id: int, db: Session = Depends(get_db)):
     This endpoint deletes a dataset and its associated file from storage.
     """
     # Get the dataset
-    dataset = ingestion_service.get_dataset(dataset_id, db)
+    dataset = await execution.run_io(ingestion_service.get_dataset, dataset_id, db)
     
     if not dataset:
         raise HTTPException(
@@ -264,20 +503,12 @@ async def delete_dataset(dataset_id: int, db: Session = Depends(get_db)):
         )
     
     try:
-        # Delete the file from storage
-        ingestion_service.storage_client.client.delete_object(
-            Bucket=config.DATASET_BUCKET,
-            Key=dataset.file_path
-        )
-        
-        # Delete the dataset from the database
-        db.delete(dataset)
-        db.commit()
+        # Delete the file from storage and the dataset from the database
+        await execution.run_io(ingestion_service.delete_dataset, dataset, db)
         
         return {"message": f"Dataset with ID {dataset_id} successfully deleted"}
     except Exception as e:
         logger.error(f"Error deleting dataset: {str(e)}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting dataset: {str(e)}")
 
 # Run the application
@@ -0,0 +1,90 @@
+import io
+import queue
+import threading
+from typing import Dict, Any, Callable, IO, Optional
+import config
+
+class ChunkStream(io.RawIOBase):
+    """Read-only byte stream fed with chunks from another thread
+
+    Holds at most ``max_chunks`` unread chunks; ``feed`` blocks when the
+    reader falls behind, and silently drops chunks once the reader has stopped.
+    """
+
+    def __init__(self, max_chunks: int):
+        super().__init__()
+        self.chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self.current = memoryview(b'')
+        self.eof = False
+        self.reader_done = threading.Event()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.current:
+            if self.eof:
+                return 0
+            chunk = self.chunks.get()
+            if chunk is None:
+                self.eof = True
+                return 0
+            self.current = memoryview(chunk)
+        size = min(len(buffer), len(self.current))
+        buffer[:size] = self.current[:size]
+        self.current = self.current[size:]
+        return size
+
+    def feed(self, chunk: Optional[bytes]):
+        """Queue the next chunk, or None to signal the end of the stream"""
+        while not self.reader_done.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+class IncrementalProfiler:
+    """Runs a stream profiler in a background thread over bytes fed as they arrive
+
+    Used to profile an upload while it is streamed to storage, so the file
+    never has to be written to and re-read from disk.
+    """
+
+    def __init__(self, profile: Callable[[IO[bytes]], Dict[str, Any]], max_chunks: int = None):
+        """Start profiling
+
+        Args:
+            profile: Function building metadata from a binary file-like object
+            max_chunks: Chunks buffered ahead of the profiler (defaults to STREAM_PROFILER_BUFFER)
+        """
+        self.stream = ChunkStream(max_chunks or config.STREAM_PROFILER_BUFFER)
+        self.profile = profile
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, name="stream-profiler", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            self.result = self.profile(io.BufferedReader(self.stream))
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.stream.reader_done.set()
+
+    def feed(self, chunk: bytes):
+        """Pass the next chunk of the file to the profiler"""
+        self.stream.feed(chunk)
+
+    def close(self) -> Dict[str, Any]:
+        """Signal the end of the file and wait for the metadata"""
+        self.stream.feed(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def cancel(self):
+        """Stop profiling without waiting for a result"""
+        self.stream.feed(None)
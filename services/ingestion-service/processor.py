@@ -1,34 +1,87 @@
-import pandas as pd
-import numpy as np
 import json
 import os
-from typing import Dict, Any, List, Optional
+import itertools
+from typing import Dict, Any, List, Optional, Union, IO, TYPE_CHECKING
 import config
+from json_stream import JsonTextBuffer, iter_json_array, iter_json_lines, open_text, batches, require_objects
+from csv_dialect import detect_dialect
+
+# pandas, NumPy, Arrow and the profilers built on them are imported by the
+# methods that use them, so loading one format's handler (see registry) only
+# imports that format's dependencies
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+# Marks an empty top-level array
+_EMPTY = object()
+
+def _json_value(value: Any) -> Any:
+    """Arrow scalars as JSON-serializable values: dates, times, decimals and binary become strings"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_value(item) for item in value]
+    return str(value)
 
 class DataProcessor:
     """Class for processing different types of datasets"""
     
     @staticmethod
-    def process_csv(file_path: str) -> Dict[str, Any]:
+    def process_csv(file_path: Union[str, IO[bytes]], streaming: Optional[bool] = None) -> Dict[str, Any]:
         """Process a CSV file and extract metadata
         
         Args:
-            file_path: Path to the CSV file
+            file_path: Path to the CSV file, or a binary stream of it (requires streaming=True)
+            streaming: Profile the file in chunks of CSV_CHUNK_SIZE rows instead of
+                loading it whole. Defaults to streaming files larger than
+                STREAMING_PROFILE_THRESHOLD. Whole files are read with compact
+                dtypes inferred by a pre-pass (see csv_reader.read_csv).
+                The delimiter, quoting, header and encoding are detected from
+                the first CSV_SNIFF_BYTES bytes (see csv_dialect).
             
         Returns:
-            Dict containing metadata about the CSV file
+            Dict containing metadata about the CSV file, including the
+            memory held by the DataFrame (or by the largest chunk)
         """
+        import pandas as pd
+        from aggregators import StreamingProfiler
+        from csv_reader import read_csv, memory_usage
+        
         try:
-            # Read the CSV file
-            df = pd.read_csv(file_path)
+            if streaming is None:
+                streaming = os.path.getsize(file_path) > config.STREAMING_PROFILE_THRESHOLD
+            dialect, source = detect_dialect(file_path)
+            options = dialect.read_options()
             
-            # Extract basic metadata
-            metadata = DataProcessor._extract_dataframe_metadata(df)
+            if streaming:
+                # Merge running aggregates chunk by chunk so memory stays flat
+                profiler = StreamingProfiler()
+                peak_chunk_bytes = 0
+                for chunk in pd.read_csv(source, chunksize=config.CSV_CHUNK_SIZE, **options):
+                    profiler.update(chunk)
+                    peak_chunk_bytes = max(peak_chunk_bytes, int(chunk.memory_usage(deep=True, index=False).sum()))
+                metadata = profiler.result()
+                metadata['memory_usage'] = {'peak_chunk_bytes': peak_chunk_bytes}
+            else:
+                # Read the CSV file with compact dtypes
+                df = read_csv(source, **options)
+                
+                # Extract basic metadata
+                metadata = DataProcessor._extract_dataframe_metadata(df)
+                metadata['memory_usage'] = memory_usage(df, file_path)
             metadata['format'] = 'csv'
+            metadata['profiling_mode'] = 'streaming' if streaming else 'in_memory'
             
             # Add CSV-specific metadata
-            metadata['delimiter'] = ','  # Assuming standard CSV
-            metadata['has_header'] = True  # Assuming header is present
+            metadata['delimiter'] = dialect.delimiter
+            metadata['has_header'] = dialect.has_header
+            metadata['dialect'] = dialect.describe()
             
             return metadata
         except Exception as e:
@@ -39,58 +92,33 @@ class DataProcessor:
             }
     
     @staticmethod
-    def process_json(file_path: str) -> Dict[str, Any]:
+    def process_json(file_path: Union[str, IO[bytes]], streaming: Optional[bool] = None) -> Dict[str, Any]:
         """Process a JSON file and extract metadata
         
         Args:
-            file_path: Path to the JSON file
+            file_path: Path to the JSON file, or a binary stream of it (requires streaming=True)
+            streaming: Parse top-level arrays element by element and profile them in
+                batches of JSON_CHUNK_SIZE instead of loading the file whole. Defaults
+                to streaming files larger than STREAMING_PROFILE_THRESHOLD.
             
         Returns:
             Dict containing metadata about the JSON file
         """
         try:
-            # Read the JSON file
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Determine structure type
-            if isinstance(data, list):
-                # JSON array of objects
-                if len(data) > 0 and isinstance(data[0], dict):
-                    # Convert to DataFrame for consistent processing
-                    df = pd.DataFrame(data)
-                    metadata = DataProcessor._extract_dataframe_metadata(df)
-                    metadata['structure'] = 'array_of_objects'
-                    metadata['item_count'] = len(data)
-                else:
-                    # Array of values
-                    metadata = {
-                        'structure': 'array_of_values',
-                        'row_count': len(data),
-                        'column_count': 1,
-                        'columns': ['value'],
-                        'data_types': {'value': type(data[0]).__name__ if len(data) > 0 else 'unknown'},
-                        'sample_data': data[:5] if len(data) > 0 else []
-                    }
-            elif isinstance(data, dict):
-                # Single JSON object
-                # Convert to DataFrame for consistent processing
-                df = pd.DataFrame([data])
-                metadata = DataProcessor._extract_dataframe_metadata(df)
-                metadata['structure'] = 'object'
-                metadata['key_count'] = len(data.keys())
+            if streaming is None:
+                streaming = os.path.getsize(file_path) > config.STREAMING_PROFILE_THRESHOLD
+            
+            if streaming:
+                with open_text(file_path) as f:
+                    metadata = DataProcessor._profile_json_stream(f)
             else:
-                # Single value
-                metadata = {
-                    'structure': 'value',
-                    'row_count': 1,
-                    'column_count': 1,
-                    'columns': ['value'],
-                    'data_types': {'value': type(data).__name__},
-                    'sample_data': [data]
-                }
+                # Read the JSON file
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                metadata = DataProcessor._extract_json_metadata(data)
             
             metadata['format'] = 'json'
+            metadata['profiling_mode'] = 'streaming' if streaming else 'in_memory'
             return metadata
         except Exception as e:
             return {
@@ -99,6 +127,164 @@ class DataProcessor:
                 'processing_status': 'failed'
             }
     
+    @staticmethod
+    def process_jsonl(file_path: Union[str, IO[bytes]], streaming: Optional[bool] = None) -> Dict[str, Any]:
+        """Process a JSON Lines (NDJSON) file of objects and extract metadata
+        
+        Args:
+            file_path: Path to the JSON Lines file, or a binary stream of it (requires streaming=True)
+            streaming: Profile the records in batches of JSON_CHUNK_SIZE instead of
+                loading them whole. Defaults to streaming files larger than
+                STREAMING_PROFILE_THRESHOLD.
+            
+        Returns:
+            Dict containing metadata about the JSON Lines file
+        """
+        try:
+            if streaming is None:
+                streaming = os.path.getsize(file_path) > config.STREAMING_PROFILE_THRESHOLD
+            
+            with open_text(file_path) as f:
+                records = require_objects(iter_json_lines(f))
+                if streaming:
+                    metadata = DataProcessor._profile_records(records)
+                else:
+                    metadata = DataProcessor._extract_records_metadata(list(records))
+            
+            metadata['structure'] = 'records'
+            metadata['format'] = 'jsonl'
+            metadata['profiling_mode'] = 'streaming' if streaming else 'in_memory'
+            return metadata
+        except Exception as e:
+            return {
+                'error': str(e),
+                'format': 'jsonl',
+                'processing_status': 'failed'
+            }
+    
+    @staticmethod
+    def _extract_json_metadata(data: Any) -> Dict[str, Any]:
+        """Extract metadata from a parsed JSON document
+        
+        Args:
+            data: The decoded JSON value
+            
+        Returns:
+            Dict containing metadata about the document
+        """
+        # Determine structure type
+        if isinstance(data, list):
+            # JSON array of objects
+            if len(data) > 0 and isinstance(data[0], dict):
+                # Flatten nested objects into one column per leaf path
+                metadata = DataProcessor._extract_records_metadata(list(require_objects(data)))
+                metadata['structure'] = 'array_of_objects'
+                metadata['item_count'] = len(data)
+            else:
+                # Array of values
+                metadata = {
+                    'structure': 'array_of_values',
+                    'row_count': len(data),
+                    'column_count': 1,
+                    'columns': ['value'],
+                    'data_types': {'value': type(data[0]).__name__ if len(data) > 0 else 'unknown'},
+                    'sample_data': data[:5] if len(data) > 0 else []
+                }
+        elif isinstance(data, dict):
+            # Single JSON object
+            # Flatten nested objects into one column per leaf path
+            metadata = DataProcessor._extract_records_metadata([data])
+            metadata['structure'] = 'object'
+            metadata['key_count'] = len(data.keys())
+        else:
+            # Single value
+            metadata = {
+                'structure': 'value',
+                'row_count': 1,
+                'column_count': 1,
+                'columns': ['value'],
+                'data_types': {'value': type(data).__name__},
+                'sample_data': [data]
+            }
+        
+        return metadata
+    
+    @staticmethod
+    def _profile_json_stream(f: IO[str]) -> Dict[str, Any]:
+        """Profile a JSON document from a text stream without loading top-level arrays whole
+        
+        Args:
+            f: Text stream of the JSON document
+            
+        Returns:
+            Dict containing metadata about the document
+        """
+        buffer = JsonTextBuffer(f)
+        if buffer.peek() != '[':
+            # Objects and scalar values are a single row, so they are parsed whole
+            return DataProcessor._extract_json_metadata(json.loads(buffer.rest()))
+        
+        elements = iter_json_array(buffer)
+        first = next(elements, _EMPTY)
+        if isinstance(first, dict):
+            metadata = DataProcessor._profile_records(itertools.chain([first], elements))
+            metadata['structure'] = 'array_of_objects'
+            metadata['item_count'] = metadata['row_count']
+            return metadata
+        
+        # Array of values: only the count and a sample are kept
+        sample, count = [], 0
+        if first is not _EMPTY:
+            for value in itertools.chain([first], elements):
+                count += 1
+                if len(sample) < 5:
+                    sample.append(value)
+        return {
+            'structure': 'array_of_values',
+            'row_count': count,
+            'column_count': 1,
+            'columns': ['value'],
+            'data_types': {'value': type(first).__name__ if count > 0 else 'unknown'},
+            'sample_data': sample
+        }
+    
+    @staticmethod
+    def _extract_records_metadata(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extract metadata from JSON objects held in memory
+        
+        Args:
+            records: The decoded objects
+            
+        Returns:
+            Dict containing metadata about the flattened records and their schema
+        """
+        from json_schema import JsonSchema
+        
+        schema = JsonSchema.for_records(records)
+        df = schema.flatten(records)
+        schema.finish()
+        metadata = DataProcessor._extract_dataframe_metadata(df)
+        metadata['schema'] = schema.describe()
+        return metadata
+    
+    @staticmethod
+    def _profile_records(records) -> Dict[str, Any]:
+        """Profile an iterator of JSON objects in batches with the StreamingProfiler"""
+        from aggregators import StreamingProfiler
+        from json_schema import JsonSchema
+        
+        profiler = StreamingProfiler()
+        schema = None
+        for batch in batches(require_objects(records)):
+            if schema is None:
+                schema = JsonSchema.for_records(batch)
+            profiler.update(schema.flatten(batch))
+        metadata = profiler.result()
+        if schema is not None:
+            schema.finish()
+            metadata['schema'] = schema.describe()
+        return metadata
+    
     @staticmethod
     def process_txt(file_path: str) -> Dict[str, Any]:
         """Process a text file and extract metadata
@@ -109,21 +295,23 @@ class DataProcessor:
         Returns:
             Dict containing metadata about the text file
         """
+        from text_profiler import profile_text_file
+        
         try:
-            # Read the text file
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
+            # Measure line lengths over a memory map instead of reading the lines into memory
+            profile = profile_text_file(file_path)
             
             # Extract metadata
             metadata = {
                 'format': 'txt',
-                'row_count': len(lines),
+                'row_count': len(profile['line_lengths']),
                 'column_count': 1,
                 'columns': ['text'],
                 'data_types': {'text': 'string'},
-                'sample_data': [{'text': line.strip()} for line in lines[:5]],
-                'line_length_stats': DataProcessor._calculate_line_stats(lines),
-                'estimated_tokens': DataProcessor._estimate_tokens(lines)
+                'sample_data': [{'text': line} for line in profile['sample_lines']],
+                'line_length_stats': DataProcessor._calculate_line_stats(profile['line_lengths']),
+                'length_histogram': DataProcessor._length_histogram(profile['line_lengths']),
+                'estimated_tokens': DataProcessor._estimate_tokens(profile['characters'])
             }
             
             return metadata
@@ -135,15 +323,176 @@ class DataProcessor:
             }
     
     @staticmethod
-    def _extract_dataframe_metadata(df: pd.DataFrame) -> Dict[str, Any]:
+    def process_parquet(file_path: str) -> Dict[str, Any]:
+        """Process a Parquet file and extract metadata from its footer
+        
+        Row counts, null counts and min/max values come from the row group
+        statistics in the footer, so only the footer and the first rows (for
+        the sample) are read, however large the file is. Statistics the writer
+        did not record are reported as None.
+        
+        Args:
+            file_path: Path to the Parquet file
+            
+        Returns:
+            Dict containing metadata about the Parquet file
+        """
+        import pyarrow.parquet as pq
+        
+        try:
+            with pq.ParquetFile(file_path, memory_map=True) as parquet_file:
+                metadata = DataProcessor._extract_parquet_metadata(parquet_file)
+            metadata['format'] = 'parquet'
+            metadata['profiling_mode'] = 'footer'
+            return metadata
+        except Exception as e:
+            return {
+                'error': str(e),
+                'format': 'parquet',
+                'processing_status': 'failed'
+            }
+    
+    @staticmethod
+    def _extract_parquet_metadata(parquet_file: 'pq.ParquetFile') -> Dict[str, Any]:
+        """Extract metadata from the footer of a Parquet file
+        
+        Args:
+            parquet_file: Opened Parquet file
+            
+        Returns:
+            Dict containing metadata about the file, with one statistics
+            block per leaf column (nested columns are named with dots)
+        """
+        footer = parquet_file.metadata
+        row_count = footer.num_rows
+        dtypes = parquet_file.schema_arrow.empty_table().to_pandas().dtypes
+        first_batch = next(parquet_file.iter_batches(batch_size=5), None)
+        
+        metadata = {
+            'row_count': row_count,
+            'column_count': len(dtypes),
+            'columns': dtypes.index.tolist(),
+            'data_types': {col: str(dtype) for col, dtype in dtypes.items()},
+            'sample_data': [{key: _json_value(value) for key, value in row.items()} for row in first_batch.to_pylist()] if first_batch is not None else [],
+            'statistics': {},
+            'row_groups': footer.num_row_groups,
+            'created_by': footer.created_by
+        }
+        
+        total_nulls = 0
+        columns_with_nulls = 0
+        for index in range(footer.num_columns):
+            row_groups = []
+            ranges = []
+            for group in range(footer.num_row_groups):
+                chunk = footer.row_group(group).column(index)
+                stats = chunk.statistics
+                low, high = (stats.min, stats.max) if stats is not None and stats.has_min_max else (None, None)
+                if footer.row_group(group).num_rows:
+                    ranges.append((low, high))
+                row_groups.append({
+                    'row_count': footer.row_group(group).num_rows,
+                    'null_count': stats.null_count if stats is not None and stats.has_null_count else None,
+                    'min': _json_value(low),
+                    'max': _json_value(high)
+                })
+            
+            null_counts = [group['null_count'] for group in row_groups]
+            null_count = sum(null_counts) if None not in null_counts else None
+            # min/max of the whole column only when every non-empty row group has them; the
+            # values are compared as decoded (decimals, dates) before they become strings
+            known = bool(ranges) and all(low is not None for low, _ in ranges)
+            try:
+                minimum = _json_value(min(low for low, _ in ranges)) if known else None
+                maximum = _json_value(max(high for _, high in ranges)) if known else None
+            except TypeError:
+                minimum = maximum = None
+            
+            null_percentage = None
+            if null_count is not None:
+                total_nulls += null_count
+                columns_with_nulls += null_count > 0
+                null_percentage = float(null_count / row_count * 100) if row_count else 0.0
+            metadata['statistics'][footer.schema.column(index).path] = {
+                'min': minimum,
+                'max': maximum,
+                'null_count': null_count,
+                'null_percentage': null_percentage,
+                'row_groups': row_groups
+            }
+        
+        # Row-level null counts are not recorded in the footer
+        cells = row_count * footer.num_columns
+        metadata['completeness'] = {
+            'overall_missing_percentage': float(total_nulls / cells * 100) if cells else 0.0,
+            'columns_with_nulls': int(columns_with_nulls),
+            'rows_with_nulls': None
+        }
+        return metadata
+    
+    @staticmethod
+    def process_arrow(file_path: str, file_format: str = 'arrow') -> Dict[str, Any]:
+        """Process a Feather or Arrow IPC file and extract metadata
+        
+        The file is memory-mapped rather than read, and tables larger than
+        STREAMING_PROFILE_THRESHOLD are profiled batch by batch with the
+        StreamingProfiler so only one batch at a time is converted to pandas.
+        
+        Args:
+            file_path: Path to the Feather or Arrow IPC file
+            file_format: 'feather' or 'arrow', reported as the format
+            
+        Returns:
+            Dict containing metadata about the file
+        """
+        from aggregators import StreamingProfiler
+        from columnar import read_ipc
+        
+        try:
+            table = read_ipc(file_path)
+            streaming = table.nbytes > config.STREAMING_PROFILE_THRESHOLD
+            if streaming:
+                profiler = StreamingProfiler()
+                for batch in table.to_batches(max_chunksize=config.CSV_CHUNK_SIZE):
+                    profiler.update(batch.to_pandas())
+                metadata = profiler.result()
+            else:
+                metadata = DataProcessor._extract_dataframe_metadata(table.to_pandas())
+            # Arrow dates, timestamps and decimals are not JSON-serializable as converted by pandas
+            metadata['sample_data'] = [{key: _json_value(value) for key, value in row.items()} for row in metadata['sample_data']]
+            metadata['format'] = file_format
+            metadata['profiling_mode'] = 'streaming' if streaming else 'in_memory'
+            return metadata
+        except Exception as e:
+            return {
+                'error': str(e),
+                'format': file_format,
+                'processing_status': 'failed'
+            }
+    
+    @staticmethod
+    def _extract_dataframe_metadata(df: 'pd.DataFrame', approximate: bool = False, parallel: Optional[bool] = None) -> Dict[str, Any]:
         """Extract metadata from a pandas DataFrame
         
         Args:
             df: Pandas DataFrame
+            approximate: Compute medians, unique counts and top values with
+                bounded-memory sketches instead of exact sorts and hash tables
+            parallel: Shard column profiling across a worker pool; see
+                column_profiler.profile_columns for the default
             
         Returns:
             Dict containing metadata about the DataFrame
         """
+        import numpy as np
+        from aggregators import StreamingProfiler
+        from column_profiler import profile_columns
+        
+        if approximate:
+            profiler = StreamingProfiler()
+            profiler.update(df)
+            return profiler.result()
+        
         # Get basic info
         metadata = {
             'row_count': len(df),
@@ -154,85 +503,101 @@ class DataProcessor:
             'statistics': {}
         }
         
-        # Calculate statistics for numeric columns
+        # Calculate statistics for numeric and categorical columns, one fused pass per column
         numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        for col in numeric_columns:
-            metadata['statistics'][col] = {
-                'min': float(df[col].min()) if not pd.isna(df[col].min()) else None,
-                'max': float(df[col].max()) if not pd.isna(df[col].max()) else None,
-                'mean': float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
-                'median': float(df[col].median()) if not pd.isna(df[col].median()) else None,
-                'std': float(df[col].std()) if not pd.isna(df[col].std()) else None,
-                'null_count': int(df[col].isna().sum()),
-                'null_percentage': float(df[col].isna().mean() * 100)
-            }
-        
-        # Calculate counts for categorical columns
-        categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
-        for col in categorical_columns:
-            value_counts = df[col].value_counts().head(10).to_dict()
-            # Convert keys to strings to ensure JSON serialization
-            value_counts = {str(k): int(v) for k, v in value_counts.items()}
-            
-            metadata['statistics'][col] = {
-                'unique_count': int(df[col].nunique()),
-                'null_count': int(df[col].isna().sum()),
-                'null_percentage': float(df[col].isna().mean() * 100),
-                'top_values': value_counts
-            }
+        # Booleans, plain or nullable, are profiled like categories (counts of True and False)
+        categorical_columns = df.select_dtypes(include=['object', 'category', 'datetime', 'bool', 'boolean']).columns.tolist()
+        metadata['statistics'] = profile_columns(df, numeric_columns, categorical_columns, parallel=parallel)
         
         # Calculate completeness score
+        nulls = df.isna()
         metadata['completeness'] = {
-            'overall_missing_percentage': float(df.isna().mean().mean() * 100),
-            'columns_with_nulls': int((df.isna().sum() > 0).sum()),
-            'rows_with_nulls': int((df.isna().any(axis=1)).sum())
+            'overall_missing_percentage': float(nulls.mean().mean() * 100),
+            'columns_with_nulls': int(nulls.any(axis=0).sum()),
+            'rows_with_nulls': int(nulls.any(axis=1).sum())
         }
         
         return metadata
     
     @staticmethod
-    def _calculate_line_stats(lines: List[str]) -> Dict[str, Any]:
+    def _calculate_line_stats(line_lengths: 'np.ndarray') -> Dict[str, Any]:
         """Calculate statistics about line lengths
         
+        The median and percentiles come from a single np.partition call, which
+        is O(n) instead of a full sort; percentiles use the nearest-rank method.
+        
         Args:
-            lines: List of lines from a text file
+            line_lengths: Length of each line of a text file, in characters
             
         Returns:
             Dict containing statistics about line lengths
         """
-        if not lines:
+        import numpy as np
+        
+        if not len(line_lengths):
             return {
                 'min': 0,
                 'max': 0,
                 'mean': 0,
                 'median': 0,
-                'std': 0
+                'std': 0,
+                'percentiles': {'p50': 0, 'p90': 0, 'p99': 0}
             }
         
-        line_lengths = [len(line) for line in lines]
+        line_lengths = np.asarray(line_lengths, dtype=np.int32)
+        n = len(line_lengths)
+        ranks = {name: max(int(np.ceil(q * n)) - 1, 0) for name, q in [('p50', 0.5), ('p90', 0.9), ('p99', 0.99)]}
+        median_rank = n // 2
+        partitioned = np.partition(line_lengths, sorted({median_rank, *ranks.values()}))
+        mean = line_lengths.mean(dtype=np.float64)
+        
+        return {
+            'min': int(line_lengths.min()),
+            'max': int(line_lengths.max()),
+            'mean': float(mean),
+            'median': int(partitioned[median_rank]),
+            'std': float(np.sqrt(np.mean(np.square(line_lengths - mean)))),
+            'percentiles': {name: int(partitioned[rank]) for name, rank in ranks.items()}
+        }
+    
+    @staticmethod
+    def _length_histogram(line_lengths: 'np.ndarray') -> Dict[str, List]:
+        """Distribution of line lengths over LINE_HISTOGRAM_BINS equal-width bins
+        
+        Args:
+            line_lengths: Length of each line of a text file, in characters
+            
+        Returns:
+            Dict with the bin edges (one more than the bins) and line counts per bin
+        """
+        import numpy as np
+        
+        if not len(line_lengths):
+            return {'bin_edges': [], 'counts': []}
+        
+        low, high = int(line_lengths.min()), int(line_lengths.max())
+        # Integer lengths never need more bins than distinct values
+        bins = min(config.LINE_HISTOGRAM_BINS, high - low + 1)
+        counts, edges = np.histogram(line_lengths, bins=bins, range=(low, high + 1))
         return {
-            'min': min(line_lengths),
-            'max': max(line_lengths),
-            'mean': sum(line_lengths) / len(line_lengths),
-            'median': sorted(line_lengths)[len(line_lengths) // 2],
-            'std': (sum((x - (sum(line_lengths) / len(line_lengths))) ** 2 for x in line_lengths) / len(line_lengths)) ** 0.5
+            'bin_edges': [float(edge) for edge in edges],
+            'counts': [int(count) for count in counts]
         }
     
     @staticmethod
-    def _estimate_tokens(lines: List[str]) -> Dict[str, Any]:
+    def _estimate_tokens(characters: int) -> Dict[str, Any]:
         """Estimate the number of tokens in the text
         
         Args:
-            lines: List of lines from a text file
+            characters: Number of characters in the text, with line breaks as single spaces
             
         Returns:
             Dict containing token estimates
         """
-        text = ' '.join([line.strip() for line in lines])
         # Rough estimate: 1 token ≈ 4 characters
-        estimated_tokens = len(text) // 4
+        estimated_tokens = characters // 4
         return {
             'estimated_total': estimated_tokens,
             'estimation_method': 'character_based',
-            'characters': len(text)
+            'characters': characters
         }
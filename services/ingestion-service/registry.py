@@ -0,0 +1,102 @@
+import importlib
+import threading
+from typing import Dict, Any, Callable, IO, List, Optional, Union
+
+class FormatHandler:
+    """Metadata extractor of one file format, and the ingestion paths it supports
+
+    The extractor is registered by import path ("module:attribute.path") and
+    only imported the first time a file of the format is processed, so the
+    service does not load pandas, pyarrow or any other format's dependencies
+    at startup. The built-in formats share processor.py, whose methods import
+    their own format's dependencies, so using one format does not load the
+    others'.
+
+    Capabilities:
+        streaming: The extractor accepts a binary stream and ``streaming=True``,
+            so uploads can be profiled while they stream to storage
+        sampling: Records are line-delimited, so large stored objects can be
+            profiled from ranged-read samples (see the assessment service)
+        parallel: Extraction is CPU-bound and worth sending to the profiling
+            process pool; otherwise it runs on the I/O pool
+        columnar: A Parquet copy is written at ingestion (see columnar.py)
+    """
+
+    def __init__(self, file_type: str, target: str, options: Optional[Dict[str, Any]] = None, streaming: bool = False,
+                 sampling: bool = False, parallel: bool = False, columnar: bool = False):
+        self.file_type = file_type
+        self.target = target
+        self.options = options or {}
+        self.streaming = streaming
+        self.sampling = sampling
+        self.parallel = parallel
+        self.columnar = columnar
+        self._extractor: Optional[Callable[..., Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the extractor has been imported"""
+        return self._extractor is not None
+
+    def extractor(self) -> Callable[..., Dict[str, Any]]:
+        """Import the extractor on first use"""
+        if self._extractor is None:
+            with self._lock:
+                if self._extractor is None:
+                    module_name, _, path = self.target.partition(":")
+                    extractor = importlib.import_module(module_name)
+                    for name in path.split("."):
+                        extractor = getattr(extractor, name)
+                    self._extractor = extractor
+        return self._extractor
+
+    def extract(self, file_path: str) -> Dict[str, Any]:
+        """Extract metadata from a file of this format"""
+        return self.extractor()(file_path, **self.options)
+
+    def profile_stream(self, stream: Union[str, IO[bytes]]) -> Dict[str, Any]:
+        """Extract metadata from a binary stream of this format as it is read"""
+        if not self.streaming:
+            raise ValueError(f"File type {self.file_type} cannot be profiled from a stream")
+        return self.extractor()(stream, streaming=True, **self.options)
+
+    def capabilities(self) -> Dict[str, bool]:
+        return {
+            "streaming": self.streaming,
+            "sampling": self.sampling,
+            "parallel": self.parallel,
+            "columnar": self.columnar
+        }
+
+# Registered handlers by file type
+_handlers: Dict[str, FormatHandler] = {}
+
+def register(file_type: str, target: str, **kwargs) -> FormatHandler:
+    """Register (or replace) the handler of a file type; see FormatHandler for the arguments"""
+    handler = FormatHandler(file_type, target, **kwargs)
+    _handlers[file_type] = handler
+    return handler
+
+def get_handler(file_type: str) -> Optional[FormatHandler]:
+    """Handler of a file type, or None if the type is not registered"""
+    return _handlers.get(file_type)
+
+def registered_types() -> List[str]:
+    """File types with a registered handler"""
+    return list(_handlers)
+
+def supports(file_type: str, capability: str) -> bool:
+    """Whether a file type is registered and has the given capability"""
+    handler = _handlers.get(file_type)
+    return handler is not None and handler.capabilities().get(capability, False)
+
+# Built-in formats
+register("csv", "processor:DataProcessor.process_csv", streaming=True, sampling=True, parallel=True, columnar=True)
+register("json", "processor:DataProcessor.process_json", streaming=True, parallel=True, columnar=True)
+register("jsonl", "processor:DataProcessor.process_jsonl", streaming=True, sampling=True, parallel=True, columnar=True)
+register("txt", "processor:DataProcessor.process_txt", sampling=True, parallel=True)
+# Footer reads are I/O, not CPU, so they skip the process pool
+register("parquet", "processor:DataProcessor.process_parquet")
+register("feather", "processor:DataProcessor.process_arrow", options={"file_format": "feather"}, parallel=True, columnar=True)
+register("arrow", "processor:DataProcessor.process_arrow", options={"file_format": "arrow"}, parallel=True, columnar=True)
@@ -5,7 +5,7 @@ from datetime import datetime
 class DatasetBase(BaseModel):
     """Base model for dataset information"""
     name: str = Field(..., description="Name of the dataset file")
-    file_type: str = Field(..., description="Type of the file (csv, json, txt)")
+    file_type: str = Field(..., description="Type of the file (see SUPPORTED_FILE_TYPES)")
     file_size: int = Field(..., description="Size of the file in bytes")
 
 class DatasetCreate(DatasetBase):
@@ -19,16 +19,53 @@ class DatasetResponse(DatasetBase):
     file_path: str = Field(..., description="Path to the stored file in the object storage")
     created_at: datetime = Field(..., description="Timestamp when the dataset was created")
     metadata: Dict[str, Any] = Field(..., description="Metadata extracted from the dataset")
+    parquet_path: Optional[str] = Field(None, description="Path to the Parquet copy of a tabular dataset in the object storage")
 
     class Config:
         orm_mode = True
 
+class DatasetSummary(DatasetBase):
+    """Model for a dataset in a listing"""
+    id: int = Field(..., description="Unique identifier for the dataset")
+    file_path: str = Field(..., description="Path to the stored file in the object storage")
+    created_at: datetime = Field(..., description="Timestamp when the dataset was created")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Metadata extracted from the dataset, if requested")
+    parquet_path: Optional[str] = Field(None, description="Path to the Parquet copy of a tabular dataset in the object storage")
+
 class DatasetList(BaseModel):
     """Model for list of datasets response"""
-    datasets: List[DatasetResponse] = Field(..., description="List of datasets")
-    total: int = Field(..., description="Total number of datasets")
-    page: int = Field(1, description="Current page number")
+    datasets: List[DatasetSummary] = Field(..., description="List of datasets")
+    total: Optional[int] = Field(None, description="Total number of datasets, if counted")
+    total_estimated: bool = Field(False, description="Whether total is an estimate")
+    page: Optional[int] = Field(1, description="Current page number (offset pagination only)")
     page_size: int = Field(10, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, absent on the last page")
+
+class DatasetPreview(BaseModel):
+    """Model for a preview of a dataset's rows"""
+    id: int = Field(..., description="Unique identifier for the dataset")
+    columns: List[str] = Field(..., description="Columns included in the rows")
+    rows: List[Dict[str, Any]] = Field(..., description="First rows of the dataset")
+    row_count: int = Field(..., description="Total number of rows in the dataset")
+
+class JobProgress(BaseModel):
+    """Model for ingestion job progress"""
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    percentage: float = Field(..., description="Progress percentage from 0 to 100")
+    stage: Optional[str] = Field(None, description="Pipeline stage currently running")
+
+class JobResponse(BaseModel):
+    """Model for ingestion job response"""
+    id: str = Field(..., description="Unique identifier for the job")
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    progress: JobProgress = Field(..., description="Current progress of the job")
+    name: str = Field(..., description="Name of the uploaded file")
+    file_type: str = Field(..., description="Type of the file (see SUPPORTED_FILE_TYPES)")
+    file_size: int = Field(..., description="Size of the file in bytes")
+    dataset_id: Optional[int] = Field(None, description="ID of the created dataset once the job has completed")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: Optional[datetime] = Field(None, description="Timestamp when the job was queued")
+    updated_at: Optional[datetime] = Field(None, description="Timestamp of the last status change")
 
 class ErrorResponse(BaseModel):
     """Model for error responses"""
@@ -1,27 +1,41 @@
 import os
 import uuid
+import asyncio
+import base64
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Callable, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, tuple_
+from sqlalchemy.exc import IntegrityError
 
 import config
 from database import Dataset
 from storage import StorageClient
-from processor import DataProcessor
+from executors import ExecutionLayer, get_execution_layer
+from pipeline import IncrementalProfiler
+from registry import get_handler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns selected for dataset listings
+LISTING_COLUMNS = (Dataset.id, Dataset.name, Dataset.file_type, Dataset.file_size, Dataset.file_path, Dataset.created_at, Dataset.parquet_path)
+
 class IngestionService:
     """Service for dataset ingestion and processing"""
     
-    def __init__(self):
-        """Initialize the ingestion service"""
+    def __init__(self, execution: Optional[ExecutionLayer] = None):
+        """Initialize the ingestion service
+        
+        Args:
+            execution: Pools used by the async methods (defaults to the shared execution layer)
+        """
         self.storage_client = StorageClient()
+        self.execution = execution or get_execution_layer()
     
     async def process_file(self, file_path: str, original_filename: str, file_size: int, file_type: str, db: Session) -> Tuple[int, Dict[str, Any]]:
         """Process a file and store its metadata
@@ -30,46 +44,269 @@ class IngestionService:
             file_path: Path to the temporary uploaded file
             original_filename: Original name of the uploaded file
             file_size: Size of the file in bytes
-            file_type: Type of the file (csv, json, txt)
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
+            db: Database session
+            
+        Returns:
+            Tuple containing the dataset ID and metadata
+        """
+        content_hash = await self.execution.run_io(hash_file, file_path)
+        existing = await self.execution.run_io(self.find_by_hash, content_hash, db)
+        if existing is not None:
+            return existing.id, existing.metadata_
+        
+        # CPU-bound profiling runs in the process pool; footer reads, storage and database calls run in the thread pool
+        handler = get_handler(file_type)
+        run = self.execution.run_cpu if handler is not None and handler.parallel else self.execution.run_io
+        metadata = await run(extract_metadata, file_path, file_type)
+        return await self.execution.run_io(self.ingest, file_path, original_filename, file_size, file_type, db,
+                                           metadata=metadata, content_hash=content_hash)
+    
+    def ingest(self, file_path: str, original_filename: str, file_size: int, file_type: str, db: Session,
+               progress: Optional[Callable[[float, str], None]] = None, metadata: Optional[Dict[str, Any]] = None,
+               content_hash: Optional[str] = None) -> Tuple[int, Dict[str, Any]]:
+        """Extract metadata, upload the file to storage and create the dataset record
+        
+        This is the blocking ingestion pipeline; ingestion job workers call it
+        directly. Tabular files also get a Parquet copy stored next to the
+        original (see _store_parquet). When a dataset with the same content hash already exists, its
+        stored object and metadata are reused and nothing is profiled or uploaded.
+        
+        Args:
+            file_path: Path to the temporary uploaded file
+            original_filename: Original name of the uploaded file
+            file_size: Size of the file in bytes
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
             db: Database session
+            progress: Optional callback receiving (percentage, stage) as the pipeline advances
+            metadata: Metadata already extracted from the file; skips extraction when given
+            content_hash: SHA-256 hex digest of the file (computed from the file when not given)
             
         Returns:
             Tuple containing the dataset ID and metadata
         """
+        report = progress or (lambda percentage, stage: None)
         try:
+            if content_hash is None:
+                content_hash = hash_file(file_path)
+            existing = self.find_by_hash(content_hash, db)
+            if existing is not None:
+                logger.info(f"File {original_filename} matches dataset ID: {existing.id}, reusing it")
+                return existing.id, existing.metadata_
+            
             # Extract metadata based on file type
-            metadata = self._extract_metadata(file_path, file_type)
+            if metadata is None:
+                report(10, "extracting_metadata")
+                metadata = self._extract_metadata(file_path, file_type)
             
             # Generate a unique name for storage
             storage_filename = f"{uuid.uuid4()}.{file_type}"
             
             # Upload to storage
+            report(60, "uploading")
             storage_path = self.storage_client.upload_file(file_path, storage_filename)
             
             if not storage_path:
                 raise Exception("Failed to upload file to storage")
             
-            # Create database record
-            dataset = Dataset(
-                name=original_filename,
-                file_path=storage_filename,  # Store just the object name, not the full URL
-                file_type=file_type,
-                file_size=file_size,
-                metadata=metadata
-            )
-            
-            db.add(dataset)
-            db.commit()
-            db.refresh(dataset)
+            # Store a columnar copy for readers that need only some columns
+            report(75, "writing_parquet")
+            parquet_path = self._store_parquet(file_path, file_type, storage_filename)
             
-            logger.info(f"Successfully processed file: {original_filename}, dataset ID: {dataset.id}")
+            # Create database record
+            report(90, "saving")
+            dataset_id = self._save_dataset(original_filename, storage_filename, file_type, file_size, metadata, db, content_hash, parquet_path)
             
-            return dataset.id, metadata
+            return dataset_id, metadata
         except Exception as e:
             logger.error(f"Error processing file: {original_filename}, error: {str(e)}")
             db.rollback()
             raise
     
+    async def ingest_stream(self, chunks: AsyncIterator[bytes], original_filename: str, file_type: str, db: Session,
+                            content_hash: Optional[str] = None, progress: Optional[Callable[[float, str], None]] = None) -> Tuple[int, Dict[str, Any]]:
+        """Ingest an upload while it streams in, without a temporary file
+        
+        Each chunk is sent to a multipart upload, to an incremental profiler
+        and, for tabular types, to a Parquet writer, so the upload is neither
+        written to nor re-read from disk.
+        
+        When the client supplies the content's SHA-256, a matching dataset is
+        returned before anything is read, uploaded or profiled, and the
+        streamed content is checked against the hash. Otherwise the hash is
+        only known once the last chunk has arrived: a duplicate is still
+        detected and its upload aborted, but only after it was streamed
+        through the profiler and the Parquet writer.
+        
+        Files of every size get the handler's streaming profile, so even
+        small CSVs are described with sketch-based, approximate statistics
+        (see approximate_statistics in the metadata).
+        
+        Args:
+            chunks: The file's bytes in order
+            original_filename: Original name of the uploaded file
+            file_type: Type of the file; its handler must support streaming
+            db: Database session
+            content_hash: SHA-256 hex digest of the file declared by the client, if any
+            progress: Optional blocking callback receiving (percentage, stage) as the pipeline advances
+            
+        Returns:
+            Tuple containing the dataset ID and metadata
+            
+        Raises:
+            ValueError: If the streamed content does not match ``content_hash``
+        """
+        from columnar import write_parquet
+        
+        report = progress or (lambda percentage, stage: None)
+        if content_hash is not None:
+            existing = await self.execution.run_io(self.find_by_hash, content_hash, db)
+            if existing is not None:
+                logger.info(f"File {original_filename} matches dataset ID: {existing.id} by its declared hash, reusing it")
+                return existing.id, existing.metadata_
+        
+        handler = get_handler(file_type)
+        storage_filename = f"{uuid.uuid4()}.{file_type}"
+        upload = self.storage_client.start_upload(storage_filename)
+        profiler = IncrementalProfiler(handler.profile_stream)
+        parquet_file = config.TEMP_UPLOAD_DIR / f"{os.path.splitext(storage_filename)[0]}.parquet"
+        converter = IncrementalProfiler(lambda stream: write_parquet(stream, file_type, parquet_file)) if handler.columnar else None
+        consumers = [profiler] + ([converter] if converter is not None else [])
+        hasher = hashlib.sha256()
+        file_size = 0
+        try:
+            await self.execution.run_io(report, 10, "streaming")
+            async for chunk in chunks:
+                file_size += len(chunk)
+                await asyncio.gather(
+                    self.execution.run_io(upload.write, chunk),
+                    self.execution.run_io(hasher.update, chunk),
+                    *(self.execution.run_io(consumer.feed, chunk) for consumer in consumers)
+                )
+            if content_hash is not None and hasher.hexdigest() != content_hash:
+                raise ValueError(f"Content of {original_filename} does not match its declared SHA-256")
+            content_hash = hasher.hexdigest()
+            existing = await self.execution.run_io(self.find_by_hash, content_hash, db)
+            if existing is not None:
+                # Files smaller than a part were never sent; larger ones are discarded by the abort
+                logger.info(f"File {original_filename} matches dataset ID: {existing.id}, reusing it")
+                for consumer in consumers:
+                    await self.execution.run_io(consumer.cancel)
+                await self.execution.run_io(upload.abort)
+                self._remove(parquet_file)
+                return existing.id, existing.metadata_
+            await self.execution.run_io(report, 60, "profiling")
+            metadata = await self.execution.run_io(profiler.close)
+            await self.execution.run_io(upload.complete)
+        except BaseException as e:
+            logger.error(f"Error streaming file: {original_filename}, error: {str(e)}")
+            for consumer in consumers:
+                await self.execution.run_io(consumer.cancel)
+            await self.execution.run_io(upload.abort)
+            self._remove(parquet_file)
+            raise
+        
+        parquet_path = None
+        if converter is not None:
+            await self.execution.run_io(report, 75, "writing_parquet")
+            parquet_path = await self.execution.run_io(self._finish_parquet, converter, parquet_file, storage_filename)
+        
+        try:
+            await self.execution.run_io(report, 90, "saving")
+            dataset_id = await self.execution.run_io(self._save_dataset, original_filename, storage_filename, file_type, file_size, metadata, db, content_hash, parquet_path)
+        except Exception:
+            await self.execution.run_io(self.storage_client.client.delete_object, Bucket=config.DATASET_BUCKET, Key=storage_filename)
+            if parquet_path:
+                await self.execution.run_io(self.storage_client.client.delete_object, Bucket=config.DATASET_BUCKET, Key=parquet_path)
+            await self.execution.run_io(db.rollback)
+            raise
+        return dataset_id, metadata
+    
+    def _store_parquet(self, file_path: str, file_type: str, storage_filename: str) -> Optional[str]:
+        """Write and upload a Parquet copy of a tabular file
+        
+        The copy is optional, so failures are logged rather than raised.
+        
+        Returns:
+            Object name of the Parquet copy, or None if none was stored
+        """
+        if file_type == "parquet":
+            # The stored file is already Parquet
+            return storage_filename
+        handler = get_handler(file_type)
+        if handler is None or not handler.columnar:
+            return None
+        from columnar import write_parquet
+        
+        parquet_file = config.TEMP_UPLOAD_DIR / f"{os.path.splitext(storage_filename)[0]}.parquet"
+        try:
+            if not write_parquet(file_path, file_type, parquet_file):
+                return None
+            return self._upload_parquet(parquet_file)
+        except Exception as e:
+            logger.warning(f"Could not write Parquet copy of {storage_filename}: {str(e)}")
+            return None
+        finally:
+            self._remove(parquet_file)
+    
+    def _finish_parquet(self, converter: IncrementalProfiler, parquet_file: Path, storage_filename: str) -> Optional[str]:
+        """Wait for a streamed Parquet conversion and upload the result; see _store_parquet"""
+        try:
+            if not converter.close():
+                return None
+            return self._upload_parquet(parquet_file)
+        except Exception as e:
+            logger.warning(f"Could not write Parquet copy of {storage_filename}: {str(e)}")
+            return None
+        finally:
+            self._remove(parquet_file)
+    
+    def _upload_parquet(self, parquet_file: Path) -> Optional[str]:
+        if not self.storage_client.upload_file(str(parquet_file), parquet_file.name):
+            return None
+        return parquet_file.name
+    
+    @staticmethod
+    def _remove(file_path: Path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    
+    def _save_dataset(self, name: str, storage_filename: str, file_type: str, file_size: int, metadata: Dict[str, Any], db: Session,
+                      content_hash: Optional[str] = None, parquet_path: Optional[str] = None) -> int:
+        """Create the database record of a stored dataset and return its ID
+        
+        If a concurrent upload of the same content saved its record first, the
+        objects stored for this upload are deleted and that record's ID returned.
+        """
+        dataset = Dataset(
+            name=name,
+            file_path=storage_filename,  # Store just the object name, not the full URL
+            file_type=file_type,
+            file_size=file_size,
+            metadata_=metadata,
+            content_hash=content_hash,
+            parquet_path=parquet_path
+        )
+        
+        db.add(dataset)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            existing = self.find_by_hash(content_hash, db) if content_hash else None
+            if existing is None:
+                raise
+            self.storage_client.client.delete_object(Bucket=config.DATASET_BUCKET, Key=storage_filename)
+            if parquet_path and parquet_path != storage_filename:
+                self.storage_client.client.delete_object(Bucket=config.DATASET_BUCKET, Key=parquet_path)
+            logger.info(f"File {name} was ingested concurrently as dataset ID: {existing.id}, reusing it")
+            return existing.id
+        db.refresh(dataset)
+        
+        logger.info(f"Successfully processed file: {name}, dataset ID: {dataset.id}")
+        
+        return dataset.id
+    
     def get_dataset(self, dataset_id: int, db: Session) -> Optional[Dataset]:
         """Get dataset by ID
         
@@ -82,49 +319,187 @@ class IngestionService:
         """
         return db.execute(select(Dataset).where(Dataset.id == dataset_id)).scalar_one_or_none()
     
-    def list_datasets(self, skip: int = 0, limit: int = 100, db: Session = None) -> Tuple[List[Dataset], int]:
-        """List datasets with pagination
+    def find_by_hash(self, content_hash: str, db: Session) -> Optional[Dataset]:
+        """Get the dataset with the given content hash
         
         Args:
-            skip: Number of records to skip
+            content_hash: SHA-256 hex digest of the file content
+            db: Database session
+            
+        Returns:
+            Dataset object if the content was already ingested, None otherwise
+        """
+        return db.execute(select(Dataset).where(Dataset.content_hash == content_hash)).scalar_one_or_none()
+    
+    def list_datasets(self, skip: int = 0, limit: int = 100, db: Session = None, cursor: Optional[str] = None,
+                      include_metadata: bool = False, count: str = "exact") -> Tuple[List[Any], Optional[int], Optional[str]]:
+        """List datasets, newest first, with keyset pagination
+        
+        Pages are continued from a cursor holding the (created_at, id) of the
+        last dataset on the previous page, so each page is an index range
+        scan of ix_datasets_created_at_id however deep it is. Offsets are
+        still accepted when no cursor is given, but scan and discard the
+        skipped rows. Only the listing columns are selected; the metadata
+        JSON, with its samples and statistics, is left out unless requested.
+        
+        Args:
+            skip: Number of records to skip (ignored with a cursor)
             limit: Maximum number of records to return
             db: Database session
+            cursor: Cursor returned with the previous page
+            include_metadata: Also select each dataset's metadata
+            count: "exact" for a COUNT of the table, "estimated" for the
+                planner's row estimate, or "none" to skip counting
             
         Returns:
-            Tuple containing list of datasets and total count
+            Tuple containing the dataset rows, the total count (None when not
+            counted) and the cursor of the next page (None on the last page)
+        """
+        columns = list(LISTING_COLUMNS)
+        if include_metadata:
+            columns.append(Dataset.metadata_)
+        query = select(*columns).order_by(Dataset.created_at.desc(), Dataset.id.desc())
+        if cursor is not None:
+            created_at, dataset_id = decode_cursor(cursor)
+            query = query.where(tuple_(Dataset.created_at, Dataset.id) < tuple_(created_at, dataset_id))
+        elif skip:
+            query = query.offset(skip)
+        
+        # One extra row tells whether there is a next page
+        datasets = db.execute(query.limit(limit + 1)).all()
+        next_cursor = encode_cursor(datasets[limit - 1].created_at, datasets[limit - 1].id) if len(datasets) > limit else None
+        
+        total = None
+        if count != "none":
+            total = self.count_datasets(db, estimated=count == "estimated")
+        return datasets[:limit], total, next_cursor
+    
+    def count_datasets(self, db: Session, estimated: bool = False) -> int:
+        """Count datasets
+        
+        Args:
+            db: Database session
+            estimated: Return PostgreSQL's row estimate for the table, kept up
+                to date by autovacuum, instead of counting every row. Falls
+                back to an exact count on other databases or before the table
+                has been analyzed.
+        """
+        if estimated and db.get_bind().dialect.name == "postgresql":
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": config.DATASET_TABLE}
+            ).scalar()
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return db.execute(select(func.count(Dataset.id))).scalar_one()
+    
+    def delete_dataset(self, dataset: Dataset, db: Session):
+        """Delete a dataset record and its file in storage
+        
+        Args:
+            dataset: Dataset to delete
+            db: Database session
         """
-        # Get total count
-        total = db.execute(select(func.count(Dataset.id))).scalar_one()
+        try:
+            # Delete the file and its Parquet copy from storage
+            self.storage_client.client.delete_object(
+                Bucket=config.DATASET_BUCKET,
+                Key=dataset.file_path
+            )
+            if dataset.parquet_path and dataset.parquet_path != dataset.file_path:
+                self.storage_client.client.delete_object(
+                    Bucket=config.DATASET_BUCKET,
+                    Key=dataset.parquet_path
+                )
+            
+            # Delete the dataset from the database
+            db.delete(dataset)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    
+    def preview_dataset(self, dataset: Dataset, columns: Optional[List[str]] = None, limit: int = 20) -> Dict[str, Any]:
+        """Read the first rows of some columns from a dataset's Parquet copy
         
-        # Get datasets with pagination
-        datasets = db.execute(
-            select(Dataset)
-            .order_by(Dataset.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        ).scalars().all()
+        Only the footer and the chunks of the requested columns in the first
+        row groups are fetched from storage.
         
-        return datasets, total
+        Args:
+            dataset: Dataset with a Parquet copy
+            columns: Columns to read (defaults to all)
+            limit: Maximum number of rows
+            
+        Returns:
+            Dict with the columns read, the rows and the dataset's total row count
+        """
+        import pyarrow.parquet as pq
+        
+        with self.storage_client.open_input_file(dataset.parquet_path) as f:
+            parquet = pq.ParquetFile(f)
+            missing = set(columns or []) - set(parquet.schema_arrow.names)
+            if missing:
+                raise KeyError(f"Unknown columns: {', '.join(sorted(missing))}")
+            batch = next(parquet.iter_batches(batch_size=limit, columns=columns), None)
+            rows = batch.to_pylist() if batch is not None else []
+            return {
+                'id': dataset.id,
+                'columns': columns or parquet.schema_arrow.names,
+                'rows': rows,
+                'row_count': parquet.metadata.num_rows
+            }
     
     def _extract_metadata(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """Extract metadata from a file based on its type
         
         Args:
             file_path: Path to the file
-            file_type: Type of the file (csv, json, txt)
+            file_type: Type of the file (see SUPPORTED_FILE_TYPES)
             
         Returns:
             Dict containing metadata about the file
         """
-        if file_type == "csv":
-            return DataProcessor.process_csv(file_path)
-        elif file_type == "json":
-            return DataProcessor.process_json(file_path)
-        elif file_type == "txt":
-            return DataProcessor.process_txt(file_path)
-        else:
-            # Unsupported file type
-            return {
-                "error": f"Unsupported file type: {file_type}",
-                "processing_status": "failed"
-            }
+        return extract_metadata(file_path, file_type)
+
+def encode_cursor(created_at: datetime, dataset_id: int) -> str:
+    """Opaque pagination cursor for the position after the given dataset"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{dataset_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded by encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        created_at, dataset_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(dataset_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def hash_file(file_path: str) -> str:
+    """Compute the SHA-256 hex digest of a file, reading it in 1MB chunks"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def extract_metadata(file_path: str, file_type: str) -> Dict[str, Any]:
+    """Extract metadata from a file based on its type
+    
+    A module-level function so it can be sent to the profiling process pool.
+    The format's handler, and with it the format's dependencies, is imported
+    on first use.
+    
+    Args:
+        file_path: Path to the file
+        file_type: Type of the file (see SUPPORTED_FILE_TYPES)
+        
+    Returns:
+        Dict containing metadata about the file
+    """
+    handler = get_handler(file_type)
+    if handler is None:
+        # Unsupported file type
+        return {
+            "error": f"Unsupported file type: {file_type}",
+            "processing_status": "failed"
+        }
+    return handler.extract(file_path)
@@ -0,0 +1,174 @@
+import math
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional
+import config
+
+def kll_k(error_bound: float) -> int:
+    """Compactor size giving roughly ``error_bound`` normalized rank error"""
+    return max(8, int(math.ceil(1.65 / error_bound)))
+
+def hll_precision(error_bound: float) -> int:
+    """Register index width giving roughly ``error_bound`` relative standard error"""
+    return min(18, max(4, int(math.ceil(math.log2((1.04 / error_bound) ** 2)))))
+
+def misra_gries_capacity(error_bound: float) -> int:
+    """Counter count keeping frequency underestimates within ``error_bound`` of the total"""
+    return max(10, int(math.ceil(1 / error_bound)))
+
+class KLLSketch:
+    """KLL quantile sketch over a stream of floats
+
+    Values are held in a hierarchy of compactors; level ``h`` items carry a
+    weight of ``2**h``. While no compaction has happened the sketch holds every
+    value and quantiles are exact.
+    """
+
+    def __init__(self, k: int = None, seed: Optional[int] = None):
+        self.k = k or kll_k(config.SKETCH_ERROR_BOUND)
+        self.rng = np.random.default_rng(seed)
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.compacted = False
+
+    @property
+    def is_exact(self) -> bool:
+        return not self.compacted
+
+    def update(self, values: np.ndarray):
+        """Add a batch of values"""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64, copy=False)])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: 'KLLSketch'):
+        """Merge another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.compacted = self.compacted or other.compacted
+        self._compress()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted weight is exact
+                kept, items = items[:len(items) % 2], items[len(items) % 2:]
+                promoted = items[self.rng.integers(2)::2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.compacted = True
+            level += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return None
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(values[order][min(index, len(values) - 1)])
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes"""
+
+    def __init__(self, precision: int = None):
+        self.precision = precision or hll_precision(config.SKETCH_ERROR_BOUND)
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        """Add a batch of values, hashed with pandas' stable 64-bit hash"""
+        if len(values) == 0:
+            return
+        self.update_hashes(pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy())
+
+    def update_hashes(self, hashes: np.ndarray):
+        """Add a batch of uint64 hashes"""
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(64 - _bit_length(remainder), width) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: 'HyperLogLog'):
+        """Merge another sketch with the same precision into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class MisraGries:
+    """Mergeable Misra-Gries heavy-hitters summary
+
+    Counts are underestimates by at most ``error``; while nothing has been
+    evicted the counts are exact.
+    """
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or misra_gries_capacity(config.SKETCH_ERROR_BOUND)
+        self.counts: Dict[str, int] = {}
+        self.error = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.error == 0
+
+    def update(self, values: pd.Series):
+        """Add a batch of values"""
+        if len(values) == 0:
+            return
+        self.update_counts({str(k): int(v) for k, v in values.value_counts().items() if v > 0})
+
+    def update_counts(self, counts: Dict[str, int]):
+        """Add pre-aggregated counts"""
+        for value, count in counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        if len(self.counts) > self.capacity:
+            ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+            threshold = ranked[self.capacity][1]
+            self.counts = {value: count - threshold for value, count in ranked[:self.capacity] if count > threshold}
+            self.error += threshold
+
+    def merge(self, other: 'MisraGries'):
+        """Merge another summary into this one"""
+        self.error += other.error
+        self.update_counts(other.counts)
+
+    def top(self, n: int = 10) -> Dict[str, int]:
+        """The ``n`` most frequent values with their (lower-bound) counts"""
+        return dict(sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n])
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``int.bit_length`` for uint64 arrays"""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values >= (np.uint64(1) << np.uint64(shift))
+        length[mask] += shift
+        values[mask] >>= np.uint64(shift)
+    return length + (values > 0)
@@ -1,21 +1,90 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import config
 
+# Shared by every StorageClient in the process; boto3 clients are thread-safe
+_client = None
+_arrow_filesystem = None
+_bucket_checked = False
+_part_executor = None
+_lock = threading.Lock()
+
+def get_client():
+    """Get the process-wide S3 client, whose connection pool is shared by all storage calls"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = boto3.client(
+                's3',
+                endpoint_url=config.MINIO_URL,
+                aws_access_key_id=config.MINIO_ROOT_USER,
+                aws_secret_access_key=config.MINIO_ROOT_PASSWORD,
+                region_name='us-east-1',  # Placeholder region, not used with MinIO
+                use_ssl=config.MINIO_SECURE,
+                config=Config(max_pool_connections=config.S3_MAX_POOL_CONNECTIONS),
+            )
+        return _client
+
+def get_transfer_config():
+    """Multipart settings for managed uploads and downloads"""
+    return TransferConfig(
+        multipart_threshold=config.MULTIPART_THRESHOLD,
+        multipart_chunksize=config.MULTIPART_PART_SIZE,
+        max_concurrency=config.MULTIPART_CONCURRENCY,
+        use_threads=True,
+    )
+
+def get_arrow_filesystem():
+    """Get the process-wide Arrow S3 filesystem, for reading columnar files with ranged GETs"""
+    global _arrow_filesystem
+    with _lock:
+        if _arrow_filesystem is None:
+            from pyarrow import fs
+            _arrow_filesystem = fs.S3FileSystem(
+                access_key=config.MINIO_ROOT_USER,
+                secret_key=config.MINIO_ROOT_PASSWORD,
+                endpoint_override=f"{config.MINIO_HOST}:{config.MINIO_PORT}",
+                scheme='https' if config.MINIO_SECURE else 'http',
+                region='us-east-1',
+            )
+        return _arrow_filesystem
+
+def _get_part_executor():
+    """Thread pool sending the parts of streamed uploads"""
+    global _part_executor
+    with _lock:
+        if _part_executor is None:
+            _part_executor = ThreadPoolExecutor(max_workers=config.S3_MAX_POOL_CONNECTIONS, thread_name_prefix='upload-part')
+        return _part_executor
+
+def reset_process_state():
+    """Forget the client, filesystem and part pool inherited from a parent process
+
+    Called in forked worker processes: the inherited boto3 connection pool
+    would share sockets with the parent, the part pool's threads do not
+    exist in the child, and the lock may have been copied while held.
+    """
+    global _client, _arrow_filesystem, _part_executor, _lock
+    _lock = threading.Lock()
+    _client = None
+    _arrow_filesystem = None
+    _part_executor = None
+
 class StorageClient:
     """Client for interacting with S3-compatible storage (MinIO)"""
     
     def __init__(self):
-        self.client = boto3.client(
-            's3',
-            endpoint_url=config.MINIO_URL,
-            aws_access_key_id=config.MINIO_ROOT_USER,
-            aws_secret_access_key=config.MINIO_ROOT_PASSWORD,
-            region_name='us-east-1',  # Placeholder region, not used with MinIO
-            use_ssl=config.MINIO_SECURE,
-        )
-        self._ensure_bucket_exists()
+        global _bucket_checked
+        self.client = get_client()
+        self.transfer_config = get_transfer_config()
+        if not _bucket_checked:
+            self._ensure_bucket_exists()
+            _bucket_checked = True
     
     def _ensure_bucket_exists(self):
         """Ensure the dataset bucket exists, create it if it doesn't"""
@@ -38,7 +107,7 @@ class StorageClient:
             object_name = os.path.basename(file_path)
         
         try:
-            self.client.upload_file(file_path, config.DATASET_BUCKET, object_name)
+            self.client.upload_file(file_path, config.DATASET_BUCKET, object_name, Config=self.transfer_config)
             return f"{config.MINIO_URL}/{config.DATASET_BUCKET}/{object_name}"
         except ClientError as e:
             print(f"Error uploading file: {e}")
@@ -55,12 +124,62 @@ class StorageClient:
             bool: True if download was successful, False otherwise
         """
         try:
-            self.client.download_file(config.DATASET_BUCKET, object_name, file_path)
+            self.client.download_file(config.DATASET_BUCKET, object_name, file_path, Config=self.transfer_config)
             return True
         except ClientError as e:
             print(f"Error downloading file: {e}")
             return False
     
+    def get_range(self, object_name, start, end):
+        """Read a byte range of an object without downloading the rest
+        
+        Args:
+            object_name (str): S3 object name
+            start (int): Offset of the first byte
+            end (int): Offset of the last byte, inclusive
+            
+        Returns:
+            bytes: The bytes in the range, fewer if the object ends first
+        """
+        response = self.client.get_object(Bucket=config.DATASET_BUCKET, Key=object_name, Range=f"bytes={start}-{end}")
+        return response['Body'].read()
+    
+    def get_object_size(self, object_name):
+        """Get the size of an object in bytes
+        
+        Args:
+            object_name (str): S3 object name
+            
+        Returns:
+            int: Size of the object
+        """
+        return self.client.head_object(Bucket=config.DATASET_BUCKET, Key=object_name)['ContentLength']
+    
+    def open_input_file(self, object_name):
+        """Open an object for random access without downloading it
+        
+        Reads are served with ranged GETs, so Parquet readers only fetch the
+        footer and the column chunks they need.
+        
+        Args:
+            object_name (str): S3 object name
+            
+        Returns:
+            pyarrow.NativeFile: Seekable file of the object
+        """
+        return get_arrow_filesystem().open_input_file(f"{config.DATASET_BUCKET}/{object_name}")
+    
+    def start_upload(self, object_name):
+        """Start a streamed upload of an object
+        
+        Args:
+            object_name (str): S3 object name
+            
+        Returns:
+            MultipartUpload: Writer accepting the object's bytes in order
+        """
+        return MultipartUpload(self.client, object_name)
+    
     def get_object_url(self, object_name):
         """Get the URL for an object
         
@@ -71,3 +190,95 @@ class StorageClient:
             str: The URL for the object
         """
         return f"{config.MINIO_URL}/{config.DATASET_BUCKET}/{object_name}"
+
+
+class MultipartUpload:
+    """Writer that streams an object to S3-compatible storage part by part
+    
+    Bytes are buffered until MULTIPART_PART_SIZE is reached and then sent as
+    one part in the background; up to MULTIPART_CONCURRENCY parts are in
+    flight at once, after which ``write`` waits for the oldest to finish.
+    The multipart upload is only created once the first part is full;
+    smaller objects are sent with a single PUT on completion.
+    """
+    
+    def __init__(self, client, object_name):
+        self.client = client
+        self.object_name = object_name
+        self.upload_id = None
+        self.parts = []
+        self.pending = []
+        self.part_count = 0
+        self.buffer = bytearray()
+    
+    def write(self, chunk):
+        """Append bytes to the object, uploading full parts as they fill up
+        
+        Args:
+            chunk (bytes): Next bytes of the object
+        """
+        self.buffer.extend(chunk)
+        while len(self.buffer) >= config.MULTIPART_PART_SIZE:
+            part = bytes(self.buffer[:config.MULTIPART_PART_SIZE])
+            del self.buffer[:config.MULTIPART_PART_SIZE]
+            self._upload_part(part)
+    
+    def complete(self):
+        """Upload any remaining bytes and finish the object
+        
+        Returns:
+            str: The S3 object URL
+        """
+        if self.upload_id is None:
+            self.client.put_object(Bucket=config.DATASET_BUCKET, Key=self.object_name, Body=bytes(self.buffer))
+        else:
+            if self.buffer:
+                self._upload_part(bytes(self.buffer))
+            self._wait(0)
+            self.client.complete_multipart_upload(
+                Bucket=config.DATASET_BUCKET,
+                Key=self.object_name,
+                UploadId=self.upload_id,
+                MultipartUpload={'Parts': sorted(self.parts, key=lambda part: part['PartNumber'])}
+            )
+        self.buffer = bytearray()
+        return f"{config.MINIO_URL}/{config.DATASET_BUCKET}/{self.object_name}"
+    
+    def abort(self):
+        """Discard the upload and any parts already sent"""
+        self.buffer = bytearray()
+        for future in self.pending:
+            future.cancel()
+        for future in self.pending:
+            if not future.cancelled():
+                future.exception()
+        self.pending = []
+        if self.upload_id is not None:
+            try:
+                self.client.abort_multipart_upload(Bucket=config.DATASET_BUCKET, Key=self.object_name, UploadId=self.upload_id)
+            except ClientError as e:
+                print(f"Error aborting upload: {e}")
+            self.upload_id = None
+    
+    def _upload_part(self, part):
+        if self.upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=config.DATASET_BUCKET, Key=self.object_name)
+            self.upload_id = response['UploadId']
+        self._wait(config.MULTIPART_CONCURRENCY - 1)
+        self.part_count += 1
+        self.pending.append(_get_part_executor().submit(self._send_part, self.part_count, part))
+    
+    def _send_part(self, part_number, part):
+        response = self.client.upload_part(
+            Bucket=config.DATASET_BUCKET,
+            Key=self.object_name,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=part
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+    
+    def _wait(self, max_pending):
+        """Wait for the oldest parts until at most ``max_pending`` are in flight"""
+        while len(self.pending) > max_pending:
+            self.parts.append(self.pending.pop(0).result())
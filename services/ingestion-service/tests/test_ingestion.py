@@ -1,18 +1,45 @@
+import io
 import os
 import sys
+import time
+import hashlib
+import subprocess
+import asyncio
 import pytest
 import json
+from decimal import Decimal
 from pathlib import Path
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 import numpy as np
 
 # Add the parent directory to sys.path to import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from processor import DataProcessor
-from service import IngestionService
+from sketches import KLLSketch, HyperLogLog, MisraGries
+from service import IngestionService, extract_metadata
 from database import Dataset
+from jobs import JobQueue
+from executors import ExecutionLayer
+from pipeline import IncrementalProfiler
+from registry import FormatHandler, get_handler
+from csv_reader import read_csv
+from csv_dialect import detect_dialect, dialect_cache
+import config
+from storage import StorageClient, MultipartUpload
+from uploads import FormUpload
+from starlette.requests import Request
+from fastapi import HTTPException
+from text_profiler import profile_text_file
+from json_schema import JsonSchema, schema_cache
+from columnar import write_parquet
+import pyarrow as pa
+import pyarrow.feather
+import pyarrow.parquet as pq
 
 # Test data directory
 TEST_DATA_DIR = Path(__file__).parent / "test_data"
@@ -94,7 +121,244 @@ class TestDataProcessor:
         # Check sample data
         assert len(metadata['sample_data']) == 5
         assert metadata['sample_data'][0]['name'] == 'Alice'
+
+    def test_process_csv_streaming(self):
+        """Test that chunked CSV profiling matches the in-memory profile"""
+        file_path = TEST_DATA_DIR / "test_streaming.csv"
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'value': rng.normal(50, 10, 1000),
+            'count': rng.integers(0, 100, 1000),
+            'category': rng.choice(['a', 'b', 'c', None], 1000)
+        })
+        df.loc[::7, 'value'] = np.nan
+        df.to_csv(file_path, index=False)
+
+        try:
+            default_dtypes = {col: str(dtype) for col, dtype in pd.read_csv(file_path).dtypes.items()}
+            expected = DataProcessor.process_csv(file_path, streaming=False)
+            with patch('config.CSV_CHUNK_SIZE', 64):
+                metadata = DataProcessor.process_csv(file_path, streaming=True)
+        finally:
+            os.remove(file_path)
+
+        assert metadata['profiling_mode'] == 'streaming'
+        assert metadata['approximate_statistics']['category'] == ['unique_count']
+        assert metadata['row_count'] == expected['row_count']
+        # Chunks are read with default dtypes; whole files with compact ones
+        assert metadata['data_types'] == default_dtypes
+        assert expected['data_types'] == {'value': 'float64', 'count': 'int8', 'category': 'category'}
+        assert metadata['memory_usage']['peak_chunk_bytes'] > 0
+        assert metadata['completeness'] == pytest.approx(expected['completeness'])
+        for col in ['value', 'count']:
+            for stat in ['min', 'max', 'mean', 'std', 'null_count']:
+                assert metadata['statistics'][col][stat] == pytest.approx(expected['statistics'][col][stat])
+        assert metadata['statistics']['category']['unique_count'] == expected['statistics']['category']['unique_count']
+        assert metadata['statistics']['category']['top_values'] == expected['statistics']['category']['top_values']
+
+    def test_compact_csv_dtypes(self):
+        """Test that whole CSV reads use compact dtypes without changing any value"""
+        file_path = TEST_DATA_DIR / "test_dtypes.csv"
+        df = pd.DataFrame({
+            'small': [1, 2, 3, 4] * 25,
+            'wide': [1, 2, 3, 100000] * 25,
+            'half': [0.5, 1.5, None, 2.25] * 25,
+            'precise': [0.1, 0.2, 0.3, 0.4] * 25,
+            'whole': [1.0, None, 3.0, 4.0] * 25,
+            'flag': [True, None, False, True] * 25,
+            'day': ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04'] * 25,
+            'city': ['Paris', 'Oslo', 'Rome', 'Oslo'] * 25,
+            'email': [f'user{i}@example.com' for i in range(100)]
+        })
+        df.to_csv(file_path, index=False)
+        try:
+            original = pd.read_csv(file_path)
+            with patch('config.CSV_INFERENCE_ROWS', 10):
+                compact = read_csv(str(file_path))
+            metadata = DataProcessor.process_csv(file_path, streaming=False)
+        finally:
+            os.remove(file_path)
+        
+        assert {col: str(dtype) for col, dtype in compact.dtypes.items()} == {
+            'small': 'int8', 'wide': 'int32', 'half': 'float32', 'precise': 'float64', 'whole': 'Int8',
+            'flag': 'boolean', 'day': 'datetime64[ns]', 'city': 'category', 'email': 'object'
+        }
+        for col in ['small', 'wide', 'half', 'precise', 'whole']:
+            assert np.array_equal(compact[col].to_numpy(dtype=np.float64, na_value=np.nan), original[col].to_numpy(dtype=np.float64), equal_nan=True)
+        assert compact.memory_usage(deep=True).sum() < original.memory_usage(deep=True).sum() / 2
+        
+        assert metadata['memory_usage']['total_bytes'] == sum(metadata['memory_usage']['columns'].values())
+        assert metadata['statistics']['city']['top_values'] == {'Oslo': 50, 'Paris': 25, 'Rome': 25}
+        assert metadata['statistics']['day']['unique_count'] == 4
+        # Nullable booleans are profiled like categories
+        assert metadata['statistics']['flag'] == {'unique_count': 2, 'null_count': 25, 'null_percentage': 25.0, 'top_values': {'True': 50, 'False': 25}}
+    
+    def test_csv_dialects(self):
+        """Test that delimiters, quoting, headers and encodings are detected from the head of the file"""
+        file_path = TEST_DATA_DIR / "dialect.csv"
+        parquet_path = TEST_DATA_DIR / "dialect.parquet"
+        rows = ['id;city;note', '1;Zürich;"a; b"', '2;Köln;"c"', '3;Genève;"d"']
+        with open(file_path, 'w', encoding='latin-1', newline='') as f:
+            f.write('\r\n'.join(rows) + '\r\n')
+        try:
+            metadata = DataProcessor.process_csv(file_path, streaming=False)
+            assert metadata['delimiter'] == ';'
+            assert metadata['dialect']['encoding'] == 'latin-1'
+            assert metadata['dialect']['line_terminator'] == '\r\n'
+            assert metadata['columns'] == ['id', 'city', 'note']
+            assert metadata['sample_data'][0]['note'] == 'a; b'
+            
+            # Streams are sniffed without losing the head, and the dialect comes from the cache
+            hits = dialect_cache.hits
+            with open(file_path, 'rb') as f:
+                metadata = DataProcessor.process_csv(io.BufferedReader(f), streaming=True)
+            assert dialect_cache.hits == hits + 1
+            assert metadata['row_count'] == 3
+            assert metadata['statistics']['city']['unique_count'] == 3
+            
+            assert write_parquet(str(file_path), "csv", parquet_path)
+            assert pq.read_table(parquet_path).column('city').to_pylist() == ['Zürich', 'Köln', 'Genève']
+            
+            with open(file_path, 'w') as f:
+                f.write('1\t2.5\tx\n2\t3.5\ty\n3\t4.5\tz\n')
+            dialect, _ = detect_dialect(str(file_path))
+            assert dialect.delimiter == '\t'
+            assert not dialect.has_header
+            metadata = DataProcessor.process_csv(file_path, streaming=False)
+            assert metadata['columns'] == ['column_1', 'column_2', 'column_3']
+            assert metadata['row_count'] == 3
+            
+            # Names that look like numbers still make a header
+            with open(file_path, 'w') as f:
+                f.write('country,2019,2020\nUS,1,2\n')
+            dialect, _ = detect_dialect(str(file_path))
+            assert dialect.has_header
+            assert DataProcessor.process_csv(file_path, streaming=False)['columns'] == ['country', '2019', '2020']
+        finally:
+            for path in [file_path, parquet_path]:
+                if os.path.exists(path):
+                    os.remove(path)
     
+    def test_incremental_profiler(self):
+        """Test profiling a CSV fed in arbitrary byte chunks"""
+        with open(self.csv_path, 'rb') as f:
+            content = f.read()
+        
+        profiler = IncrementalProfiler(get_handler('csv').profile_stream, max_chunks=2)
+        for i in range(0, len(content), 7):
+            profiler.feed(content[i:i + 7])
+        metadata = profiler.close()
+        
+        expected = DataProcessor.process_csv(self.csv_path, streaming=True)
+        assert metadata['row_count'] == 5
+        assert metadata['statistics'] == expected['statistics']
+        assert metadata['sample_data'] == expected['sample_data']
+
+    def test_multipart_upload(self):
+        """Test that streamed uploads are split into parts only when needed"""
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+        client.upload_part.side_effect = lambda **kwargs: {'ETag': f"etag-{kwargs['PartNumber']}"}
+        
+        with patch('config.MULTIPART_PART_SIZE', 10):
+            small = MultipartUpload(client, 'small.csv')
+            small.write(b'12345')
+            small.complete()
+            client.put_object.assert_called_once()
+            client.create_multipart_upload.assert_not_called()
+            
+            large = MultipartUpload(client, 'large.csv')
+            for _ in range(5):
+                large.write(b'1234567')
+            large.complete()
+        
+        bodies = sorted((call.kwargs['PartNumber'], call.kwargs['Body']) for call in client.upload_part.call_args_list)
+        assert [body for _, body in bodies] == [b'1234567123', b'4567123456', b'7123456712', b'34567']
+        parts = client.complete_multipart_upload.call_args.kwargs['MultipartUpload']['Parts']
+        assert [part['PartNumber'] for part in parts] == [1, 2, 3, 4]
+
+    def test_text_profiler(self):
+        """Test that memory-mapped line measurement matches readlines()"""
+        file_path = TEST_DATA_DIR / "profile.txt"
+        with open(file_path, 'wb') as f:
+            f.write("first line\r\nzwei Straße\n\nüber 😀 long line that spans windows\nlast".encode('utf-8'))
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            for window in [4, 7, 1024]:
+                profile = profile_text_file(str(file_path), window=window)
+                assert profile['line_lengths'].tolist() == [len(line) for line in lines]
+                assert profile['characters'] == len(' '.join(line.rstrip('\n') for line in lines))
+                assert profile['sample_lines'] == [line.strip() for line in lines[:5]]
+        finally:
+            os.remove(file_path)
+
+    def test_line_stats(self):
+        """Test vectorized line statistics against exact sorts"""
+        lengths = np.random.default_rng(0).integers(0, 500, 10001).astype(np.int32)
+        stats = DataProcessor._calculate_line_stats(lengths)
+        ordered = np.sort(lengths)
+        
+        assert stats['median'] == ordered[len(lengths) // 2]
+        assert stats['std'] == pytest.approx(lengths.std())
+        assert stats['percentiles'] == {'p50': ordered[5000], 'p90': ordered[9000], 'p99': ordered[9900]}
+        
+        histogram = DataProcessor._length_histogram(lengths)
+        assert len(histogram['counts']) == config.LINE_HISTOGRAM_BINS
+        assert sum(histogram['counts']) == len(lengths)
+        assert DataProcessor._length_histogram(np.array([3, 3, 4], dtype=np.int32))['counts'] == [2, 1]
+
+    def test_storage_ranged_reads(self):
+        """Test that storage clients share one S3 client and read byte ranges"""
+        client = MagicMock()
+        client.get_object.return_value = {'Body': MagicMock(read=MagicMock(return_value=b'abc'))}
+        with patch('storage._client', client):
+            storage_client = StorageClient()
+            assert StorageClient().client is storage_client.client is client
+            assert storage_client.get_range('data.csv', 10, 12) == b'abc'
+        client.get_object.assert_called_once_with(Bucket=config.DATASET_BUCKET, Key='data.csv', Range='bytes=10-12')
+        assert storage_client.transfer_config.multipart_chunksize == config.MULTIPART_PART_SIZE
+
+    def test_parallel_column_profiling(self):
+        """Test that sharded column profiling matches the serial profile"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({f'num_{i}': rng.normal(i, 1, 500) for i in range(6)})
+        for i in range(4):
+            df[f'cat_{i}'] = rng.choice(['x', 'y', 'z', None], 500)
+        df.loc[::5, 'num_0'] = np.nan
+
+        expected = DataProcessor._extract_dataframe_metadata(df, parallel=False)
+        assert expected['statistics']['num_0']['median'] == pytest.approx(df['num_0'].median())
+        assert expected['statistics']['num_0']['std'] == pytest.approx(df['num_0'].std())
+        assert expected['statistics']['cat_0']['unique_count'] == df['cat_0'].nunique()
+
+        for executor in ['thread', 'process']:
+            with patch('config.PROFILE_EXECUTOR', executor), patch('config.PROFILE_WORKERS', 3):
+                metadata = DataProcessor._extract_dataframe_metadata(df, parallel=True)
+            assert list(metadata['statistics']) == list(expected['statistics'])
+            assert metadata['statistics'] == expected['statistics']
+
+    def test_sketches(self):
+        """Test that merged sketches stay within their error bounds"""
+        rng = np.random.default_rng(0)
+        values = rng.normal(0, 1, 200000)
+        quantiles = KLLSketch(k=200, seed=0)
+        for part in np.array_split(values, 4):
+            other = KLLSketch(k=200, seed=1)
+            other.update(part)
+            quantiles.merge(other)
+        assert not quantiles.is_exact
+        assert abs(np.mean(values <= quantiles.quantile(0.5)) - 0.5) < 0.02
+
+        distinct = HyperLogLog(precision=14)
+        distinct.update(pd.Series(np.arange(50000)))
+        assert abs(distinct.estimate() - 50000) / 50000 < 0.03
+
+        frequent = MisraGries(capacity=10)
+        frequent.update(pd.Series(['a'] * 500 + ['b'] * 300 + [str(i) for i in range(200)]))
+        assert list(frequent.top(2)) == ['a', 'b']
+        assert not frequent.is_exact
+
     def test_process_json(self):
         """Test JSON processing"""
         metadata = DataProcessor.process_json(self.json_path)
@@ -109,6 +373,237 @@ class TestDataProcessor:
         # Check sample data
         assert len(metadata['sample_data']) == 5
         assert metadata['sample_data'][0]['name'] == 'Alice'
+
+    def test_process_json_null_fields(self):
+        """Test that fields null in every record are reported as missing columns"""
+        file_path = TEST_DATA_DIR / "nulls.json"
+        with open(file_path, 'w') as f:
+            json.dump([{"a": 1, "b": None}, {"a": 2, "b": None}], f)
+        try:
+            for streaming in [False, True]:
+                metadata = DataProcessor.process_json(str(file_path), streaming=streaming)
+                assert metadata['columns'] == ['a', 'b']
+                assert metadata['completeness']['overall_missing_percentage'] == 50.0
+                assert metadata['statistics']['b']['null_percentage'] == 100.0
+
+            # A batch of nulls does not turn a numeric column into text
+            with open(file_path, 'w') as f:
+                json.dump([{"a": 1, "b": None}, {"a": 2, "b": 1.5}], f)
+            with patch('config.JSON_CHUNK_SIZE', 1):
+                metadata = DataProcessor.process_json(str(file_path), streaming=True)
+            assert metadata['data_types']['b'] == 'float64'
+            assert metadata['statistics']['b']['max'] == 1.5
+        finally:
+            os.remove(file_path)
+
+    def test_process_json_streaming(self):
+        """Test that streamed JSON arrays match the in-memory profile"""
+        expected = DataProcessor.process_json(self.json_path, streaming=False)
+        with patch('config.JSON_READ_SIZE', 7), patch('config.JSON_CHUNK_SIZE', 2):
+            metadata = DataProcessor.process_json(self.json_path, streaming=True)
+        
+        assert metadata['profiling_mode'] == 'streaming'
+        assert metadata['structure'] == 'array_of_objects'
+        assert metadata['item_count'] == 5
+        assert metadata['columns'] == expected['columns']
+        assert metadata['sample_data'] == expected['sample_data']
+        assert metadata['statistics']['score']['mean'] == pytest.approx(expected['statistics']['score']['mean'])
+        
+        file_path = TEST_DATA_DIR / "values.json"
+        with open(file_path, 'w') as f:
+            f.write('[1, 22, 333, 4444, 55555, 666666]')
+        try:
+            with patch('config.JSON_READ_SIZE', 3):
+                metadata = DataProcessor.process_json(str(file_path), streaming=True)
+            assert metadata['structure'] == 'array_of_values'
+            assert metadata['row_count'] == 6
+            assert metadata['sample_data'] == [1, 22, 333, 4444, 55555]
+        finally:
+            os.remove(file_path)
+    
+    def test_process_jsonl(self):
+        """Test JSON Lines processing, including records with differing keys"""
+        file_path = TEST_DATA_DIR / "test.jsonl"
+        records = [{'id': 1, 'name': 'Alice'}, {'id': 2}, {'id': 3, 'name': 'Carol', 'score': 9.5}]
+        with open(file_path, 'w') as f:
+            f.write('\n'.join(json.dumps(record) for record in records) + '\n\n')
+        try:
+            expected = DataProcessor.process_jsonl(str(file_path), streaming=False)
+            with patch('config.JSON_CHUNK_SIZE', 1):
+                metadata = DataProcessor.process_jsonl(str(file_path), streaming=True)
+            
+            for result in [expected, metadata]:
+                assert result['format'] == 'jsonl'
+                assert result['row_count'] == 3
+                assert result['columns'] == ['id', 'name', 'score']
+                assert result['statistics']['name']['null_count'] == 1
+                assert result['statistics']['score']['null_count'] == 2
+                assert result['completeness']['rows_with_nulls'] == 2
+        finally:
+            os.remove(file_path)
+    
+    def test_json_schema_inference(self):
+        """Test that nested records are flattened and their schema cached by shape"""
+        schema_cache.clear()
+        records = [
+            {'id': i, 'user': {'name': f'user{i}', 'address': {'city': 'Oslo' if i % 2 else None}}, 'tags': ['a'] * (i % 3)}
+            for i in range(6)
+        ]
+        
+        schema = JsonSchema.for_records(records)
+        first = schema.flatten(records[:3])
+        rest = schema.flatten(records[3:])
+        schema.finish()
+        
+        assert list(first.columns) == list(rest.columns) == ['id', 'user.name', 'user.address.city']
+        assert first['user.address.city'].tolist() == [None, 'Oslo', None]
+        assert rest['user.name'].tolist() == ['user3', 'user4', 'user5']
+        # Only the first batch is walked; the second is flattened along its paths
+        assert schema.inferred_batches == 1
+        
+        fields = schema.describe()['fields']
+        assert fields['user']['fields']['address']['fields']['city']['types'] == {'null': 3, 'string': 3}
+        assert fields['user']['fields']['address']['fields']['city']['null_percentage'] == 50.0
+        assert fields['tags']['array_length']['max'] == 2
+        assert fields['tags']['items']['types'] == {'string': 6}
+        
+        # Another file of the same shape starts from the cached tree
+        cached = JsonSchema.for_records(records)
+        assert cached.cache_hit
+        assert cached.flatten(records)['user.address.city'].tolist() == [None, 'Oslo', None, 'Oslo', None, 'Oslo']
+        assert cached.inferred_batches == 0
+        assert cached.describe()['fields'] == schema.describe()['fields']
+        
+        # A record with a new key falls back to inference
+        cached.flatten([{'id': 7, 'user': {'name': 'x', 'email': 'x@example.com'}}])
+        assert cached.inferred_batches == 1
+        assert 'email' in cached.describe()['fields']['user']['fields']
+    
+    def test_process_nested_json(self):
+        """Test that nested JSON objects are profiled as flattened columns"""
+        file_path = TEST_DATA_DIR / "nested.json"
+        records = [{'id': i, 'metrics': {'latency': i * 1.5, 'ok': True}, 'events': [{'type': 'click'}]} for i in range(10)]
+        with open(file_path, 'w') as f:
+            json.dump(records, f)
+        try:
+            for streaming in [False, True]:
+                with patch('config.JSON_CHUNK_SIZE', 4):
+                    metadata = DataProcessor.process_json(str(file_path), streaming=streaming)
+                assert metadata['columns'] == ['id', 'metrics.latency', 'metrics.ok']
+                assert metadata['statistics']['metrics.latency']['max'] == 13.5
+                assert metadata['schema']['fields']['events']['items']['fields']['type']['types'] == {'string': 10}
+        finally:
+            os.remove(file_path)
+    
+    def test_write_parquet(self):
+        """Test that tabular files get a typed Parquet copy and other files none"""
+        parquet_path = TEST_DATA_DIR / "copy.parquet"
+        try:
+            assert write_parquet(str(self.csv_path), "csv", parquet_path)
+            table = pq.read_table(parquet_path)
+            assert table.column_names == ['id', 'name', 'age', 'email', 'score']
+            assert str(table.schema.field('age').type) == 'int64'
+            
+            # Types inferred from the first block that do not hold later fall back to pandas
+            conflict_path = TEST_DATA_DIR / "conflict.csv"
+            with open(conflict_path, 'w') as f:
+                f.write('value\n' + '1\n' * 100 + 'x\n')
+            try:
+                with patch('config.PARQUET_BLOCK_SIZE', 64):
+                    assert write_parquet(str(conflict_path), "csv", parquet_path)
+                assert pq.read_table(parquet_path).column('value').to_pylist()[-1] == 'x'
+            finally:
+                os.remove(conflict_path)
+            
+            nested_path = TEST_DATA_DIR / "nested.jsonl"
+            with open(nested_path, 'w') as f:
+                f.write('{"id": 1, "user": {"name": "a"}}\n{"id": "two", "user": {"name": "b"}}\n')
+            try:
+                assert write_parquet(str(nested_path), "jsonl", parquet_path)
+                table = pq.read_table(parquet_path)
+                assert table.column_names == ['id', 'user.name']
+                assert table.column('id').to_pylist() == ['1', 'two']
+
+                # Batches are written as they come, widening the columns written before them
+                with open(nested_path, 'w') as f:
+                    f.write('{"id": 1, "score": 1}\n{"id": 2, "score": 2.5}\n{"id": "three", "flag": true}\n')
+                with patch('config.JSON_CHUNK_SIZE', 1), \
+                     patch('pandas.concat', side_effect=AssertionError("records concatenated")):
+                    assert write_parquet(str(nested_path), "jsonl", parquet_path)
+                table = pq.read_table(parquet_path)
+                assert table.column_names == ['id', 'score', 'flag']
+                assert table.column('id').to_pylist() == ['1', '2', 'three']
+                assert table.column('score').to_pylist() == [1.0, 2.5, None]
+                assert table.column('flag').to_pylist() == [None, None, True]
+            finally:
+                os.remove(nested_path)
+
+            assert not write_parquet(str(self.txt_path), "txt", parquet_path)
+        finally:
+            if os.path.exists(parquet_path):
+                os.remove(parquet_path)
+    
+    def test_process_parquet(self):
+        """Test that Parquet files are profiled from footer statistics without reading the data"""
+        parquet_path = TEST_DATA_DIR / "test.parquet"
+        table = pa.table({'id': [1, 2, 3, 4], 'name': ['a', None, 'c', 'd'], 'score': [1.5, None, None, 4.0]})
+        pq.write_table(table, parquet_path, row_group_size=2)
+        try:
+            with patch.object(pq.ParquetFile, 'read', side_effect=AssertionError("full read")):
+                metadata = DataProcessor.process_parquet(str(parquet_path))
+            
+            assert metadata['format'] == 'parquet'
+            assert metadata['profiling_mode'] == 'footer'
+            assert metadata['row_count'] == 4
+            assert metadata['row_groups'] == 2
+            assert metadata['columns'] == ['id', 'name', 'score']
+            assert metadata['statistics']['id']['min'] == 1 and metadata['statistics']['id']['max'] == 4
+            assert metadata['statistics']['name']['null_count'] == 1
+            assert metadata['statistics']['score']['null_percentage'] == 50.0
+            assert [group['max'] for group in metadata['statistics']['score']['row_groups']] == [1.5, 4.0]
+            assert metadata['completeness']['columns_with_nulls'] == 2
+            assert len(metadata['sample_data']) == 4
+            
+            # Statistics the writer did not record are reported as unknown
+            pq.write_table(table, parquet_path, write_statistics=False)
+            metadata = DataProcessor.process_parquet(str(parquet_path))
+            assert metadata['statistics']['id']['min'] is None
+            assert metadata['statistics']['id']['null_count'] is None
+            
+            # Decimals are compared as numbers, not as the strings they are reported as
+            prices = pa.table({'price': pa.array([Decimal('9.50'), Decimal('10.25'), Decimal('100.00')], pa.decimal128(6, 2))})
+            pq.write_table(prices, parquet_path, row_group_size=1)
+            metadata = DataProcessor.process_parquet(str(parquet_path))
+            assert (metadata['statistics']['price']['min'], metadata['statistics']['price']['max']) == ('9.50', '100.00')
+        finally:
+            os.remove(parquet_path)
+    
+    def test_process_arrow(self):
+        """Test that Feather files and Arrow IPC streams are profiled like DataFrames"""
+        feather_path = TEST_DATA_DIR / "test.feather"
+        stream_path = TEST_DATA_DIR / "test.arrows"
+        df = pd.read_csv(self.csv_path)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa.feather.write_feather(table, feather_path)
+        with pa.OSFile(str(stream_path), 'wb') as f, pa.ipc.new_stream(f, table.schema) as writer:
+            writer.write_table(table)
+        try:
+            metadata = DataProcessor.process_arrow(str(feather_path), 'feather')
+            assert metadata['format'] == 'feather'
+            assert metadata['row_count'] == 5
+            assert metadata['statistics']['age']['max'] == 45
+            
+            metadata = DataProcessor.process_arrow(str(stream_path))
+            assert metadata['format'] == 'arrow'
+            assert metadata['columns'] == ['id', 'name', 'age', 'email', 'score']
+            
+            parquet_path = TEST_DATA_DIR / "copy.parquet"
+            assert write_parquet(str(stream_path), "arrow", parquet_path)
+            assert pq.read_table(parquet_path).equals(table)
+            os.remove(parquet_path)
+        finally:
+            os.remove(feather_path)
+            os.remove(stream_path)
     
     def test_process_txt(self):
         """Test TXT processing"""
@@ -128,13 +623,14 @@ class TestDataProcessor:
         assert 'line_length_stats' in metadata
         assert metadata['line_length_stats']['min'] > 0
         assert metadata['line_length_stats']['max'] > 0
+        assert metadata['line_length_stats']['percentiles']['p99'] == metadata['line_length_stats']['max']
+        assert sum(metadata['length_histogram']['counts']) == 5
         
         # Check token estimates
         assert 'estimated_tokens' in metadata
         assert metadata['estimated_tokens']['estimated_total'] > 0
 
 # Test the IngestionService class
-@pytest.mark.asyncio
 class TestIngestionService:
     """Tests for the IngestionService class"""
     
@@ -159,7 +655,7 @@ class TestIngestionService:
         self.mock_dataset.file_type = "csv"
         self.mock_dataset.file_size = 1024
         self.mock_dataset.created_at = "2023-06-15T12:00:00"
-        self.mock_dataset.metadata = {"test": "metadata"}
+        self.mock_dataset.metadata_ = {"test": "metadata"}
         
         # Configure mock db.execute().scalar_one_or_none() to return mock_dataset
         self.mock_execute_result = MagicMock()
@@ -180,8 +676,12 @@ class TestIngestionService:
     @pytest.mark.asyncio
     async def test_process_file_csv(self):
         """Test processing a CSV file"""
-        # Patch the _extract_metadata method to return a fixed result
-        with patch.object(IngestionService, '_extract_metadata', return_value={"test": "metadata"}):
+        # No dataset has the file's content yet; the new record gets its ID when refreshed
+        self.mock_execute_result.scalar_one_or_none.return_value = None
+        self.mock_db.refresh.side_effect = lambda dataset: setattr(dataset, 'id', self.mock_dataset.id)
+        # process_file calls the module-level extract_metadata; run it in this process so the patch applies
+        with patch('service.extract_metadata', return_value={"test": "metadata"}) as extract, \
+             patch.object(self.service.execution, 'run_cpu', self.service.execution.run_io):
             dataset_id, metadata = await self.service.process_file(
                 file_path=str(self.csv_path),
                 original_filename="test.csv",
@@ -195,12 +695,145 @@ class TestIngestionService:
             self.mock_db.commit.assert_called_once()
             self.mock_db.refresh.assert_called_once()
             
-            # Check that the storage client was called
-            self.service.storage_client.upload_file.assert_called_once()
+            # Check that the file was profiled and stored with its Parquet copy
+            extract.assert_called_once_with(str(self.csv_path), "csv")
+            assert self.service.storage_client.upload_file.call_args_list[0].args[0] == str(self.csv_path)
             
             # Check the returned values
             assert dataset_id == self.mock_dataset.id
             assert metadata == {"test": "metadata"}
+            assert self.mock_db.add.call_args.args[0].content_hash == hashlib.sha256(self.csv_path.read_bytes()).hexdigest()
+    
+    @pytest.mark.asyncio
+    async def test_process_file_duplicate(self):
+        """Test that processing already ingested content reuses the existing dataset"""
+        with patch('service.extract_metadata') as extract, \
+             patch.object(self.service.execution, 'run_cpu', self.service.execution.run_io):
+            dataset_id, metadata = await self.service.process_file(
+                file_path=str(self.csv_path),
+                original_filename="copy.csv",
+                file_size=1024,
+                file_type="csv",
+                db=self.mock_db
+            )
+        
+        assert dataset_id == self.mock_dataset.id
+        assert metadata == self.mock_dataset.metadata_
+        extract.assert_not_called()
+        self.service.storage_client.upload_file.assert_not_called()
+        self.mock_db.add.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_ingest_stream(self):
+        """Test ingesting an upload while it streams in"""
+        self.mock_execute_result.scalar_one_or_none.return_value = None
+        upload = MagicMock()
+        self.service.storage_client.start_upload.return_value = upload
+        with open(self.csv_path, 'rb') as f:
+            content = f.read()
+        
+        async def chunks():
+            for i in range(0, len(content), 16):
+                yield content[i:i + 16]
+        
+        dataset_id, metadata = await self.service.ingest_stream(chunks(), "test.csv", "csv", self.mock_db)
+        
+        assert metadata['row_count'] == 5
+        assert b''.join(call.args[0] for call in upload.write.call_args_list) == content
+        upload.complete.assert_called_once()
+        upload.abort.assert_not_called()
+        self.mock_db.add.assert_called_once()
+        assert self.mock_db.add.call_args.args[0].file_size == len(content)
+        assert self.mock_db.add.call_args.args[0].content_hash == hashlib.sha256(content).hexdigest()
+        assert self.mock_db.add.call_args.args[0].parquet_path.endswith('.parquet')
+    
+    @pytest.mark.asyncio
+    async def test_ingest_stream_duplicate(self):
+        """Test that streaming already ingested content reuses the existing dataset"""
+        upload = MagicMock()
+        self.service.storage_client.start_upload.return_value = upload
+        with open(self.csv_path, 'rb') as f:
+            content = f.read()
+        
+        async def chunks():
+            yield content
+        
+        dataset_id, metadata = await self.service.ingest_stream(chunks(), "copy.csv", "csv", self.mock_db)
+        
+        assert dataset_id == self.mock_dataset.id
+        assert metadata == self.mock_dataset.metadata_
+        upload.abort.assert_called_once()
+        upload.complete.assert_not_called()
+        self.mock_db.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ingest_stream_declared_hash(self):
+        """Test that a declared hash of known content returns its dataset before anything is streamed"""
+        read = []
+
+        async def chunks():
+            read.append(1)
+            yield b'id,name\n1,a\n'
+
+        dataset_id, metadata = await self.service.ingest_stream(chunks(), "copy.csv", "csv", self.mock_db, content_hash='0' * 64)
+
+        assert dataset_id == self.mock_dataset.id
+        assert metadata == self.mock_dataset.metadata_
+        assert not read
+        self.service.storage_client.start_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ingest_stream_hash_mismatch(self):
+        """Test that content not matching its declared hash is discarded"""
+        self.mock_execute_result.scalar_one_or_none.return_value = None
+        upload = MagicMock()
+        self.service.storage_client.start_upload.return_value = upload
+
+        async def chunks():
+            yield b'id,name\n1,a\n'
+
+        with pytest.raises(ValueError):
+            await self.service.ingest_stream(chunks(), "test.csv", "csv", self.mock_db, content_hash='0' * 64)
+        upload.abort.assert_called_once()
+        upload.complete.assert_not_called()
+        self.mock_db.add.assert_not_called()
+
+    def test_ingest_duplicate(self):
+        """Test that a queued file matching an existing dataset is neither profiled nor uploaded"""
+        with patch.object(IngestionService, '_extract_metadata') as extract:
+            dataset_id, metadata = self.service.ingest(str(self.csv_path), "copy.csv", 1024, "csv", self.mock_db)
+        
+        assert dataset_id == self.mock_dataset.id
+        assert metadata == self.mock_dataset.metadata_
+        extract.assert_not_called()
+        self.service.storage_client.upload_file.assert_not_called()
+        self.mock_db.add.assert_not_called()
+    
+    def test_ingest_writes_parquet(self):
+        """Test that ingesting a tabular file stores a Parquet copy and records its path"""
+        self.mock_execute_result.scalar_one_or_none.return_value = None
+        
+        self.service.ingest(str(self.csv_path), "test.csv", 1024, "csv", self.mock_db)
+        
+        uploaded = [call.args[1] for call in self.service.storage_client.upload_file.call_args_list]
+        assert len(uploaded) == 2 and uploaded[1].endswith('.parquet')
+        assert self.mock_db.add.call_args.args[0].parquet_path == uploaded[1]
+        assert not os.path.exists(config.TEMP_UPLOAD_DIR / uploaded[1])
+    
+    def test_preview_dataset(self):
+        """Test that previews read only the requested columns of the Parquet copy"""
+        parquet_path = TEST_DATA_DIR / "preview.parquet"
+        write_parquet(str(self.csv_path), "csv", parquet_path)
+        self.service.storage_client.open_input_file.side_effect = lambda name: pa.OSFile(str(TEST_DATA_DIR / name))
+        self.mock_dataset.parquet_path = "preview.parquet"
+        try:
+            preview = self.service.preview_dataset(self.mock_dataset, ['name', 'score'], limit=2)
+            assert preview['rows'] == [{'name': 'Alice', 'score': 85.5}, {'name': 'Bob', 'score': 90.0}]
+            assert preview['row_count'] == 5
+            with pytest.raises(KeyError):
+                self.service.preview_dataset(self.mock_dataset, ['missing'])
+        finally:
+            os.remove(parquet_path)
     
     def test_get_dataset(self):
         """Test getting a dataset by ID"""
@@ -214,25 +847,313 @@ class TestIngestionService:
     
     def test_list_datasets(self):
         """Test listing datasets with pagination"""
-        # Configure mock db.execute().scalars().all() to return a list of datasets
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = [self.mock_dataset, self.mock_dataset]
-        self.mock_execute_result.scalars.return_value = mock_scalars
+        # Configure mock db.execute().all() to return a list of datasets
+        self.mock_execute_result.all.return_value = [self.mock_dataset, self.mock_dataset]
         
         # Configure mock db.execute().scalar_one() to return a count
         another_mock_execute_result = MagicMock()
         another_mock_execute_result.scalar_one.return_value = 2
-        self.mock_db.execute.side_effect = [another_mock_execute_result, self.mock_execute_result]
+        self.mock_db.execute.side_effect = [self.mock_execute_result, another_mock_execute_result]
         
-        datasets, total = self.service.list_datasets(0, 10, self.mock_db)
+        datasets, total, next_cursor = self.service.list_datasets(0, 10, self.mock_db)
         
-        # Check that the database query was executed twice (once for count, once for data)
+        # Check that the database query was executed twice (once for data, once for count)
         assert self.mock_db.execute.call_count == 2
         
         # Check the returned values
         assert len(datasets) == 2
         assert datasets[0] == self.mock_dataset
         assert total == 2
+        assert next_cursor is None
+    
+    def test_list_datasets_keyset(self):
+        """Test that cursors page through datasets newest first without metadata"""
+        engine = create_engine("sqlite://")
+        Dataset.__table__.create(engine)
+        db = sessionmaker(bind=engine)()
+        created_at = datetime(2024, 1, 1)
+        # Pairs of datasets created at the same time are ordered by ID
+        db.execute(Dataset.__table__.insert(), [
+            {"id": i, "name": f"d{i}.csv", "file_path": f"{i}.csv", "file_type": "csv", "file_size": i,
+             "created_at": created_at + timedelta(minutes=i // 2), "metadata": {"row_count": i}}
+            for i in range(1, 8)
+        ])
+        
+        pages, cursor = [], None
+        while True:
+            datasets, total, cursor = self.service.list_datasets(limit=3, db=db, cursor=cursor, count="none")
+            pages.append([dataset.id for dataset in datasets])
+            assert total is None
+            assert "metadata" not in datasets[0]._fields
+            if cursor is None:
+                break
+        assert pages == [[7, 6, 5], [4, 3, 2], [1]]
+        
+        datasets, total, _ = self.service.list_datasets(limit=2, db=db, include_metadata=True, count="estimated")
+        assert total == 7
+        assert datasets[0].metadata_ == {"row_count": 7}
+        with pytest.raises(ValueError):
+            self.service.list_datasets(db=db, cursor="not-a-cursor")
+
+# Test the JobQueue class
+class TestJobQueue:
+    """Tests for the JobQueue class"""
+    
+    def setup_method(self):
+        """Set up a SQLite-backed queue without worker processes"""
+        self.db_path = TEST_DATA_DIR / "jobs.db"
+        self.queue = JobQueue(database_url=f"sqlite:///{self.db_path}")
+        self.csv_path = create_test_csv()
+        self.service = MagicMock()
+    
+    def teardown_method(self):
+        """Clean up test data after each test"""
+        self.queue.engine.dispose()
+        for file in [self.csv_path, self.db_path]:
+            if os.path.exists(file):
+                os.remove(file)
+    
+    def test_process_job(self):
+        """Test that a queued job runs the pipeline and records the dataset"""
+        def ingest(progress, **kwargs):
+            progress(60, "uploading")
+            assert self.queue.get(job.id).stage == "uploading"
+            return 7, {"test": "metadata"}
+        self.service.ingest.side_effect = ingest
+        
+        job = self.queue.enqueue(str(self.csv_path), "test.csv", 1024, "csv")
+        assert self.queue.get(job.id).status == "queued"
+        
+        assert self.queue.process(job.id, self.service, MagicMock())
+        
+        job = self.queue.get(job.id)
+        assert job.status == "completed"
+        assert job.progress == 100.0
+        assert job.dataset_id == 7
+        assert not os.path.exists(self.csv_path)
+        
+        # A job is only ever claimed once
+        assert not self.queue.process(job.id, self.service, MagicMock())
+        self.service.ingest.assert_called_once()
+    
+    def test_process_job_failure(self):
+        """Test that a failing pipeline marks the job as failed"""
+        self.service.ingest.side_effect = Exception("storage unavailable")
+        
+        job = self.queue.enqueue(str(self.csv_path), "test.csv", 1024, "csv")
+        assert not self.queue.process(job.id, self.service, MagicMock())
+        
+        job = self.queue.get(job.id)
+        assert job.status == "failed"
+        assert job.error == "storage unavailable"
+        assert job.dataset_id is None
+
+    def test_running_job(self):
+        """Test that uploads ingested by the API are reported as jobs, and failed if interrupted"""
+        job = self.queue.record_running("test.csv", 1024, "csv")
+        self.queue.report(job.id, 60, "profiling")
+        assert (self.queue.get(job.id).status, self.queue.get(job.id).stage) == ("running", "profiling")
+        self.queue.finish(job.id, storage_filename="stored.csv", dataset_id=7)
+        job = self.queue.get(job.id)
+        assert (job.status, job.file_path, job.dataset_id) == ("completed", "stored.csv", 7)
+
+        # A streamed upload cannot be replayed once its process stops, unlike a queued file
+        expired = datetime.utcnow() - timedelta(seconds=config.JOB_HEARTBEAT_TIMEOUT + 1)
+        streamed = self.queue.record_running("test.csv", 1024, "csv")
+        queued = self.queue.enqueue(str(self.csv_path), "test.csv", 1024, "csv")
+        self.queue._update(queued.id, status="running", heartbeat_at=expired)
+        self.queue._update(streamed.id, heartbeat_at=expired)
+        live = self.queue.record_running("test.csv", 1024, "csv")
+        with patch.object(self.queue, '_submit'):
+            self.queue.start()
+        self.queue.shutdown()
+        assert self.queue.get(streamed.id).status == "failed"
+        assert self.queue.get(queued.id).status == "queued"
+        assert self.queue.get(live.id).status == "running"
+
+    def test_claim_respects_live_owner(self):
+        """Test that a running job is only taken over once its owner's heartbeat has expired"""
+        job = self.queue.enqueue(str(self.csv_path), "test.csv", 1024, "csv")
+        assert self.queue._claim(job.id)
+        other = JobQueue(database_url=f"sqlite:///{self.db_path}")
+        other.worker_id = "other-host:1"
+        try:
+            assert not other._claim(job.id)
+            assert other.recover() == []
+            
+            # Heartbeats keep the job alive; once they stop, another process takes it over
+            with patch.object(config, 'JOB_HEARTBEAT_INTERVAL', 0.01):
+                with self.queue.heartbeat(job.id):
+                    before = self.queue.get(job.id).heartbeat_at
+                    time.sleep(0.2)
+                    assert self.queue.get(job.id).heartbeat_at > before
+            self.queue._update(job.id, heartbeat_at=datetime.utcnow() - timedelta(seconds=config.JOB_HEARTBEAT_TIMEOUT + 1))
+            assert other._claim(job.id)
+            assert self.queue.get(job.id).worker_id == "other-host:1"
+            
+            # The previous owner can no longer record the outcome
+            self.queue.finish(job.id, error="too late")
+            assert self.queue.get(job.id).status == "running"
+        finally:
+            other.engine.dispose()
+
+    def test_jobs_run_in_cpu_pool(self):
+        """Test that started queues submit jobs to the execution layer's CPU pool"""
+        from jobs import _run_job
+        self.queue.execution = MagicMock()
+        self.queue.start()
+        try:
+            job = self.queue.enqueue(str(self.csv_path), "test.csv", 1024, "csv")
+        finally:
+            self.queue.shutdown()
+        self.queue.execution.cpu.submit.assert_called_once_with(_run_job, job.id, self.queue.database_url)
+
+    def test_worker_resets_storage(self):
+        """Test that worker processes do not reuse the storage client and part pool of their parent"""
+        import storage
+        from jobs import _init_worker
+        with patch('storage.boto3.client', side_effect=lambda *args, **kwargs: MagicMock()):
+            client = storage.get_client()
+            executor = storage._get_part_executor()
+            try:
+                _init_worker(f"sqlite:///{self.db_path}")
+                assert storage.get_client() is not client
+                assert storage._get_part_executor() is not executor
+            finally:
+                executor.shutdown()
+                storage._get_part_executor().shutdown()
+                storage.reset_process_state()
+
+# Test the ExecutionLayer class
+class TestExecutionLayer:
+    """Tests for the ExecutionLayer class"""
+    
+    def test_bounded_pools(self):
+        """Test that blocking calls run concurrently with bounded queue depth"""
+        execution = ExecutionLayer(io_workers=2, cpu_workers=1, io_queue=1, cpu_queue=0)
+        
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(*[execution.run_io(time.sleep, 0.1) for _ in range(6)])
+            elapsed = time.perf_counter() - start
+            return elapsed, await execution.run_cpu(pow, 2, 10)
+        
+        try:
+            elapsed, result = asyncio.run(run())
+        finally:
+            metrics = execution.metrics()
+            execution.shutdown()
+        
+        assert result == 1024
+        assert elapsed < 0.5
+        assert metrics['io']['completed'] == 6
+        assert metrics['io']['peak_queue_depth'] <= 1
+        assert metrics['io']['queue_depth'] == 0
+        assert metrics['cpu']['completed'] == 1
+
+class TestFormatRegistry:
+    """Tests for the format handler registry"""
+    
+    def test_lazy_handlers(self):
+        """Test that handlers are imported on first use and declare their capabilities"""
+        handler = FormatHandler("lines", "text_profiler:profile_text_file", sampling=True)
+        assert not handler.loaded
+        txt_path = create_test_txt()
+        try:
+            assert len(handler.extract(str(txt_path))['line_lengths']) == 5
+        finally:
+            os.remove(txt_path)
+        assert handler.loaded
+        with pytest.raises(ValueError):
+            handler.profile_stream(str(txt_path))
+        
+        assert get_handler("csv").capabilities() == {"streaming": True, "sampling": True, "parallel": True, "columnar": True}
+        assert not get_handler("parquet").parallel
+        assert get_handler("xml") is None
+        assert extract_metadata("test.xml", "xml")["processing_status"] == "failed"
+    
+    def test_startup_imports(self):
+        """Test that importing the service does not import any format's dependencies"""
+        code = "import sys, service; print(sorted({'pandas', 'pyarrow', 'numpy'} & set(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), '..'),
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
+
+    def test_handler_imports(self):
+        """Test that loading a handler imports only the dependencies of its format"""
+        txt_path = create_test_txt()
+        code = ("import sys, registry; registry.get_handler('csv').extractor(); "
+                f"registry.get_handler('txt').extract({str(txt_path)!r}); "
+                "print(sorted({'pandas', 'pyarrow', 'numpy'} & set(sys.modules)))")
+        try:
+            result = subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), '..'),
+                                    capture_output=True, text=True, check=True)
+        finally:
+            os.remove(txt_path)
+        assert result.stdout.strip() == "['numpy']"
+
+def create_form_request(content: bytes, filename: str = "data.csv", field: str = "file", message_size: int = 7):
+    """A multipart/form-data request whose body arrives in small messages"""
+    boundary = "testboundary"
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: text/csv\r\n\r\n").encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    messages = [body[i:i + message_size] for i in range(0, len(body), message_size)]
+    received = []
+    
+    async def receive():
+        chunk = messages[len(received)]
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(messages)}
+    
+    scope = {"type": "http", "method": "POST", "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())]}
+    return Request(scope, receive), received, len(messages)
+
+class TestFormUpload:
+    """Tests for the FormUpload class"""
+    
+    @pytest.mark.asyncio
+    async def test_streams_file_part(self):
+        """Test that the file part is read as the body arrives, in chunks of at least chunk_size"""
+        content = b"a,b\r\n" + b"".join(f"{i},{i * 2}\n".encode() for i in range(200))
+        request, received, total = create_form_request(content)
+        upload = FormUpload(request, chunk_size=100)
+        
+        await upload.open()
+        assert (upload.filename, upload.content_type) == ("data.csv", "text/csv")
+        assert len(received) < total
+        
+        chunks, read = [], []
+        async for chunk in upload.chunks():
+            chunks.append(chunk)
+            read.append(len(received))
+        assert b"".join(chunks) == content
+        # The body is read only as far as the chunks yielded so far
+        assert read == sorted(read) and read[0] < total // 2
+        assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+        assert upload.size == len(content)
+    
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_file(self):
+        """Test that a file larger than MAX_UPLOAD_SIZE fails with 413 before the body is read in full"""
+        request, received, total = create_form_request(b"x" * 1000)
+        upload = FormUpload(request, chunk_size=100)
+        await upload.open()
+        
+        with patch.object(config, "MAX_UPLOAD_SIZE", 500):
+            with pytest.raises(HTTPException) as error:
+                async for _ in upload.chunks():
+                    pass
+        assert error.value.status_code == 413
+        assert len(received) < total
+    
+    @pytest.mark.asyncio
+    async def test_missing_file(self):
+        """Test that a form without the file field is rejected"""
+        request, _, _ = create_form_request(b"a,b\n", field="other")
+        with pytest.raises(HTTPException) as error:
+            await FormUpload(request).open()
+        assert error.value.status_code == 422
 
 if __name__ == "__main__":
     # Create test data directory if it doesn't exist
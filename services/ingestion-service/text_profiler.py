@@ -0,0 +1,80 @@
+import os
+import mmap
+from typing import Dict, Any, List
+import numpy as np
+import config
+
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+
+def profile_text_file(file_path: str, window: int = None, sample_lines: int = 5) -> Dict[str, Any]:
+    """Measure the lines of a UTF-8 text file without loading it into Python objects
+
+    The file is memory-mapped and scanned in windows of ``window`` bytes. Each
+    window is viewed as a uint8 array; newline offsets give the byte length of
+    every line, and UTF-8 continuation bytes are subtracted to get character
+    lengths. Lines are measured as ``readlines()`` in text mode would return
+    them: including the line break, with CRLF counted as one character.
+    Memory use is bounded by the window size plus one int32 per line.
+
+    Args:
+        file_path: Path to the text file
+        window: Bytes scanned per pass (defaults to TEXT_PROFILE_WINDOW)
+        sample_lines: Number of leading lines to decode for the sample
+
+    Returns:
+        Dict with 'line_lengths' (int32 array of characters per line),
+        'characters' (characters once line breaks are replaced by single
+        spaces, as in DataProcessor._estimate_tokens) and 'sample_lines'
+    """
+    window = window or config.TEXT_PROFILE_WINDOW
+    size = os.path.getsize(file_path)
+    if size == 0:
+        # Empty files cannot be memory-mapped
+        return {'line_lengths': np.array([], dtype=np.int32), 'characters': 0, 'sample_lines': []}
+
+    lengths: List[np.ndarray] = []
+    line_breaks = 0
+    pending = 0  # Characters of the line continuing from the previous window
+    previous_byte = 0
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        samples = [mm.readline() for _ in range(sample_lines)]
+        for offset in range(0, size, window):
+            buffer = np.frombuffer(mm, dtype=np.uint8, count=min(window, size - offset), offset=offset)
+            continuation = (buffer & 0xC0) == 0x80
+            breaks = np.flatnonzero(buffer == NEWLINE)
+
+            if len(breaks):
+                ends = breaks + 1
+                starts = np.concatenate(([0], ends[:-1]))
+                characters = (ends - starts) - np.add.reduceat(continuation[:ends[-1]], starts, dtype=np.int64)
+                characters[0] += pending
+
+                # A CR before the newline is folded into it by universal newlines
+                before = np.where(breaks > 0, buffer[np.maximum(breaks - 1, 0)], previous_byte)
+                characters -= before == CARRIAGE_RETURN
+
+                lengths.append(characters.astype(np.int32))
+                line_breaks += len(breaks)
+                tail = ends[-1]
+                pending = 0
+            else:
+                tail = 0
+
+            pending += (len(buffer) - tail) - int(np.count_nonzero(continuation[tail:]))
+            previous_byte = int(buffer[-1])
+            # Release the views before the map is closed
+            del buffer, continuation
+
+    if pending:
+        # Last line without a trailing newline
+        lengths.append(np.array([pending], dtype=np.int32))
+
+    line_lengths = np.concatenate(lengths) if lengths else np.array([], dtype=np.int32)
+    total = int(line_lengths.sum(dtype=np.int64))
+    return {
+        'line_lengths': line_lengths,
+        'characters': total - line_breaks + max(len(line_lengths) - 1, 0),
+        'sample_lines': [line.decode('utf-8', errors='replace').strip() for line in samples if line]
+    }
@@ -0,0 +1,133 @@
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import HTTPException, Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+import config
+
+class FormUpload:
+    """Reads the file part of a multipart/form-data request as it streams in
+
+    Form parameters are parsed by Starlette before the endpoint runs, which
+    spools the whole upload to a temporary file. This parser reads
+    request.stream() instead: open() consumes the body up to the headers of
+    the file part, and chunks() yields the file's content as it arrives,
+    enforcing MAX_UPLOAD_SIZE.
+    """
+
+    def __init__(self, request: Request, field: str = "file", chunk_size: int = 1024 * 1024):
+        """Prepare to read an upload
+
+        Args:
+            request: Request with a multipart/form-data body
+            field: Name of the form field holding the file
+            chunk_size: Minimum size of the chunks yielded, except the last one
+        """
+        self.request = request
+        self.field = field
+        self.chunk_size = chunk_size
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self._body = None
+        self._parser = None
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b''
+        self._header_value = b''
+        self._in_file = False
+        self._file_done = False
+        self._body_done = False
+        self._pending: List[bytes] = []
+        self._buffered = 0
+
+    async def open(self):
+        """Read the body up to the file part and record its name and content type
+
+        Raises:
+            HTTPException: 400 if the body is not multipart/form-data, 422 if it has no file part
+        """
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=400, detail="Upload must be a multipart/form-data request")
+        self._body = self.request.stream().__aiter__()
+        self._parser = MultipartParser(params[b"boundary"], callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        while self.filename is None and not self._body_done:
+            await self._read()
+        if self.filename is None:
+            raise HTTPException(status_code=422, detail=f"The form has no file in field '{self.field}'")
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the content of the file part in order
+
+        Raises:
+            HTTPException: 413 if the file exceeds MAX_UPLOAD_SIZE, 400 if the body ends inside it
+        """
+        while True:
+            while not self._file_done and not self._body_done and self._buffered < self.chunk_size:
+                await self._read()
+            if self._pending:
+                chunk = b''.join(self._pending)
+                self._pending.clear()
+                self._buffered = 0
+                self.size += len(chunk)
+                if self.size > config.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {config.MAX_UPLOAD_SIZE/(1024*1024)}MB"
+                    )
+                yield chunk
+            elif self._file_done:
+                return
+            elif self._body_done:
+                raise HTTPException(status_code=400, detail="The upload ended before the end of the file")
+
+    async def _read(self):
+        try:
+            data = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._body_done = True
+            return
+        try:
+            self._parser.write(data)
+        except MultipartParseError as e:
+            raise HTTPException(status_code=400, detail=f"Malformed multipart body: {str(e)}")
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b''
+        self._header_value = b''
+
+    def _on_headers_finished(self):
+        _, disposition = parse_options_header(self._headers.get(b"content-disposition", b""))
+        # Only the first file in the field is read; other parts are skipped
+        if self.filename is None and disposition.get(b"name") == self.field.encode() and b"filename" in disposition:
+            self._in_file = True
+            self.filename = disposition[b"filename"].decode("utf-8", errors="replace")
+            self.content_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self._pending.append(data[start:end])
+            self._buffered += end - start
+
+    def _on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True